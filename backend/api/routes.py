@@ -2,10 +2,22 @@ from fastapi import APIRouter, Query, HTTPException
 from fastapi.responses import JSONResponse
 from backend.services.scorer import calculate_score, derive_badges_from_score
 from backend.models.profile import UserProfile
-from backend.utils.wallet import resolve_input_basename_address, resolve_address_to_basename, resolve_basename_avatar
+from backend.utils.wallet import resolve_input_basename_address, resolve_address_to_basename, resolve_basename_avatar, resolve_addresses_to_basenames
+from backend.utils.singleflight import SingleFlight
+from backend.utils.score_history import get_score_history_log
+from backend.utils.kv_store import get_dashboard_store
+from backend.utils.profile_store import get_profile_repository
+from backend.utils.stats_counters import get_stats_counters, TOTAL_BADGES_EARNED, TRUST_SCORE_SUM, TRUST_SCORE_COUNT, TOTAL_REPORTS
+from backend.utils.distinct_counter import DistinctWalletCounter, get_wallet_counter
+from backend.utils.report_store import REPORT_TYPES, get_report_store
+from backend.utils.report_writer import report_writer
+from backend.utils.rpc_batch import result_or_raise
+from backend.utils.rpc_client import get_rpc_batcher, get_web3
+from backend.utils.multicall import Call, aggregate3, encode_call
+from backend.utils.score_card_cache import get_score_card_cache
+from backend.utils.score_index import get_score_index
 import os
-import glob
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 from pathlib import Path
 from typing import List, Dict, Any
@@ -13,6 +25,7 @@ from backend.core.config import settings
 from pathlib import Path as _Path
 from eth_account import Account
 from eth_account.messages import encode_typed_data
+from eth_abi import decode
 from web3 import Web3
 
 router = APIRouter()
@@ -60,76 +73,35 @@ def get_persistent_stats_file():
     return base_dir / "data" / "persistent_stats.json"
 
 
-# --- Simple score history persistence (file-based) ---
-def get_score_history_file():
-    base_dir = Path(__file__).parent.parent.parent
-    return base_dir / "data" / "score_history.json"
-
+# --- Score history persistence (append-only log, see backend/utils/score_history.py) ---
 def append_score_history(entry: Dict[str, Any]):
-    file_path = get_score_history_file()
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    history: List[Dict[str, Any]] = []
-    if file_path.exists():
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                history = json.load(f)
-        except Exception:
-            history = []
-    history.append(entry)
-    # keep recent 1000 entries only
-    history = history[-1000:]
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(history, f, indent=2)
+    try:
+        get_score_history_log().append(entry)
+    except Exception as e:
+        print(f"Error appending score history: {e}")
 
 def get_recent_history(address: str, limit: int = 30) -> List[Dict[str, Any]]:
-    file_path = get_score_history_file()
-    if not file_path.exists():
-        return []
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            history: List[Dict[str, Any]] = json.load(f)
-        filtered = [h for h in history if h.get('address', '').lower() == address.lower()]
-        return filtered[-limit:]
-    except Exception:
+        return get_score_history_log().recent(address, limit)
+    except Exception as e:
+        print(f"Error reading score history: {e}")
         return []
 
-def get_user_dashboard_file():
-    base_dir = Path(__file__).parent.parent.parent
-    return base_dir / "data" / "user_dashboards.json"
-
 def save_user_dashboard(address: str, dashboard_data: Dict[str, Any]):
-    """Save user dashboard data for quick access"""
-    file_path = get_user_dashboard_file()
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    dashboards: Dict[str, Any] = {}
-    if file_path.exists():
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                dashboards = json.load(f)
-        except Exception:
-            dashboards = {}
-    
-    # Update user dashboard data
-    dashboards[address.lower()] = {
-        **dashboard_data,
-        "last_updated": datetime.now().isoformat(),
-        "address": address
-    }
-    
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(dashboards, f, indent=2)
+    """Save user dashboard data for quick access (written behind by the dashboard store)"""
+    try:
+        get_dashboard_store().put(address.lower(), {
+            **dashboard_data,
+            "last_updated": datetime.now().isoformat(),
+            "address": address
+        })
+    except Exception as e:
+        print(f"Error saving user dashboard: {e}")
 
 def get_user_dashboard(address: str) -> Dict[str, Any] | None:
     """Get cached user dashboard data"""
-    file_path = get_user_dashboard_file()
-    if not file_path.exists():
-        return None
-    
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            dashboards = json.load(f)
-        return dashboards.get(address.lower())
+        return get_dashboard_store().get(address.lower())
     except Exception:
         return None
 
@@ -147,52 +119,80 @@ def load_persistent_stats():
         "last_updated": datetime.now().isoformat()
     }
 
-def save_persistent_stats(stats_data):
-    """Save persistent stats to JSON file"""
+_STATIC_STATS: Dict[str, Any] | None = None
+
+def _get_static_stats() -> Dict[str, Any]:
+    """persistent_stats.json display settings, read once per process"""
+    global _STATIC_STATS
+    if _STATIC_STATS is None:
+        _STATIC_STATS = load_persistent_stats()
+    return _STATIC_STATS
+
+def _legacy_wallet_addresses() -> List[str]:
+    """Wallets recorded before the distinct counter existed (score history and stored reports)"""
+    return list(set(get_score_history_log().addresses()) | set(get_report_store().addresses()))
+
+def _legacy_wallet_total() -> int:
+    """wallets_analyzed as last written to persistent_stats.json by the old counter"""
+    stats = _get_static_stats()
     try:
-        stats_file = get_persistent_stats_file()
-        stats_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(stats_file, 'w', encoding='utf-8') as f:
-            json.dump(stats_data, f, indent=2)
-    except Exception as e:
-        print(f"Error saving persistent stats: {e}")
+        return int(stats.get("wallets_analyzed") or stats.get("total_wallets_analyzed") or 0)
+    except (TypeError, ValueError):
+        return 0
 
-def update_wallets_analyzed_count():
-    """Update the persistent wallets analyzed count based on current CSV files"""
-    base_dir = Path(__file__).parent.parent.parent
-    security_reports_dir = base_dir / "data" / "security_reports"
-    
-    # Load current persistent stats
-    persistent_stats = load_persistent_stats()
-    current_total = persistent_stats.get("total_wallets_analyzed", 0)
+def _wallet_counter() -> DistinctWalletCounter:
+    """Distinct wallet counter, seeded once from the legacy sources"""
+    counter = get_wallet_counter()
+    counter.seed_once(_legacy_wallet_addresses, _legacy_wallet_total)
+    return counter
+
+def _normalize_identifier(address: str) -> str:
+    """Normalize an address or Basename so equivalent inputs share one key"""
+    return address.strip().lower()
+
+
+# Concurrent identical /score requests share one computation
+_SCORE_FLIGHT = SingleFlight()
+
+def _score_and_record(address: str, details: bool):
+    """Calculate the score and record dashboard/stats side effects once per computation"""
+    result = calculate_score(address, include_details=details)
     
-    if security_reports_dir.exists():
-        # Count unique wallet addresses from current CSV files
-        wallet_addresses = set()
-        
-        for file_path in security_reports_dir.glob("*.csv"):
-            try:
-                filename = file_path.name
-                if '_' in filename:
-                    parts_filename = filename.split('_')
-                    if len(parts_filename) >= 3:
-                        address = parts_filename[2]
-                        if address.startswith('0x') and len(address) >= 42:
-                            wallet_addresses.add(address)
-            except Exception as e:
-                print(f"Error reading file {file_path}: {e}")
-                continue
+    # Update dashboard data for quick access
+    if details:
+        last_scores = {
+            "total_score": result.total_score,
+            "base_score": result.base_score or (result.base.base_score if result.base else 0.0),
+            "security_score": result.security_score or (result.security.security_score if result.security else 0.0),
+            "date": datetime.now().isoformat(),
+        }
+        # Record the wallet in the distinct counter (O(1)); tells us whether it is new
+        is_new_wallet = _wallet_counter().add(result.address or address)
+        append_score_history({"address": address, **last_scores})
         
-        current_analyzed = len(wallet_addresses)
+        dashboard_data = {
+            "lastScores": last_scores,
+            "scoreHistory": get_recent_history(address),
+            "badges": derive_badges_from_score(address, result),
+        }
+        previous_dashboard = get_user_dashboard(address)
+        save_user_dashboard(address, dashboard_data)
         
-        # Only update if we have more wallets than before
-        if current_analyzed > current_total:
-            persistent_stats["total_wallets_analyzed"] = current_analyzed
-            persistent_stats["last_updated"] = datetime.now().isoformat()
-            save_persistent_stats(persistent_stats)
-            return current_analyzed
+        # Update platform counters (in-memory, flushed to the shared stats store in the background)
+        try:
+            counters = get_stats_counters()
+            counters.add(TRUST_SCORE_SUM, result.total_score)
+            counters.add(TRUST_SCORE_COUNT, 1)
+            previous_earned = {b.get("id") for b in (previous_dashboard or {}).get("badges", []) if b.get("earned")}
+            newly_earned = {b["id"] for b in dashboard_data["badges"] if b.get("earned")} - previous_earned
+            if newly_earned:
+                counters.add(TOTAL_BADGES_EARNED, len(newly_earned))
+            if is_new_wallet:
+                print(f"New wallet analyzed: {address}. Total wallets: {_wallet_counter().count()}")
+        except Exception as e:
+            print(f"Error updating platform stats: {e}")
     
-    return current_total
+    return result
 
 @router.get("/score")
 def score_endpoint(
@@ -200,39 +200,10 @@ def score_endpoint(
     details: bool = Query(True, description="Whether to include detailed information in the response")
 ):
     try:
-        result = calculate_score(address, include_details=details)
-        
-        # Update dashboard data for quick access
-        if details:
-            dashboard_data = {
-                "lastScores": {
-                    "total_score": result.total_score,
-                    "base_score": result.base_score or (result.base.base_score if result.base else 0.0),
-                    "security_score": result.security_score or (result.security.security_score if result.security else 0.0),
-                    "date": datetime.now().isoformat(),
-                },
-                "scoreHistory": get_recent_history(address),
-                "badges": derive_badges_from_score(address, result),
-            }
-            save_user_dashboard(address, dashboard_data)
-            
-            # Update wallets analyzed count
-            try:
-                persistent_stats = load_persistent_stats()
-                current_wallets = persistent_stats.get("wallets_analyzed", 0)
-                
-                # Check if this is a new wallet (not in recent history)
-                recent_history = get_recent_history(address, limit=1)
-                if not recent_history:
-                    # New wallet, increment count
-                    persistent_stats["wallets_analyzed"] = current_wallets + 1
-                    persistent_stats["total_wallets_analyzed"] = current_wallets + 1
-                    persistent_stats["last_updated"] = datetime.now().isoformat()
-                    save_persistent_stats(persistent_stats)
-                    print(f"New wallet analyzed: {address}. Total wallets: {persistent_stats['wallets_analyzed']}")
-            except Exception as e:
-                print(f"Error updating wallets count: {e}")
-        
+        result = _SCORE_FLIGHT.do(
+            (_normalize_identifier(address), details),
+            lambda: _score_and_record(address, details),
+        )
         return JSONResponse(content=result.model_dump(exclude_none=True))
     except Exception as e:
         return JSONResponse(
@@ -244,45 +215,22 @@ def score_endpoint(
 def stats_endpoint():
     """Get live statistics for the BaseBadge platform"""
     
-    # Load current persistent stats
-    persistent_stats = load_persistent_stats()
-    
-    # Get wallets analyzed count (prefer persistent stats, fallback to CSV counting)
-    analyzed_wallets = persistent_stats.get("wallets_analyzed", 0)
-    if analyzed_wallets == 0:
-        analyzed_wallets = update_wallets_analyzed_count()
-        # Update persistent stats if we got a new count
-        if analyzed_wallets > 0:
-            persistent_stats["wallets_analyzed"] = analyzed_wallets
-            persistent_stats["total_wallets_analyzed"] = analyzed_wallets
-            save_persistent_stats(persistent_stats)
-    
-    # Count current CSV files for recent activity
-    base_dir = Path(__file__).parent.parent.parent
-    security_reports_dir = base_dir / "data" / "security_reports"
-    total_reports = 0
-    recent_activity = 0
+    # Display settings from persistent_stats.json (loaded once) and live counters (memory reads)
+    persistent_stats = _get_static_stats()
+    counters = get_stats_counters()
+    analyzed_wallets = _wallet_counter().count()
     
-    if security_reports_dir.exists():
-        current_time = datetime.now()
-        
-        for file_path in security_reports_dir.glob("*.csv"):
-            try:
-                file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                # Check if file is from last 24 hours
-                if current_time - file_time < timedelta(hours=24):
-                    recent_activity += 1
-                total_reports += 1
-            except Exception as e:
-                print(f"Error reading file {file_path}: {e}")
-                continue
+    # Report total and 24h ring of 1-minute buckets, both kept incrementally
+    total_reports = int(counters.get(TOTAL_REPORTS))
+    recent_activity = int(counters.window(TOTAL_REPORTS))
     
     # Use persistent stats values or calculate defaults
     accuracy_rate = persistent_stats.get("accuracy_rate", 95.0)
     security_checks = persistent_stats.get("security_checks", 4)
     monitoring_active = persistent_stats.get("monitoring_active", recent_activity > 0)
-    avg_score = persistent_stats.get("avg_trust_score", 75.0)
-    total_badges = persistent_stats.get("total_badges_earned", analyzed_wallets * 2)
+    score_count = counters.get(TRUST_SCORE_COUNT)
+    avg_score = counters.get(TRUST_SCORE_SUM) / score_count if score_count else persistent_stats.get("avg_trust_score", 75.0)
+    total_badges = int(counters.get(TOTAL_BADGES_EARNED, analyzed_wallets * 2))
     
     # Calculate some basic stats
     stats = {
@@ -302,222 +250,78 @@ def stats_endpoint():
 
 # New endpoints to back Dashboard/Badge/Settings pages
 
-def _read_onchain_last_score(address: str) -> Dict[str, int] | None:
-    """Read latest score from on-chain ScoreChecker V2.
-    Returns {"score": int, "timestamp": int} or None on failure.
-    """
-    try:
-        # Use V2 contract
-        sc_addr_raw = _SCORECHECKER_V2_ADDR or settings.score_checker_v2_address
-        if not sc_addr_raw:
-            return None
-        if not settings.base_rpc_url:
-            return None
-            
-        # Create web3 provider with retry mechanism and timeout
-        from requests.adapters import HTTPAdapter
-        from urllib3.util import Retry
-        import requests
-        
-        session = requests.Session()
-        # Configure retry strategy with backoff
-        retry_strategy = Retry(
-            total=3,  # Maximum number of retries
-            backoff_factor=0.5,  # Backoff factor for retry delay
-            status_forcelist=[429, 500, 502, 503, 504],  # Retry on these status codes
-            allowed_methods=["HEAD", "GET", "POST"]  # Methods to retry
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # Create provider with custom session and longer timeout
-        provider = Web3.HTTPProvider(
-            settings.base_rpc_url,
-            request_kwargs={'timeout': 10},  # 10 second timeout
-            session=session
-        )
-        w3 = Web3(provider)
-        sc_addr = Web3.to_checksum_address(sc_addr_raw)
-        user = Web3.to_checksum_address(address)
-        
-        # Try raw call first as it's more reliable
-        try:
-            # Use the getScore function selector
-            function_selector = w3.keccak(text="getScore(address)")[:4]
-            # Encode the address parameter
-            encoded_address = user[2:].rjust(64, '0')  # Remove 0x and pad to 32 bytes
-            call_data = function_selector + bytes.fromhex(encoded_address)
-            
-            # Make the call
-            raw_result = w3.eth.call({
-                'to': sc_addr,
-                'data': '0x' + call_data.hex()
-            })
-            
-            # Decode the result manually
-            if len(raw_result) >= 64:  # 2 * 32 bytes
-                score = int.from_bytes(raw_result[0:32], byteorder='big')
-                timestamp = int.from_bytes(raw_result[32:64], byteorder='big')
-                return {"score": score, "timestamp": timestamp}
-                
-        except Exception as raw_err:
-            print(f"Raw call error for getScore: {raw_err}")
-            # Don't immediately fail - try the ABI method
-        
-        # Fallback to ABI method
-        try:
-            # Use V2 ABI
-            abi = _SCORECHECKER_V2_ABI or [
-                {"inputs": [{"name": "user", "type": "address"}], "name": "getScore", "outputs": [
-                    {"name": "score", "type": "uint256"}, {"name": "timestamp", "type": "uint256"}
-                ], "stateMutability": "view", "type": "function"},
-            ]
-            c = w3.eth.contract(address=sc_addr, abi=abi)
-            res = c.functions.getScore(user).call()
-            if isinstance(res, (list, tuple)) and len(res) == 2:
-                return {"score": int(res[0]), "timestamp": int(res[1])}
-        except Exception as abi_err:
-            print(f"ABI call error for getScore: {abi_err}")
-            
+# Field order of the ScoreCard struct returned by getScoreCard (15 uint256 words)
+_SCORE_CARD_FIELDS = [
+    "totalScore", "baseScore", "securityScore", "numberOfTransactions", "currentStreak", "maxStreak",
+    "currentBalance", "avgBalanceLastMonth", "gasPaid", "suspiciousTokens", "suspiciousContracts",
+    "dangerousInteractions", "suspiciousNfts", "lastCheckTime", "lastIssuedAt",
+]
+
+def _decode_score(raw: bytes) -> Dict[str, int] | None:
+    """Decode getScore(address) return data: (score, timestamp)"""
+    if len(raw) < 64:  # 2 * 32 bytes
         return None
-    except Exception as e:
-        print(f"Error reading on-chain score: {e}")
+    return {
+        "score": int.from_bytes(raw[0:32], byteorder='big'),
+        "timestamp": int.from_bytes(raw[32:64], byteorder='big'),
+    }
+
+def _decode_score_card(raw: bytes) -> Dict[str, int] | None:
+    """Decode getScoreCard(address) return data (15 uint256 words)"""
+    if len(raw) < 32 * len(_SCORE_CARD_FIELDS):
         return None
+    return {
+        name: int.from_bytes(raw[i * 32:(i + 1) * 32], byteorder='big')
+        for i, name in enumerate(_SCORE_CARD_FIELDS)
+    }
 
-def _read_onchain_score_card(address: str) -> Dict[str, Any] | None:
-    """Read full score card from on-chain ScoreChecker V2.
-    Returns full score card data or None on failure.
+def score_checker_v2_address() -> str | None:
+    """ScoreChecker V2 address on-chain reads use (contract JSON first, then settings)"""
+    return _SCORECHECKER_V2_ADDR or settings.score_checker_v2_address
+
+def _fetch_onchain_score_and_card(sc_addr_raw: str, address: str) -> tuple[Dict[str, int] | None, Dict[str, Any] | None]:
+    """getScore and getScoreCard from ScoreChecker V2 in one Multicall3 round trip (raises on RPC errors)"""
+    w3 = get_web3(settings.base_rpc_url)
+    sc_addr = Web3.to_checksum_address(sc_addr_raw)
+    user = Web3.to_checksum_address(address)
+    (score_ok, score_raw), (card_ok, card_raw) = aggregate3(w3, [
+        Call(sc_addr, encode_call("getScore(address)", ["address"], [user])),
+        Call(sc_addr, encode_call("getScoreCard(address)", ["address"], [user])),
+    ])
+    return (
+        _decode_score(score_raw) if score_ok else None,
+        _decode_score_card(card_raw) if card_ok else None,
+    )
+
+def _read_onchain_score_and_card(address: str) -> tuple[Dict[str, int] | None, Dict[str, Any] | None]:
+    """Read getScore and getScoreCard from ScoreChecker V2.
+    Served from the event-invalidated card cache while its follower is in sync, else from the RPC.
+    Returns (score, card); either is None when unavailable.
     """
     try:
-        # Use V2 contract
-        sc_addr_raw = _SCORECHECKER_V2_ADDR or settings.score_checker_v2_address
-        if not sc_addr_raw:
-            return None
-        if not settings.base_rpc_url:
-            return None
-            
-        # Create web3 provider with retry mechanism and timeout
-        from requests.adapters import HTTPAdapter
-        from urllib3.util import Retry
-        import requests
-        
-        session = requests.Session()
-        # Configure retry strategy with backoff
-        retry_strategy = Retry(
-            total=3,  # Maximum number of retries
-            backoff_factor=0.5,  # Backoff factor for retry delay
-            status_forcelist=[429, 500, 502, 503, 504],  # Retry on these status codes
-            allowed_methods=["HEAD", "GET", "POST"]  # Methods to retry
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # Create provider with custom session and longer timeout
-        provider = Web3.HTTPProvider(
-            settings.base_rpc_url,
-            request_kwargs={'timeout': 10},  # 10 second timeout
-            session=session
+        sc_addr_raw = score_checker_v2_address()
+        if not sc_addr_raw or not settings.base_rpc_url:
+            return None, None
+        return get_score_card_cache().get_or_load(
+            address, lambda: _fetch_onchain_score_and_card(sc_addr_raw, address)
         )
-        w3 = Web3(provider)
-        sc_addr = Web3.to_checksum_address(sc_addr_raw)
-        user = Web3.to_checksum_address(address)
-        
-        # Try raw call first as it's more reliable
-        try:
-            # Use the getScoreCard function selector
-            function_selector = w3.keccak(text="getScoreCard(address)")[:4]
-            # Encode the address parameter
-            encoded_address = user[2:].rjust(64, '0')  # Remove 0x and pad to 32 bytes
-            call_data = function_selector + bytes.fromhex(encoded_address)
-            
-            # Make the call
-            raw_result = w3.eth.call({
-                'to': sc_addr,
-                'data': '0x' + call_data.hex()
-            })
-            
-            # Decode the result manually
-            if len(raw_result) >= 480:  # 15 * 32 bytes
-                values = []
-                for i in range(15):
-                    start = i * 32
-                    end = start + 32
-                    value = int.from_bytes(raw_result[start:end], byteorder='big')
-                    values.append(value)
-                
-                return {
-                    "totalScore": values[0],
-                    "baseScore": values[1],
-                    "securityScore": values[2],
-                    "numberOfTransactions": values[3],
-                    "currentStreak": values[4],
-                    "maxStreak": values[5],
-                    "currentBalance": values[6],
-                    "avgBalanceLastMonth": values[7],
-                    "gasPaid": values[8],
-                    "suspiciousTokens": values[9],
-                    "suspiciousContracts": values[10],
-                    "dangerousInteractions": values[11],
-                    "suspiciousNfts": values[12],
-                    "lastCheckTime": values[13],
-                    "lastIssuedAt": values[14]
-                }
-            
-        except Exception as raw_err:
-            print(f"Raw call error: {raw_err}")
-            # Don't immediately fail - try the ABI method
-            
-        # Fallback to ABI method if available
-        if _SCORECHECKER_V2_ABI:
-            c = w3.eth.contract(address=sc_addr, abi=_SCORECHECKER_V2_ABI)
-            try:
-                result = c.functions.getScoreCard(user).call()
-                
-                if result and len(result) >= 15:
-                    return {
-                        "totalScore": int(result[0]),
-                        "baseScore": int(result[1]),
-                        "securityScore": int(result[2]),
-                        "numberOfTransactions": int(result[3]),
-                        "currentStreak": int(result[4]),
-                        "maxStreak": int(result[5]),
-                        "currentBalance": int(result[6]),
-                        "avgBalanceLastMonth": int(result[7]),
-                        "gasPaid": int(result[8]),
-                        "suspiciousTokens": int(result[9]),
-                        "suspiciousContracts": int(result[10]),
-                        "dangerousInteractions": int(result[11]),
-                        "suspiciousNfts": int(result[12]),
-                        "lastCheckTime": int(result[13]),
-                        "lastIssuedAt": int(result[14])
-                    }
-            except Exception as abi_err:
-                print(f"ABI call error: {abi_err}")
-                # Both methods failed
-        
-        return None
     except Exception as e:
-        print(f"Error reading on-chain score card: {e}")
-        return None
+        print(f"Error reading on-chain score and card: {e}")
+        return None, None
 
 
 @router.get("/onchain/score")
 def get_onchain_score(address: str = Query(..., description="Wallet address")):
     """Get score data directly from on-chain. No fallback to backend calculations."""
     try:
-        # Read simple score
-        score_data = _read_onchain_last_score(address)
+        # Read simple score and full score card in one round trip
+        score_data, score_card = _read_onchain_score_and_card(address)
         if not score_data:
             return JSONResponse(
                 status_code=404,
                 content={"error": "No on-chain score found for this address"}
             )
         
-        # Read full score card
-        score_card = _read_onchain_score_card(address)
-        
         if score_card:
             # Return full data if available
             return JSONResponse(content={
@@ -579,13 +383,104 @@ def get_onchain_score(address: str = Query(..., description="Wallet address")):
         )
 
 
+def _read_onchain_score_cards(addresses: List[str]) -> List[Dict[str, Any] | None]:
+    """getScoreCard for many addresses in JSON-RPC batches (one eth_call per address)"""
+    sc_addr_raw = score_checker_v2_address()
+    if not sc_addr_raw or not settings.base_rpc_url:
+        return [None] * len(addresses)
+    sc_addr = Web3.to_checksum_address(sc_addr_raw)
+    responses = get_rpc_batcher(settings.base_rpc_url).request_many([
+        ("eth_call", [{"to": sc_addr, "data": "0x" + encode_call(
+            "getScoreCard(address)", ["address"], [Web3.to_checksum_address(a)]).hex()}, "latest"])
+        for a in addresses
+    ])
+    cards = []
+    for address, response in zip(addresses, responses):
+        try:
+            cards.append(_decode_score_card(bytes.fromhex((result_or_raise(response) or "0x")[2:])))
+        except Exception as e:
+            print(f"Error reading on-chain score card for {address}: {e}")
+            cards.append(None)
+    return cards
+
+
+_MAX_BATCH_ADDRESSES = 100
+
+
+@router.get("/onchain/scores")
+def get_onchain_scores(
+    addresses: str = Query(..., description="Comma-separated wallet addresses (max 100)"),
+    with_basenames: bool = Query(False, description="Also reverse-resolve Basenames"),
+):
+    """On-chain score cards for many wallets, read with batched JSON-RPC requests."""
+    wanted = [a.strip() for a in addresses.split(",") if a.strip()]
+    if not wanted or len(wanted) > _MAX_BATCH_ADDRESSES:
+        raise HTTPException(status_code=400, detail=f"Provide between 1 and {_MAX_BATCH_ADDRESSES} addresses")
+    if any(not a.startswith("0x") or len(a) != 42 for a in wanted):
+        raise HTTPException(status_code=400, detail="Invalid address format")
+    try:
+        cards = _read_onchain_score_cards(wanted)
+        basenames = resolve_addresses_to_basenames(wanted) if with_basenames else {}
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": f"Failed to read on-chain data: {str(e)}"})
+    scores = []
+    for address, card in zip(wanted, cards):
+        entry: Dict[str, Any] = {"address": address}
+        if with_basenames:
+            entry["basename"] = basenames.get(address)
+        if card and card["lastCheckTime"] > 0:
+            entry.update({
+                "total_score": card["totalScore"],
+                "base_score": card["baseScore"],
+                "security_score": card["securityScore"],
+                "timestamp": card["lastCheckTime"],
+            })
+        else:
+            entry["total_score"] = None
+        scores.append(entry)
+    return JSONResponse(content={"scores": scores})
+
+
+@router.get("/leaderboard")
+def get_leaderboard(
+    limit: int = Query(50, ge=1, le=_MAX_BATCH_ADDRESSES, description="Entries per page"),
+    offset: int = Query(0, ge=0),
+    with_basenames: bool = Query(False, description="Also reverse-resolve Basenames"),
+):
+    """Top on-chain scores from the local ScoreChecker event index (ties share a rank)."""
+    index = get_score_index()
+    entries = index.leaderboard(limit=limit, offset=offset)
+    if with_basenames and entries:
+        try:
+            basenames = resolve_addresses_to_basenames([e["address"] for e in entries])
+        except Exception as e:
+            print(f"Error resolving leaderboard basenames: {e}")
+            basenames = {}
+        for entry in entries:
+            entry["basename"] = basenames.get(entry["address"])
+    return JSONResponse(content={"entries": entries, **index.stats()})
+
+
+@router.get("/rank")
+def get_rank(address: str = Query(..., description="Wallet address")):
+    """Rank and percentile of a wallet among all indexed on-chain scores."""
+    if not address.startswith("0x") or len(address) != 42:
+        raise HTTPException(status_code=400, detail="Invalid address format")
+    index = get_score_index()
+    result = index.rank(address)
+    if result is None:
+        return JSONResponse(status_code=404, content={"error": "No indexed on-chain score for this address"})
+    stats = index.stats()
+    result.update({"last_block": stats["last_block"], "caught_up": stats["caught_up"]})
+    return JSONResponse(content=result)
+
+
 @router.get("/dashboard/summary")
 def dashboard_summary(address: str = Query(...)):
     """Get dashboard summary. ALWAYS reads from on-chain first."""
     try:
-        # ALWAYS try to read from on-chain first
-        onchain = _read_onchain_last_score(address)
-        onchain_card = _read_onchain_score_card(address)
+        # ALWAYS try on-chain data first (event-invalidated cache, else one Multicall3 round trip)
+        onchain, onchain_card = _read_onchain_score_and_card(address)
         
         if onchain and onchain.get("timestamp", 0) > 0:
             # We have on-chain data - use it exclusively
@@ -693,79 +588,47 @@ def score_contract_info(address: str | None = Query(default=None, description="O
         if not settings.score_checker_address:
             raise HTTPException(status_code=500, detail="ScoreChecker address not configured")
             
-        # Create web3 provider with retry mechanism and timeout
-        from requests.adapters import HTTPAdapter
-        from urllib3.util import Retry
-        import requests
-        
-        session = requests.Session()
-        # Configure retry strategy with backoff
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=0.5,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "POST"]
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # Create provider with custom session and longer timeout
-        provider = Web3.HTTPProvider(
-            settings.base_rpc_url,
-            request_kwargs={'timeout': 10},
-            session=session
-        )
-        w3 = Web3(provider)
+        # Shared pooled RPC client (keep-alive connections, unified retry/timeout)
+        w3 = get_web3(settings.base_rpc_url)
         
         sc_addr_raw = settings.score_checker_address or _SCORECHECKER_ADDR_FROM_JSON or ""
         sc_addr = Web3.to_checksum_address(sc_addr_raw)
-        # Check code exists
-        code = w3.eth.get_code(sc_addr)
-        if not code or len(code) == 0:
-            raise HTTPException(status_code=400, detail=f"No contract code at {sc_addr} on RPC {settings.base_rpc_url}")
-        minimal_abi = [
-            {"inputs": [], "name": "authorizedSigner", "outputs": [{"type": "address"}], "stateMutability": "view", "type": "function"},
-            {"inputs": [], "name": "checkFee", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"},
-            {"inputs": [], "name": "minInterval", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"},
-            {"inputs": [], "name": "maxSigAge", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"},
-            {"inputs": [{"name": "user", "type": "address"}], "name": "nonces", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"},
-        ]
-        c = w3.eth.contract(address=sc_addr, abi=minimal_abi)
         
-        # Use try/except for each call to handle potential errors
-        try:
-            signer_onchain = c.functions.authorizedSigner().call()
-        except Exception as e:
-            print(f"Error getting authorizedSigner: {e}")
-            signer_onchain = "0x0000000000000000000000000000000000000000"
-            
-        try:
-            fee = int(c.functions.checkFee().call())
-        except Exception as e:
-            print(f"Error getting checkFee: {e}")
-            fee = 0
-            
-        try:
-            interval = int(c.functions.minInterval().call())
-        except Exception as e:
-            print(f"Error getting minInterval: {e}")
-            interval = 0
-            
-        try:
-            max_age = int(c.functions.maxSigAge().call())
-        except Exception as e:
-            print(f"Error getting maxSigAge: {e}")
-            max_age = 0
-            
-        nonce_value = None
+        # All view calls in one Multicall3 round trip; each may fail on its own
+        calls = [
+            ("authorizedSigner", Call(sc_addr, encode_call("authorizedSigner()"))),
+            ("checkFee", Call(sc_addr, encode_call("checkFee()"))),
+            ("minInterval", Call(sc_addr, encode_call("minInterval()"))),
+            ("maxSigAge", Call(sc_addr, encode_call("maxSigAge()"))),
+        ]
         if address:
+            user = Web3.to_checksum_address(address)
+            calls.append(("nonces", Call(sc_addr, encode_call("nonces(address)", ["address"], [user]))))
+        results = dict(zip([name for name, _ in calls], aggregate3(w3, [call for _, call in calls])))
+        
+        # Calls to an address without code succeed with empty data; confirm before failing
+        if not any(data for _, data in results.values()):
+            code = w3.eth.get_code(sc_addr)
+            if not code or len(code) == 0:
+                raise HTTPException(status_code=400, detail=f"No contract code at {sc_addr} on RPC {settings.base_rpc_url}")
+        
+        def _decode(name: str, output_type: str, default):
+            ok, data = results[name]
             try:
-                user = Web3.to_checksum_address(address)
-                nonce_value = int(c.functions.nonces(user).call())
+                if not ok:
+                    raise ValueError("call reverted")
+                return decode([output_type], data)[0]
             except Exception as e:
-                print(f"Error getting nonce for {address}: {e}")
-                nonce_value = 0
+                print(f"Error getting {name}: {e}")
+                return default
+        
+        signer_onchain = Web3.to_checksum_address(
+            _decode("authorizedSigner", "address", "0x0000000000000000000000000000000000000000")
+        )
+        fee = int(_decode("checkFee", "uint256", 0))
+        interval = int(_decode("minInterval", "uint256", 0))
+        max_age = int(_decode("maxSigAge", "uint256", 0))
+        nonce_value = int(_decode("nonces", "uint256", 0)) if address else None
         return JSONResponse(content={
             "rpc": settings.base_rpc_url,
             "chainId": settings.chain_id,
@@ -786,9 +649,8 @@ def score_contract_info(address: str | None = Query(default=None, description="O
 def get_badges(address: str = Query(...)):
     """Get badges based on on-chain score data."""
     try:
-        # ALWAYS read from on-chain first
-        onchain = _read_onchain_last_score(address)
-        onchain_card = _read_onchain_score_card(address)
+        # ALWAYS use on-chain data first (event-invalidated cache, else one Multicall3 round trip)
+        onchain, onchain_card = _read_onchain_score_and_card(address)
         
         if onchain and onchain.get("timestamp", 0) > 0:
             # We have on-chain data - use it exclusively
@@ -841,43 +703,15 @@ def get_badges(address: str = Query(...)):
         return JSONResponse(content={"address": address, "badges": []})
 
 
-# Simple in-memory profile storage for now; can be replaced with DB later
-_PROFILES: dict[str, dict] = {}
-
-def get_profiles_file():
-    base_dir = Path(__file__).parent.parent.parent
-    return base_dir / "data" / "profiles.json"
-
-def load_profiles() -> dict:
-    path = get_profiles_file()
-    if path.exists():
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, dict):
-                    return data
-        except Exception:
-            return {}
-    return {}
-
-def save_profiles(data: dict) -> None:
-    path = get_profiles_file()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
-
-# initialize profiles from disk
-_PROFILES = load_profiles()
+# Profiles are stored per record (see backend/utils/profile_store.py)
 
 
 @router.get("/profile")
 def get_profile(address: str = Query(...)):
-    profile = _PROFILES.get(address.lower())
+    profile = get_profile_repository().get(address)
     if not profile:
-        # default profile
+        # default profile (not persisted until the user saves one)
         profile = UserProfile(address=address).model_dump()
-        _PROFILES[address.lower()] = profile
-        save_profiles(_PROFILES)
     return JSONResponse(content=profile)
 
 
@@ -885,7 +719,8 @@ def get_profile(address: str = Query(...)):
 def save_profile(profile: UserProfile):
     # Preserve user-set username/avatar even when useBasenameProfile is toggled on
     # Store resolved basename separately (basename, basenameAvatar) for display-only
-    existing = _PROFILES.get(profile.address.lower(), {})
+    profiles = get_profile_repository()
+    existing = profiles.get(profile.address) or {}
     data = profile.model_dump()
     if profile.useBasenameProfile:
         # If payload includes basename/basenameAvatar, keep them in separate fields
@@ -901,8 +736,7 @@ def save_profile(profile: UserProfile):
         data["basename"] = None
         data["basenameAvatar"] = None
 
-    _PROFILES[profile.address.lower()] = data
-    save_profiles(_PROFILES)
+    profiles.upsert(profile.address, data)
     return JSONResponse(content={"status": "saved"})
 
 
@@ -953,7 +787,7 @@ def sign_score(
         if not settings.authorized_signer_private_key:
             raise HTTPException(status_code=500, detail="Signer not configured")
 
-        w3 = Web3(Web3.HTTPProvider(settings.base_rpc_url))
+        w3 = get_web3(settings.base_rpc_url)
         sc_addr = Web3.to_checksum_address(contract_addr)
         user = Web3.to_checksum_address(address)
 
@@ -1077,7 +911,7 @@ def sign_score_card(
         if not settings.authorized_signer_private_key:
             raise HTTPException(status_code=500, detail="Signer not configured")
 
-        w3 = Web3(Web3.HTTPProvider(settings.base_rpc_url))
+        w3 = get_web3(settings.base_rpc_url)
         sc_addr = Web3.to_checksum_address(contract_addr)
         user = Web3.to_checksum_address(address)
 
@@ -1187,6 +1021,49 @@ def sign_score_card(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/metrics/report_writer")
+def report_writer_metrics():
+    """Queue depth and backpressure counters of the background security report writer"""
+    return JSONResponse(content=report_writer.metrics())
+
+
+@router.get("/metrics/onchain_cache")
+def onchain_cache_metrics():
+    """Hit/miss counters and sync state of the event-invalidated on-chain score card cache"""
+    return JSONResponse(content=get_score_card_cache().stats())
+
+
+@router.get("/csv/list/{address}")
+def list_csv_reports(address: str):
+    """
+    List available CSV security reports for a specific address
+    """
+    try:
+        # Validate address format
+        if not address.startswith('0x') or len(address) != 42:
+            raise HTTPException(status_code=400, detail="Invalid address format")
+        
+        # Indexed query plus reports still cached for on-demand writing, newest first
+        stored = get_report_store().list_reports(address) + report_writer.pending(address)
+        reports = [
+            {
+                "type": report["report_type"],
+                "timestamp": report["timestamp"],
+                "filename": f"{report['report_type']}_{address}_{report['timestamp']}.csv",
+                "size": report["size"],
+                "download_url": f"/csv/{report['report_type']}/{address}?timestamp={report['timestamp']}"
+            }
+            for report in sorted(stored, key=lambda r: r["created_at"], reverse=True)
+        ]
+        
+        return JSONResponse(content={"reports": reports})
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list CSV reports: {str(e)}")
+
+
 @router.get("/csv/{report_type}/{address}")
 def download_csv_report(
     report_type: str,
@@ -1199,49 +1076,30 @@ def download_csv_report(
     """
     try:
         # Validate report type
-        valid_types = ['risky_tokens', 'risky_contracts', 'risky_signs', 'suspicious_nfts']
-        if report_type not in valid_types:
-            raise HTTPException(status_code=400, detail=f"Invalid report type. Must be one of: {', '.join(valid_types)}")
+        if report_type not in REPORT_TYPES:
+            raise HTTPException(status_code=400, detail=f"Invalid report type. Must be one of: {', '.join(REPORT_TYPES)}")
         
         # Validate address format
         if not address.startswith('0x') or len(address) != 42:
             raise HTTPException(status_code=400, detail="Invalid address format")
         
-        # Get the security reports directory
-        base_dir = Path(__file__).parent.parent.parent
-        reports_dir = base_dir / "data" / "security_reports"
+        # Write a report that is only cached (lazy mode) on its first download
+        report_writer.materialize(report_type, address)
         
-        if not reports_dir.exists():
-            raise HTTPException(status_code=404, detail="Security reports directory not found")
-        
-        # Find the most recent CSV file for this address and report type
-        pattern = f"{report_type}_{address}_*.csv"
-        csv_files = list(reports_dir.glob(pattern))
-        
-        if not csv_files:
-            raise HTTPException(status_code=404, detail=f"No {report_type} reports found for address {address}")
-        
-        # If timestamp is provided, try to find exact match
-        if timestamp:
-            target_file = reports_dir / f"{report_type}_{address}_{timestamp}.csv"
-            if not target_file.exists():
+        # Indexed lookup of the most recent report (or the one with this timestamp)
+        store = get_report_store()
+        report = store.find_report(report_type, address, timestamp)
+        if not report:
+            if timestamp:
                 raise HTTPException(status_code=404, detail=f"Report not found for timestamp {timestamp}")
-        else:
-            # Get the most recent file (by filename sorting)
-            csv_files.sort(reverse=True)
-            target_file = csv_files[0]
-        
-        # Read the CSV file
-        if not target_file.exists():
-            raise HTTPException(status_code=404, detail="Report file not found")
+            raise HTTPException(status_code=404, detail=f"No {report_type} reports found for address {address}")
         
-        # Return the CSV file as a download
-        from fastapi.responses import FileResponse
+        # Stream the CSV straight from the store
+        from fastapi.responses import StreamingResponse
         
-        filename = f"{report_type}_{address}_{target_file.stem.split('_')[-1]}.csv"
-        return FileResponse(
-            path=str(target_file),
-            filename=filename,
+        filename = f"{report_type}_{address}_{report['timestamp']}.csv"
+        return StreamingResponse(
+            store.stream_csv(report),
             media_type='text/csv',
             headers={'Content-Disposition': f'attachment; filename="{filename}"'}
         )
@@ -1250,49 +1108,3 @@ def download_csv_report(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to download CSV report: {str(e)}")
-
-
-@router.get("/csv/list/{address}")
-def list_csv_reports(address: str):
-    """
-    List available CSV security reports for a specific address
-    """
-    try:
-        # Validate address format
-        if not address.startswith('0x') or len(address) != 42:
-            raise HTTPException(status_code=400, detail="Invalid address format")
-        
-        # Get the security reports directory
-        base_dir = Path(__file__).parent.parent.parent
-        reports_dir = base_dir / "data" / "security_reports"
-        
-        if not reports_dir.exists():
-            return JSONResponse(content={"reports": []})
-        
-        # Find all CSV files for this address
-        pattern = f"*_{address}_*.csv"
-        csv_files = list(reports_dir.glob(pattern))
-        
-        reports = []
-        for file_path in csv_files:
-            # Parse filename: type_address_timestamp.csv
-            parts = file_path.stem.split('_')
-            if len(parts) >= 3:
-                report_type = parts[0]
-                timestamp = '_'.join(parts[2:])  # Handle timestamps with underscores
-                
-                reports.append({
-                    "type": report_type,
-                    "timestamp": timestamp,
-                    "filename": file_path.name,
-                    "size": file_path.stat().st_size,
-                    "download_url": f"/csv/{report_type}/{address}?timestamp={timestamp}"
-                })
-        
-        # Sort by timestamp (newest first)
-        reports.sort(key=lambda x: x["timestamp"], reverse=True)
-        
-        return JSONResponse(content={"reports": reports})
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to list CSV reports: {str(e)}")
\ No newline at end of file
@@ -1,10 +1,43 @@
 # backend/backend.py
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.api.routes import router
+from backend.api.routes import router, score_checker_v2_address
+from backend.utils.http_client import http_client
+from backend.utils.cleanup import close_report_retention, start_report_retention
+from backend.utils.kv_store import close_stores
+from backend.utils.report_writer import report_writer
+from backend.utils.rpc_client import rpc_client
+from backend.utils.score_card_cache import close_score_card_follower, start_score_card_follower
+from backend.utils.score_index import close_score_indexer, start_score_indexer
+from backend.utils.stats_counters import close_stats_counters
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared upstream HTTP client (pooled keep-alive connections for Blockscout/Etherscan/Zerion)
+    http_client.start()
+    # Archive expired security reports in the background
+    start_report_retention()
+    # Keep cached on-chain score cards fresh from ScoreChecker events
+    start_score_card_follower(score_checker_v2_address())
+    # Backfill and tail the leaderboard index
+    start_score_indexer(score_checker_v2_address())
+    yield
+    close_score_card_follower()
+    close_score_indexer()
+    http_client.close()
+    rpc_client.close()
+    close_report_retention()
+    # Drain queued security reports
+    report_writer.close()
+    # Commit write-behind records (dashboards, stats counters) before the worker exits
+    close_stores()
+    close_stats_counters()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -15,4 +48,4 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(router)
\ No newline at end of file
+app.include_router(router)
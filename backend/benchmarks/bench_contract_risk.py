@@ -0,0 +1,64 @@
+"""
+Benchmark: per-contract risk analysis, index-based vs. the old per-contract scan.
+
+Run from the repo root:
+    python -m backend.benchmarks.bench_contract_risk
+"""
+
+import random
+import time
+
+from backend.utils.tx_frame import TxFrame
+from backend.utils.wallet import score_contract_risk
+
+USER = "0x" + "ab" * 20
+
+
+def make_transactions(n: int, contracts: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    pool = ["0x%040x" % rng.randrange(1, 2**160) for _ in range(contracts)]
+    now = int(time.time())
+    return [
+        {
+            "timeStamp": str(now - rng.randrange(0, 365 * 86400)),
+            "from": USER,
+            "to": rng.choice(pool),
+            "gasUsed": str(rng.randrange(21000, 900000)),
+            "value": str(rng.randrange(0, 5 * 10**18)),
+            "input": "0x095ea7b3" + "0" * 128,
+        }
+        for _ in range(n)
+    ]
+
+
+def scan_per_contract(transactions: list) -> int:
+    """Old approach: rescan every transaction for every unique contract."""
+    contracts = {tx["to"].lower() for tx in transactions}
+    for addr in contracts:
+        contract_txs = [tx for tx in transactions if tx.get("to", "").lower() == addr]
+        sum(int(tx["gasUsed"]) for tx in contract_txs)
+    return len(contracts)
+
+
+def index_once(transactions: list) -> int:
+    frame = TxFrame(transactions)
+    index = frame.contract_aggregates(USER)
+    for addr, agg in index.items():
+        score_contract_risk(addr, agg)
+    return len(index)
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{'txs':>8} {'contracts':>10} {'scan (s)':>10} {'index (s)':>10} {'index us/tx':>12}")
+    for n in (1_000, 5_000, 20_000, 100_000):
+        # Unique contracts grow with activity, which is what makes the scan quadratic
+        txs = make_transactions(n, contracts=max(10, n // 20))
+        scan = timed(scan_per_contract, txs) if n <= 20_000 else float("nan")
+        index = timed(index_once, txs)
+        print(f"{n:>8} {n // 20:>10} {scan:>10.3f} {index:>10.3f} {index / n * 1e6:>12.2f}")
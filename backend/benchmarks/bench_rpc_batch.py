@@ -0,0 +1,103 @@
+"""
+Benchmark: N eth_calls as sequential POSTs vs. JSON-RPC batches vs. coalesced concurrent calls.
+
+Runs against a local JSON-RPC stand-in that adds a fixed delay per POST to model
+the round trip to a remote RPC. Run from the repo root:
+    python -m backend.benchmarks.bench_rpc_batch
+"""
+
+import json
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from web3 import Web3
+
+from backend.utils.rpc_batch import BatchingHTTPProvider, RpcBatcher
+
+RTT = 0.02  # seconds per POST
+TARGET = Web3.to_checksum_address("0x" + "5c" * 20)
+
+
+class StandInRpc(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        batch = payload if isinstance(payload, list) else [payload]
+        time.sleep(RTT)
+        out = [
+            {"jsonrpc": "2.0", "id": r["id"], "result": "0x2105" if r["method"] == "eth_chainId" else "0x" + "00" * 32}
+            for r in batch
+        ]
+        body = json.dumps(out if isinstance(payload, list) else out[0]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def call_params(i: int) -> list:
+    return [{"to": TARGET, "data": "0x" + i.to_bytes(4, "big").hex()}, "latest"]
+
+
+def sequential(url: str, n: int) -> None:
+    w3 = Web3(Web3.HTTPProvider(url, session=requests.Session(), cache_allowed_requests=True))
+    for i in range(n):
+        w3.eth.call(call_params(i)[0])
+
+
+def explicit_batches(url: str, n: int, max_batch_size: int) -> None:
+    RpcBatcher(requests.Session(), url, max_batch_size=max_batch_size).request_many(
+        [("eth_call", call_params(i)) for i in range(n)]
+    )
+
+
+def coalesced(url: str, n: int, max_batch_size: int, threads: int = 32) -> float:
+    """Seconds for n eth_calls from `threads` concurrent callers sharing one batching Web3 (warmed up)."""
+    batcher = RpcBatcher(requests.Session(), url, max_batch_size=max_batch_size)
+    w3 = Web3(BatchingHTTPProvider(url, batcher, session=requests.Session(), cache_allowed_requests=True))
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        # web3 caches eth_chainId per thread; keep that one-time lookup out of the timing
+        list(pool.map(lambda i: w3.eth.call(call_params(i)[0]), range(threads * 4)))
+        start = time.perf_counter()
+        list(pool.map(lambda i: w3.eth.call(call_params(i)[0]), range(n)))
+        elapsed = time.perf_counter() - start
+    batcher.close()
+    return elapsed
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def serve(port_queue) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInRpc)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    # The stand-in runs in its own process so it does not compete with the client for the GIL
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(port_queue,), daemon=True)
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get()}"
+    print(f"stand-in RPC with {RTT * 1000:.0f} ms per POST")
+    print(f"{'calls':>6} {'sequential (s)':>15} {'batch/50 (s)':>13} {'batch/200 (s)':>14} {'coalesced (s)':>14}")
+    for n in (10, 100, 500):
+        seq = timed(sequential, url, n) if n <= 100 else float("nan")
+        b50 = timed(explicit_batches, url, n, 50)
+        b200 = timed(explicit_batches, url, n, 200)
+        co = coalesced(url, n, 50)
+        print(f"{n:>6} {seq:>15.3f} {b50:>13.3f} {b200:>14.3f} {co:>14.3f}")
+    server.terminate()
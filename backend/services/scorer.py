@@ -2,24 +2,27 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from backend.utils.wallet import (
-    get_wallet_data, get_risk_tokens,
+    WalletContext, build_wallet_context, get_wallet_data, get_risk_tokens,
     get_risky_contracts, get_risky_signs, get_suspicious_nfts
 )
 from backend.models.score import ScoreResponse, ScoreBreakdown, SecurityBreakdown
 from typing import List, Dict, Any
 from dataclasses import dataclass
 
-def run_security_functions_parallel(address: str) -> dict:
+def run_security_functions_parallel(address: str, ctx: WalletContext | None = None) -> dict:
     """
     Run all security functions in parallel for maximum speed.
+    All analyzers share one WalletContext so each upstream dataset is fetched once.
     Returns a dictionary with all security analysis results.
     """
+    if ctx is None:
+        ctx = build_wallet_context(address)
     with ThreadPoolExecutor(max_workers=8) as executor:
         # Submit all security functions to run in parallel
-        risky_tokens_future = executor.submit(get_risk_tokens, address)
-        risky_contracts_future = executor.submit(get_risky_contracts, address)
-        risky_signs_future = executor.submit(get_risky_signs, address)
-        suspicious_nfts_future = executor.submit(get_suspicious_nfts, address)
+        risky_tokens_future = executor.submit(get_risk_tokens, address, ctx)
+        risky_contracts_future = executor.submit(get_risky_contracts, address, ctx)
+        risky_signs_future = executor.submit(get_risky_signs, address, ctx)
+        suspicious_nfts_future = executor.submit(get_suspicious_nfts, address, ctx)
         
         # Get results with error handling (reduced timeout for speed)
         try:
@@ -87,7 +90,10 @@ def run_security_functions_parallel(address: str) -> dict:
     }
 
 def calculate_score(address: str, include_details: bool = True) -> ScoreResponse:
-    data = get_wallet_data(address)
+    # Resolve once and share the fetched txlist/tokentx/tokennfttx across all metrics and analyzers
+    ctx = build_wallet_context(address)
+    ctx.prefetch()
+    data = get_wallet_data(address, ctx=ctx)
 
     # ---- Defensive coercion to avoid 500s on missing/None types ----
     try:
@@ -132,7 +138,7 @@ def calculate_score(address: str, include_details: bool = True) -> ScoreResponse
     ])
 
     # Security Score - PARALLEL EXECUTION
-    security_results = run_security_functions_parallel(address)
+    security_results = run_security_functions_parallel(address, ctx=ctx)
     
     risky_tokens_score = security_results["risky_tokens_score"]
     risky_tokens_count = security_results["risky_tokens_count"]
@@ -0,0 +1,35 @@
+import time
+
+from backend.utils.cleanup import ReportRetention
+from backend.utils.report_store import ReportStore
+
+ADDR = "0x" + "cd" * 20
+DAY = 86400
+
+
+def _rows(n):
+    return [{"contract_address": f"0x{i:040x}", "risk_score": i, "risk_level": "HIGH"} for i in range(n)]
+
+
+def test_expired_reports_move_to_day_segments_and_stay_downloadable(tmp_path):
+    store = ReportStore(tmp_path / "reports.sqlite3", archive_dir=tmp_path / "archive")
+    now = time.time()
+    expected = {}
+    for age_days, n in [(40, 3), (40, 800), (35, 1), (1, 2)]:
+        report_id = store.save_report("risky_contracts", ADDR, _rows(n), created_at=now - age_days * DAY - n)
+        expected[report_id] = "".join(store.stream_csv(store.list_reports(ADDR)[0] | {"id": report_id}))
+
+    result = ReportRetention(store, retention_days=30, batch_size=2, pause=0).run_once(now=now)
+    assert result["archived"] == 3 and result["batches"] == 2
+    assert len(list((tmp_path / "archive").glob("reports-*.gz"))) == 2
+    assert result["bytes_out"] < result["bytes_in"]
+
+    listed = store.list_reports(ADDR)
+    assert len(listed) == 4 and store.count_reports() == 4
+    assert [bool(r["segment"]) for r in listed] == [False, True, True, True]
+    for report in listed:
+        assert "".join(store.stream_csv(report)) == expected[report["id"]]
+    assert store.find_report("risky_contracts", ADDR, listed[-1]["timestamp"])["segment"]
+
+    # Nothing left to archive; archived reports are not archived twice
+    assert ReportRetention(store, retention_days=30).run_once(now=now)["archived"] == 0
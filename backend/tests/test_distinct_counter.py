@@ -0,0 +1,65 @@
+from backend.utils.distinct_counter import MODE_EXACT, MODE_HLL, DistinctWalletCounter, HyperLogLog, wallet_digest
+
+ADDR = "0xAbC0000000000000000000000000000000000001"
+
+
+def _wallets(n, offset=0):
+    return [f"0x{i + offset:040x}" for i in range(n)]
+
+
+def test_exact_mode_reports_new_wallets_across_workers(tmp_path):
+    path = tmp_path / "wallets.sqlite3"
+    worker_a = DistinctWalletCounter(path, cache_ttl=0)
+    worker_b = DistinctWalletCounter(path, cache_ttl=0)
+
+    assert worker_a.add(ADDR) is True
+    assert worker_b.add(ADDR.lower()) is False
+    assert worker_b.add_many(_wallets(10)) == 10
+    assert worker_a.count() == 11
+    assert worker_a.mode == MODE_EXACT
+
+
+def test_switches_to_hyperloglog_past_exact_limit(tmp_path):
+    counter = DistinctWalletCounter(tmp_path / "wallets.sqlite3", exact_limit=1000, precision=12, cache_ttl=0)
+    counter.add_many(_wallets(1000))
+    assert counter.mode == MODE_EXACT and counter.count() == 1000
+
+    counter.add_many(_wallets(9000, offset=1000))
+    assert counter.mode == MODE_HLL
+    assert abs(counter.count() - 10000) < 10000 * 0.05  # ~1.6% standard error at precision 12
+    assert counter._connect().execute("SELECT COUNT(*) FROM wallets").fetchone()[0] == 0
+    # Re-adding known wallets does not move the estimate
+    before = counter.count()
+    counter.add_many(_wallets(500))
+    assert counter.count() == before
+
+
+def test_hll_merge_keeps_registers():
+    sketch = HyperLogLog(precision=10)
+    assert sketch.add_hash(int.from_bytes(wallet_digest(ADDR)[:8], "big")) is True
+    other = HyperLogLog(precision=10, registers=sketch.to_bytes())
+    other.merge(HyperLogLog(precision=10).to_bytes())
+    assert other.estimate() == 1
+
+
+def test_seed_runs_only_once(tmp_path):
+    counter = DistinctWalletCounter(tmp_path / "wallets.sqlite3", cache_ttl=0)
+    counter.seed_once(lambda: _wallets(5))
+    counter.seed_once(lambda: _wallets(50))
+    assert counter.count() == 5
+
+
+def test_seed_keeps_the_legacy_total_as_a_base(tmp_path):
+    path = tmp_path / "wallets.sqlite3"
+    counter = DistinctWalletCounter(path, cache_ttl=0)
+    counter.seed_once(lambda: _wallets(2), lambda: 17)
+    assert counter.count() == 17
+    # Another worker starting later does not add the base again
+    DistinctWalletCounter(path, cache_ttl=0).seed_once(lambda: _wallets(2), lambda: 17)
+    assert counter.add(ADDR) is True
+    assert counter.count() == 18
+
+    # Seeded state is remembered in memory: no further store lookups
+    calls = []
+    counter.seed_once(lambda: calls.append(1) or [], lambda: 0)
+    assert calls == [] and counter._seeded
@@ -0,0 +1,41 @@
+import json
+
+from backend.utils import kv_store
+from backend.utils.kv_store import KVStore
+
+ADDR = "0xabc0000000000000000000000000000000000001"
+
+
+def test_batched_writes_are_visible_locally_and_flushed_in_one_transaction(tmp_path):
+    path = tmp_path / "dashboards.sqlite3"
+    store = KVStore(path, table="dashboards", durability="batched", flush_interval=60)
+    other_worker = KVStore(path, table="dashboards", durability="batched", flush_interval=60)
+
+    store.put(ADDR, {"badges": ["a"]})
+    store.put(ADDR, {"badges": ["a", "b"]})
+    store.put("0x2", {"badges": []})
+    assert store.get(ADDR) == {"badges": ["a", "b"]}
+    assert other_worker.get(ADDR) is None
+
+    store.close()
+    assert store.flushes == 1
+    assert other_worker.get(ADDR) == {"badges": ["a", "b"]}
+    assert other_worker.count() == 2
+
+
+def test_sync_durability_commits_before_returning(tmp_path):
+    path = tmp_path / "profiles.sqlite3"
+    KVStore(path, table="profiles", durability="sync").put(ADDR, {"username": "x"})
+    assert KVStore(path, table="profiles", durability="sync").get(ADDR) == {"username": "x"}
+
+
+def test_dashboard_store_imports_legacy_json(tmp_path):
+    legacy = tmp_path / "legacy.json"
+    legacy.write_text(json.dumps({ADDR.upper().replace("0X", "0x"): {"badges": ["x"]}}))
+    store = KVStore(tmp_path / "d.sqlite3", table="dashboards")
+
+    kv_store._import_legacy_json(store, legacy)
+    kv_store._import_legacy_json(store, legacy)  # second worker start is a no-op
+
+    assert store.get(ADDR) == {"badges": ["x"]}
+    assert store.count() == 1
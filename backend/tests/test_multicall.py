@@ -0,0 +1,71 @@
+from eth_abi import decode, encode
+from eth_utils import keccak
+
+from backend.api import routes
+from backend.utils.multicall import MULTICALL3_ADDRESS, Call, aggregate3, encode_call
+
+SCORE_CHECKER = "0x" + "5c" * 20
+USER = "0x" + "ab" * 20
+CARD = list(range(100, 115))
+
+
+class _FakeEth:
+    """eth_call stand-in that answers getScore/getScoreCard and executes aggregate3 itself."""
+
+    def __init__(self, multicall_available=True):
+        self.multicall_available = multicall_available
+        self.calls = 0
+
+    def _view(self, data: bytes):
+        if data[:4] == keccak(text="getScore(address)")[:4]:
+            return True, encode(["uint256", "uint256"], [700, 1_700_000_000])
+        if data[:4] == keccak(text="getScoreCard(address)")[:4]:
+            return True, encode(["uint256"] * 15, CARD)
+        return False, b""
+
+    def call(self, tx):
+        self.calls += 1
+        data = bytes.fromhex(tx["data"][2:])
+        if tx["to"] == MULTICALL3_ADDRESS:
+            if not self.multicall_available:
+                raise ValueError("execution reverted")
+            calls = decode(["(address,bool,bytes)[]"], data[4:])[0]
+            return encode(["(bool,bytes)[]"], [[self._view(call_data) for _, _, call_data in calls]])
+        ok, result = self._view(data)
+        if not ok:
+            raise ValueError("execution reverted")
+        return result
+
+
+class _FakeWeb3:
+    def __init__(self, eth):
+        self.eth = eth
+
+
+def test_aggregate3_returns_results_in_order_and_isolates_failures():
+    eth = _FakeEth()
+    results = aggregate3(_FakeWeb3(eth), [
+        Call(SCORE_CHECKER, encode_call("getScoreCard(address)", ["address"], [USER])),
+        Call(SCORE_CHECKER, encode_call("nonces(address)", ["address"], [USER])),
+        Call(SCORE_CHECKER, encode_call("getScore(address)", ["address"], [USER])),
+    ])
+    assert eth.calls == 1
+    assert [ok for ok, _ in results] == [True, False, True]
+    assert decode(["uint256", "uint256"], results[2][1]) == (700, 1_700_000_000)
+
+
+def test_score_and_card_are_read_in_one_round_trip(monkeypatch):
+    eth = _FakeEth()
+    monkeypatch.setattr(routes, "get_web3", lambda url: _FakeWeb3(eth))
+    monkeypatch.setattr(routes, "_SCORECHECKER_V2_ADDR", SCORE_CHECKER)
+    monkeypatch.setattr(routes.settings, "base_rpc_url", "http://rpc.invalid")
+
+    score, card = routes._read_onchain_score_and_card(USER)
+    assert eth.calls == 1
+    assert score == {"score": 700, "timestamp": 1_700_000_000}
+    assert card["totalScore"] == 100 and card["lastIssuedAt"] == 114
+
+    # Without Multicall3 the same reads are made one by one
+    eth = _FakeEth(multicall_available=False)
+    assert routes._read_onchain_score_and_card(USER) == (score, card)
+    assert eth.calls == 3
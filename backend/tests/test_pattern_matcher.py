@@ -0,0 +1,42 @@
+from backend.utils.pattern_matcher import PatternMatcher
+from backend.utils.wallet import NFT_RISK_PATTERNS, TOKEN_RISK_PATTERNS
+
+
+def _sequential(categories, *texts):
+    """Reference: the first-in-list-order `break` loops the analyzers used before."""
+    found = {}
+    for name, patterns in categories.items():
+        for pattern in patterns:
+            if any(pattern in text for text in texts):
+                found[name] = pattern
+                break
+    return found
+
+
+def test_scan_matches_sequential_loops():
+    samples = [
+        ("", ""),
+        ("usdc", "usdc"),
+        ("baby doge moon rocket", "bdmr"),
+        ("free airdrop claim", "claim"),
+        ("safemoon inu", "smi"),
+        ("bored ape yacht club", "bayc"),
+        ("azuki elementals mintpass", "azuki"),
+        ("fake_scam_drainer", "drain"),
+        ("legendary golden vip", "lgv"),
+        ("ushers", "x"),  # overlapping prefixes/suffixes ("she", "hers") exercise failure links
+    ]
+    token_matcher = PatternMatcher(TOKEN_RISK_PATTERNS)
+    nft_matcher = PatternMatcher(NFT_RISK_PATTERNS)
+    for name, symbol in samples:
+        assert token_matcher.scan(name, symbol) == _sequential(TOKEN_RISK_PATTERNS, name, symbol)
+        assert nft_matcher.scan(name, symbol) == _sequential(NFT_RISK_PATTERNS, name, symbol)
+
+
+def test_overlapping_patterns_and_case():
+    matcher = PatternMatcher({"a": ["hers", "she", "he"], "b": ["his"]})
+    assert matcher.scan("USHERS") == {"a": "hers"}
+    assert matcher.scan("ushe") == {"a": "she"}
+    assert matcher.scan("this") == {"b": "his"}
+    assert matcher.matches_any("xhex")
+    assert not matcher.matches_any("xyz")
@@ -0,0 +1,25 @@
+from backend.utils.profile_store import BLOB_PREFIX, ProfileRepository
+
+ADDR = "0xAbC0000000000000000000000000000000000001"
+OTHER = "0x2222222222222222222222222222222222222222"
+AVATAR = "data:image/png;base64," + "iVBORw0KGgo" * 1000
+
+
+def test_avatars_are_stored_once_and_rehydrated(tmp_path):
+    repo = ProfileRepository(tmp_path / "profiles.sqlite3")
+    repo.upsert(ADDR, {"address": ADDR, "username": "a", "avatar": AVATAR})
+    repo.upsert(OTHER, {"address": OTHER, "username": "b", "avatar": AVATAR})
+
+    assert repo.get(ADDR.lower())["avatar"] == AVATAR
+    record = repo.records.get(ADDR.lower())
+    assert record["avatar"].startswith(BLOB_PREFIX)
+    assert repo.avatars._connect().execute("SELECT COUNT(*) FROM avatars").fetchone()[0] == 1
+
+
+def test_reads_do_not_create_records(tmp_path):
+    repo = ProfileRepository(tmp_path / "profiles.sqlite3")
+    assert repo.get(ADDR) is None
+    assert repo.records.count() == 0
+
+    repo.upsert(ADDR, {"address": ADDR, "avatar": "/default-avatar.svg"})
+    assert ProfileRepository(tmp_path / "profiles.sqlite3").get(ADDR)["avatar"] == "/default-avatar.svg"
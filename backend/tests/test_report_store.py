@@ -0,0 +1,98 @@
+import csv
+import io
+import multiprocessing
+
+from fastapi.testclient import TestClient
+
+from backend.api import routes
+from backend.backend import app
+from backend.utils.report_store import REPORT_COLUMNS, ReportStore
+
+ADDR = "0xAbC0000000000000000000000000000000000001"
+TOKENS = [
+    {"Token Name": "Free Claim", "Token Symbol": "CLAIM", "Contract Address": "0x1", "Risk Level": "MEDIUM",
+     "Risk Score": 35, "Risk Reasons": "Contains suspicious pattern: 'claim'; Zero value transfer"},
+    {"Token Name": 'Quote "x", comma', "Token Symbol": "Q", "Contract Address": "0x2", "Risk Level": "HIGH",
+     "Risk Score": 30, "Risk Reasons": "Contains high-risk pattern: 'fake'"},
+]
+
+
+def _dict_writer_csv(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+    return buffer.getvalue()
+
+
+def test_latest_report_lookup_and_csv_matches_previous_files(tmp_path):
+    store = ReportStore(tmp_path / "reports.sqlite3")
+    store.save_report("risky_tokens", ADDR, TOKENS[:1], created_at=1_700_000_000)
+    latest_id = store.save_report("risky_tokens", ADDR, TOKENS, created_at=1_700_000_060)
+    store.save_report("risky_contracts", "0x" + "2" * 40, [], created_at=1_700_000_100)
+
+    latest = store.find_report("risky_tokens", ADDR.lower())
+    assert latest["id"] == latest_id and latest["row_count"] == 2
+    assert "".join(store.stream_csv(latest)) == _dict_writer_csv(REPORT_COLUMNS["risky_tokens"], TOKENS)
+    assert latest["size"] == len(_dict_writer_csv(REPORT_COLUMNS["risky_tokens"], TOKENS).encode("utf-8"))
+
+    first = store.list_reports(ADDR)[-1]
+    assert store.find_report("risky_tokens", ADDR, first["timestamp"])["row_count"] == 1
+    assert store.count_reports() == 3
+    assert store.count_reports(since=1_700_000_050) == 2
+
+
+def test_legacy_csv_files_are_imported_once(tmp_path):
+    reports_dir = tmp_path / "security_reports"
+    reports_dir.mkdir()
+    (reports_dir / f"risky_tokens_{ADDR}_20250829_013500.csv").write_text(
+        _dict_writer_csv(REPORT_COLUMNS["risky_tokens"], TOKENS), encoding="utf-8"
+    )
+    (reports_dir / "notes.csv").write_text("x\n")
+    store = ReportStore(tmp_path / "reports.sqlite3")
+
+    assert store.import_legacy_csv_dir(reports_dir) == 1
+    assert store.import_legacy_csv_dir(reports_dir) == 0
+    assert store.find_report("risky_tokens", ADDR, "20250829_013500")["row_count"] == 2
+
+
+def _import_in_worker(db_path, reports_dir, barrier):
+    store = ReportStore(db_path)
+    barrier.wait()
+    store.import_legacy_csv_dir(reports_dir)
+
+
+def test_concurrent_workers_import_legacy_reports_once(tmp_path):
+    reports_dir = tmp_path / "security_reports"
+    reports_dir.mkdir()
+    for minute in range(20):
+        (reports_dir / f"risky_tokens_{ADDR}_20250829_01{minute:02d}00.csv").write_text(
+            _dict_writer_csv(REPORT_COLUMNS["risky_tokens"], TOKENS), encoding="utf-8"
+        )
+    db_path = tmp_path / "reports.sqlite3"
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(4)
+    workers = [ctx.Process(target=_import_in_worker, args=(db_path, reports_dir, barrier)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert ReportStore(db_path).count_reports() == 20
+
+
+def test_download_and_list_endpoints_use_the_store(tmp_path, monkeypatch):
+    store = ReportStore(tmp_path / "reports.sqlite3")
+    store.save_report("risky_tokens", ADDR, TOKENS)
+    monkeypatch.setattr(routes, "get_report_store", lambda: store)
+    client = TestClient(app)
+
+    listed = client.get(f"/csv/list/{ADDR}").json()["reports"]
+    assert [r["type"] for r in listed] == ["risky_tokens"]
+
+    resp = client.get(listed[0]["download_url"])
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert resp.text == _dict_writer_csv(REPORT_COLUMNS["risky_tokens"], TOKENS)
+    assert client.get(f"/csv/risky_signs/{ADDR}").status_code == 404
@@ -0,0 +1,113 @@
+import queue
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.api import routes
+from backend.backend import app
+from backend.utils.report_store import ReportStore
+from backend.utils.report_writer import MODE_LAZY, ReportWriter
+
+ADDR = "0x" + "ab" * 20
+ROW = {"contract_address": "0x1", "risk_score": 40, "risk_level": "HIGH"}
+
+
+def test_close_drains_queued_reports(tmp_path):
+    store = ReportStore(tmp_path / "reports.sqlite3")
+    writer = ReportWriter(lambda: store, maxsize=100)
+    for _ in range(20):
+        writer.submit("risky_contracts", ADDR, [ROW])
+    writer.close()
+
+    assert store.count_reports() == 20
+    metrics = writer.metrics()
+    assert metrics["written"] == 20 and metrics["queue_depth"] == 0 and metrics["inline_writes"] == 0
+
+
+def test_report_submitted_while_closing_is_not_left_behind_the_stop(tmp_path):
+    store = ReportStore(tmp_path / "reports.sqlite3")
+    writer = ReportWriter(lambda: store, maxsize=100)
+    closer = threading.Thread(target=writer.close)
+
+    class RacingQueue(queue.Queue):
+        def put_nowait(self, item):
+            # Shutdown begins between the submit's closed check and its enqueue
+            if isinstance(item, tuple) and closer.ident is None:
+                closer.start()
+                time.sleep(0.1)
+            return super().put_nowait(item)
+
+    writer._queue = RacingQueue(maxsize=100)
+    writer.submit("risky_contracts", ADDR, [ROW])
+    closer.join(5)
+
+    assert store.count_reports() == 1
+    assert writer.metrics()["queue_depth"] == 0
+
+
+def test_full_queue_falls_back_to_inline_write(tmp_path):
+    store = ReportStore(tmp_path / "reports.sqlite3")
+    release = threading.Event()
+
+    class SlowStore:
+        def save_report(self, *args, **kwargs):
+            release.wait(5)
+            return store.save_report(*args, **kwargs)
+
+    writer = ReportWriter(lambda: SlowStore(), maxsize=1, put_timeout=0.01)
+    threading.Timer(0.2, release.set).start()
+    # First report occupies the worker, second fills the queue, third has to be written by the caller
+    writer.submit("risky_contracts", ADDR, [ROW])
+    writer.submit("risky_contracts", ADDR, [ROW])
+    writer.submit("risky_contracts", ADDR, [ROW])
+    writer.close()
+
+    assert store.count_reports() == 3
+    metrics = writer.metrics()
+    assert metrics["blocked"] >= 1 and metrics["inline_writes"] >= 1 and metrics["written"] == 3
+
+
+def test_lazy_mode_writes_a_report_on_first_download(tmp_path, monkeypatch):
+    store = ReportStore(tmp_path / "reports.sqlite3")
+    writer = ReportWriter(lambda: store, mode=MODE_LAZY)
+    writer.submit("risky_contracts", ADDR, [ROW, ROW])
+    writer.submit("risky_signs", ADDR, [])
+    assert store.count_reports() == 0
+    monkeypatch.setattr(routes, "get_report_store", lambda: store)
+    monkeypatch.setattr(routes, "report_writer", writer)
+    client = TestClient(app)
+
+    listed = client.get(f"/csv/list/{ADDR}").json()["reports"]
+    assert sorted(r["type"] for r in listed) == ["risky_contracts", "risky_signs"]
+
+    resp = client.get(f"/csv/risky_contracts/{ADDR}")
+    assert resp.status_code == 200 and resp.text.count("\n") == 3
+    assert len(resp.content) == next(r["size"] for r in listed if r["type"] == "risky_contracts")
+    # Written once, served from the store afterwards; the unread report is never written
+    assert client.get(f"/csv/risky_contracts/{ADDR}").text == resp.text
+    assert [r["report_type"] for r in store.list_reports(ADDR)] == ["risky_contracts"]
+
+
+def test_concurrent_first_downloads_wait_for_the_one_write(tmp_path):
+    store = ReportStore(tmp_path / "reports.sqlite3")
+    saving = threading.Event()
+
+    class SlowStore:
+        def save_report(self, *args, **kwargs):
+            saving.set()
+            time.sleep(0.2)
+            return store.save_report(*args, **kwargs)
+
+    writer = ReportWriter(lambda: SlowStore(), mode=MODE_LAZY)
+    writer.submit("risky_contracts", ADDR, [ROW])
+    first = threading.Thread(target=writer.materialize, args=("risky_contracts", ADDR))
+    first.start()
+    saving.wait(5)
+
+    # Still listed while the first download writes it, and found once the second one returns
+    assert [r["report_type"] for r in writer.pending(ADDR)] == ["risky_contracts"]
+    writer.materialize("risky_contracts", ADDR)
+    assert store.find_report("risky_contracts", ADDR) is not None
+    first.join(5)
+    assert store.count_reports() == 1 and writer.pending(ADDR) == []
@@ -0,0 +1,52 @@
+from backend.utils import reputation_db
+from backend.utils.reputation_db import ReputationDB, build_reputation_db
+
+SCAM = "0x1234567890123456789012345678901234567890"
+WETH = "0x4200000000000000000000000000000000000006"
+
+
+def _write_csv(path, rows):
+    path.write_text("address,category,label\n" + "".join(f"{a},{c},x\n" for a, c in rows))
+    return path
+
+
+def test_build_merges_sources_and_binary_search_finds_every_address(tmp_path):
+    many = [(f"0x{i:040x}", "scam_token") for i in range(1, 2000, 7)]
+    first = _write_csv(tmp_path / "a.csv", many + [(SCAM, "scam_token"), ("not-an-address", "scam_token")])
+    second = _write_csv(tmp_path / "b.csv", [(SCAM, "scam_nft"), (WETH.upper().replace("0X", "0x"), "safe_protocol")])
+    out = tmp_path / "reputation.bin"
+
+    assert build_reputation_db([first, second], out) == len(many) + 2
+    db = ReputationDB.open(out)
+
+    assert db.is_scam_token(SCAM) and db.is_scam_nft(SCAM) and not db.is_legit_nft(SCAM)
+    assert db.is_safe_protocol(WETH)
+    assert all(db.is_scam_token(address) for address, _ in many)
+    assert db.flags(f"0x{2:040x}") == 0
+    assert db.flags("0x1234") == 0
+
+
+def test_seed_list_matches_previous_literals_and_cli(tmp_path, capsys):
+    out = tmp_path / "seed.bin"
+    reputation_db.main(["build", "-o", str(out)])
+    reputation_db.main(["lookup", "--db", str(out), WETH, "0x4ed4e862860bed51a9570b96d89af5e1b0efefed"])
+
+    printed = capsys.readouterr().out
+    assert f"{WETH}: safe_protocol" in printed
+    assert "0x4ed4e862860bed51a9570b96d89af5e1b0efefed: legit_nft" in printed
+    assert ReputationDB.open(out).is_scam_token(SCAM)
+
+
+def test_singleton_remaps_a_rebuilt_file(tmp_path, monkeypatch):
+    out = tmp_path / "reputation.bin"
+    build_reputation_db([_write_csv(tmp_path / "a.csv", [(SCAM, "scam_token")])], out)
+    monkeypatch.setenv("REPUTATION_DB_PATH", str(out))
+    monkeypatch.setattr(reputation_db, "_DB", None)
+    monkeypatch.setattr(reputation_db, "_DB_IDENTITY", None)
+    monkeypatch.setattr(reputation_db, "_DB_CHECKED_AT", 0.0)
+    monkeypatch.setattr(reputation_db, "RELOAD_CHECK_INTERVAL", 0)
+    assert reputation_db.get_reputation_db().is_scam_token(SCAM)
+    assert not reputation_db.get_reputation_db().is_scam_token(WETH)
+
+    build_reputation_db([_write_csv(tmp_path / "b.csv", [(SCAM, "scam_token"), (WETH, "scam_token")])], out)
+    assert reputation_db.get_reputation_db().is_scam_token(WETH)
@@ -0,0 +1,108 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from web3 import Web3
+
+from backend.utils.rpc_batch import BatchingHTTPProvider, RpcBatcher, RpcError, result_or_raise
+
+TARGET = Web3.to_checksum_address("0x" + "5c" * 20)
+
+
+class _EchoRpc(BaseHTTPRequestHandler):
+    """JSON-RPC stand-in: eth_call echoes its calldata, eth_chainId is Base, anything else errors.
+
+    Records the number of eth_call requests in each POST.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    posts: list = []
+    delay = 0.0
+    reject_arrays = False
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if isinstance(payload, list) and self.reject_arrays:
+            self.send_response(400)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        batch = payload if isinstance(payload, list) else [payload]
+        self.posts.append(sum(1 for r in batch if r["method"] != "eth_chainId"))
+        time.sleep(self.delay)
+        out = [
+            {"jsonrpc": "2.0", "id": r["id"], "result": r["params"][0]["data"]} if r["method"] == "eth_call"
+            else {"jsonrpc": "2.0", "id": r["id"], "result": "0x2105"} if r["method"] == "eth_chainId"
+            else {"jsonrpc": "2.0", "id": r["id"], "error": {"code": -32601, "message": "method not found"}}
+            for r in batch
+        ]
+        body = json.dumps(out if isinstance(payload, list) else out[0]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def rpc_url():
+    _EchoRpc.posts = []
+    _EchoRpc.delay = 0.0
+    _EchoRpc.reject_arrays = False
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoRpc)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_explicit_batches_respect_max_size_and_keep_order(rpc_url):
+    batcher = RpcBatcher(requests.Session(), rpc_url, max_batch_size=3)
+    calls = [("eth_call", [{"to": TARGET, "data": f"0x{i:02x}"}, "latest"]) for i in range(7)]
+    calls.insert(2, ("eth_unknown", []))
+
+    responses = batcher.request_many(calls)
+    assert _EchoRpc.posts == [3, 3, 2]
+    assert [result_or_raise(r) for i, r in enumerate(responses) if i != 2] == [f"0x{i:02x}" for i in range(7)]
+    with pytest.raises(RpcError):
+        result_or_raise(responses[2])
+
+
+def test_concurrent_eth_calls_are_coalesced(rpc_url):
+    _EchoRpc.delay = 0.05
+    batcher = RpcBatcher(requests.Session(), rpc_url, max_batch_size=50, max_in_flight=1)
+    w3 = Web3(BatchingHTTPProvider(rpc_url, batcher, exception_retry_configuration=None))
+    results = {}
+
+    def read(i):
+        results[i] = w3.eth.call({"to": TARGET, "data": "0x" + bytes([i]).hex()})
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.close()
+
+    assert results == {i: bytes([i]) for i in range(20)}
+    eth_call_posts = [n for n in _EchoRpc.posts if n]  # web3 also sends eth_chainId on its own
+    assert sum(eth_call_posts) == 20 and len(eth_call_posts) < 20
+
+
+def test_endpoint_rejecting_arrays_gets_single_requests(rpc_url):
+    _EchoRpc.reject_arrays = True
+    batcher = RpcBatcher(requests.Session(), rpc_url, max_batch_size=50)
+    calls = [("eth_call", [{"to": TARGET, "data": f"0x{i:02x}"}, "latest"]) for i in range(4)]
+
+    assert [result_or_raise(r) for r in batcher.request_many(calls)] == [f"0x{i:02x}" for i in range(4)]
+    assert _EchoRpc.posts == [1, 1, 1, 1]
+
+    w3 = Web3(BatchingHTTPProvider(rpc_url, batcher, exception_retry_configuration=None))
+    assert w3.eth.call({"to": TARGET, "data": "0x2a"}) == b"\x2a"
+    batcher.close()
@@ -0,0 +1,39 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.utils.rpc_client import RpcClient
+
+
+class _RpcHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    peers = set()
+
+    def do_POST(self):
+        self.peers.add(self.client_address)
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": "0x2105"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_web3_instances_share_one_keep_alive_connection():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RpcHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    client = RpcClient(pool_size=4, timeout=5)
+    try:
+        assert client.web3(url) is client.web3(url)
+        for _ in range(5):
+            assert client.web3(url).eth.chain_id == 8453
+        assert len(_RpcHandler.peers) == 1
+    finally:
+        client.close()
+        server.shutdown()
@@ -0,0 +1,192 @@
+from eth_abi import encode
+
+from backend.utils.score_card_cache import ScoreCardCache
+from backend.utils.score_events import (
+    SCORE_CARD_UPDATED_TOPIC,
+    SCORE_CHECKED_TOPIC,
+    ScoreEventFollower,
+    decode_score_event,
+    iter_log_ranges,
+)
+
+SCORE_CHECKER = "0x" + "5c" * 20
+ALICE = "0x" + "ab" * 20
+BOB = "0x" + "cd" * 20
+
+
+def _log(topic, user, score, block, index=0):
+    return {
+        "topics": [bytes.fromhex(topic[2:]), bytes(12) + bytes.fromhex(user[2:])],
+        "data": encode(["uint256", "uint256", "uint256"], [score, 10, 1_700_000_000]),
+        "blockNumber": block,
+        "logIndex": index,
+    }
+
+
+class _FakeEth:
+    def __init__(self, logs, block_number, max_span=None):
+        self.logs = logs
+        self.block_number = block_number
+        self.max_span = max_span
+        self.queries = []
+
+    def get_logs(self, params):
+        start, end = params["fromBlock"], params["toBlock"]
+        self.queries.append((start, end))
+        if self.max_span is not None and end - start + 1 > self.max_span:
+            raise ValueError("query returned more than 10000 results")
+        return [log for log in self.logs if start <= log["blockNumber"] <= end]
+
+
+class _FakeWeb3:
+    def __init__(self, eth):
+        self.eth = eth
+
+
+def test_decode_score_event():
+    event = decode_score_event(_log(SCORE_CARD_UPDATED_TOPIC, ALICE, 640, 12, 3))
+    assert (event.name, event.user, event.score, event.block_number, event.log_index) == (
+        "ScoreCardUpdated", ALICE, 640, 12, 3
+    )
+    assert decode_score_event({"topics": [b"\x00" * 32], "data": b"", "blockNumber": 1, "logIndex": 0}) is None
+
+
+def test_rejected_ranges_are_split_and_grow_back():
+    eth = _FakeEth([], 0, max_span=250)
+    ends = [end for end, _ in iter_log_ranges(lambda a, b: eth.get_logs({"fromBlock": a, "toBlock": b}), 0, 999, 1000)]
+    assert ends[-1] == 999
+    spans = [b - a + 1 for a, b in eth.queries]
+    assert spans[:3] == [1000, 500, 250]
+    # Every block is covered exactly once by the successful queries
+    ok = [(a, b) for a, b in eth.queries if b - a + 1 <= 250]
+    assert sum(b - a + 1 for a, b in ok) == 1000
+
+
+def test_events_invalidate_cached_cards(tmp_path):
+    cache = ScoreCardCache(tmp_path / "cards.sqlite3")
+    eth = _FakeEth([], 100)
+    follower = ScoreEventFollower(lambda: _FakeWeb3(eth), SCORE_CHECKER, cache, max_range=50)
+
+    loads = []
+
+    def load(value):
+        def _load():
+            loads.append(value)
+            return {"score": value, "timestamp": 1}, {"totalScore": value}
+        return _load
+
+    # Not in sync yet: straight to the chain, nothing cached
+    cache.get_or_load(ALICE, load(1))
+    cache.get_or_load(ALICE, load(1))
+    assert len(loads) == 2
+
+    # A fresh cache starts following at the head
+    follower.poll_once()
+    assert cache.last_block() == 100 and cache.in_sync
+    cache.get_or_load(ALICE, load(1))
+    cache.get_or_load(BOB, load(2))
+    assert cache.get_or_load(ALICE, load(99))[0]["score"] == 1
+    assert len(loads) == 4
+
+    # Alice submits: her entry is dropped, Bob's survives (also across a restart)
+    eth.logs.append(_log(SCORE_CHECKED_TOPIC, ALICE, 3, 130))
+    eth.block_number = 180
+    assert follower.poll_once() == 1
+    assert cache.last_block() == 180
+    reopened = ScoreCardCache(tmp_path / "cards.sqlite3")
+    assert reopened.get(ALICE) is None
+    assert reopened.get(BOB)[0]["score"] == 2
+    assert cache.get_or_load(ALICE, load(3))[0]["score"] == 3
+
+    # Failed reads are not cached
+    cache.invalidate({ALICE: 181})
+    cache.get_or_load(ALICE, lambda: (None, None))
+    assert cache.get(ALICE) is None
+
+
+def test_each_worker_follows_events_for_its_own_memory(tmp_path):
+    path = tmp_path / "cards.sqlite3"
+    eth = _FakeEth([], 100)
+    worker_a, worker_b = ScoreCardCache(path), ScoreCardCache(path)
+    followers = [ScoreEventFollower(lambda: _FakeWeb3(eth), SCORE_CHECKER, c) for c in (worker_a, worker_b)]
+    for follower in followers:
+        follower.poll_once()
+
+    old = ({"score": 1, "timestamp": 1}, {"totalScore": 1})
+    new = ({"score": 2, "timestamp": 2}, {"totalScore": 2})
+    worker_b.get_or_load(ALICE, lambda: old)
+
+    # Alice submits; worker A polls first and advances the shared cursor
+    eth.logs.append(_log(SCORE_CARD_UPDATED_TOPIC, ALICE, 2, 110))
+    eth.block_number = 120
+    followers[0].poll_once()
+    followers[1].poll_once()
+    assert worker_b.get_or_load(ALICE, lambda: new) == new
+
+    # A new worker resumes from the furthest shared cursor
+    assert ScoreCardCache(path).last_block() == 120
+
+
+def test_read_racing_an_event_in_another_worker_is_not_stored(tmp_path):
+    path = tmp_path / "cards.sqlite3"
+    eth = _FakeEth([], 100)
+    worker_a, worker_b = ScoreCardCache(path), ScoreCardCache(path)
+    follower_a = ScoreEventFollower(lambda: _FakeWeb3(eth), SCORE_CHECKER, worker_a)
+    follower_b = ScoreEventFollower(lambda: _FakeWeb3(eth), SCORE_CHECKER, worker_b)
+    follower_a.poll_once()
+    follower_b.poll_once()
+
+    def slow_stale_read():
+        # Worker A applies Alice's submit while B's RPC read (pre-submit state) is in flight
+        eth.logs.append(_log(SCORE_CHECKED_TOPIC, ALICE, 9, 105))
+        eth.block_number = 106
+        follower_a.poll_once()
+        return {"score": 1, "timestamp": 1}, {"totalScore": 1}
+
+    worker_b.get_or_load(ALICE, slow_stale_read)
+    assert worker_b.get(ALICE) is None and worker_a.get(ALICE) is None
+
+
+def test_row_read_racing_an_invalidation_is_not_kept_in_memory(tmp_path):
+    cache = ScoreCardCache(tmp_path / "cards.sqlite3")
+    eth = _FakeEth([], 100)
+    ScoreEventFollower(lambda: _FakeWeb3(eth), SCORE_CHECKER, cache).poll_once()
+    old = ({"score": 1, "timestamp": 1}, {"totalScore": 1})
+    cache.get_or_load(ALICE, lambda: old)
+    cache._memory.clear()  # as in a worker that only has the shared row
+
+    connect = cache._connect
+
+    class _Result:
+        def __init__(self, row):
+            self.row = row
+
+        def fetchone(self):
+            return self.row
+
+    class _Conn:
+        def __init__(self, conn):
+            self.conn = conn
+
+        def __getattr__(self, name):
+            return getattr(self.conn, name)
+
+        def __enter__(self):
+            return self.conn.__enter__()
+
+        def __exit__(self, *exc):
+            return self.conn.__exit__(*exc)
+
+        def execute(self, sql, params=()):
+            result = self.conn.execute(sql, params)
+            if sql.startswith("SELECT data FROM cards"):
+                # Alice's submit is applied between the SELECT and storing the row in memory
+                row = result.fetchone()
+                cache.invalidate({ALICE: 101})
+                return _Result(row)
+            return result
+
+    cache._connect = lambda: _Conn(connect())
+    assert cache.get(ALICE) == old
+    cache._connect = connect
+    assert cache.get(ALICE) is None
@@ -0,0 +1,46 @@
+import json
+
+from backend.utils.score_history import ScoreHistoryLog
+
+A = "0xAAaa000000000000000000000000000000000001"
+B = "0xbbbb000000000000000000000000000000000002"
+
+
+def _entry(address, score):
+    return {"address": address, "total_score": score, "date": "2025-08-29T01:35:00"}
+
+
+def test_recent_returns_last_entries_per_address_oldest_first(tmp_path):
+    log = ScoreHistoryLog(tmp_path / "history.jsonl")
+    for i in range(1500):
+        log.append(_entry(A if i % 3 else B, float(i)))
+
+    recent = log.recent(A.lower(), limit=3)
+    assert [e["total_score"] for e in recent] == [1496.0, 1498.0, 1499.0]
+    # Full history is kept (no global 1000-entry cap)
+    assert log.count(A) == 1000 and log.count(B) == 500
+    assert log.recent("0x" + "0" * 40) == []
+
+
+def test_appends_from_another_process_and_partial_lines(tmp_path):
+    path = tmp_path / "history.jsonl"
+    reader = ScoreHistoryLog(path)
+    writer = ScoreHistoryLog(path)  # stands in for another uvicorn worker
+    writer.append(_entry(A, 1.0))
+    assert reader.recent(A) == [_entry(A, 1.0)]
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"address": "' + A)  # write still in progress
+    assert reader.count(A) == 1
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('", "total_score": 2.0}\n')
+    assert [e["total_score"] for e in reader.recent(A)] == [1.0, 2.0]
+
+
+def test_imports_legacy_json_array(tmp_path):
+    legacy = tmp_path / "history.json"
+    legacy.write_text(json.dumps([_entry(A, 1.0), _entry(B, 2.0)]))
+
+    log = ScoreHistoryLog(tmp_path / "history.jsonl", legacy_path=legacy)
+    assert log.recent(B) == [_entry(B, 2.0)]
+    assert sorted(log.addresses()) == sorted([A.lower(), B.lower()])
@@ -0,0 +1,95 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from backend.api import routes
+from backend.backend import app
+from backend.utils.score_events import SCORE_CARD_UPDATED_TOPIC, SCORE_CHECKED_TOPIC, ScoreEventFollower
+from backend.utils.score_index import FenwickTree, ScoreIndex
+from backend.tests.test_score_events import _FakeEth, _FakeWeb3, _log
+
+SCORE_CHECKER = "0x" + "5c" * 20
+
+
+def _wallet(i: int) -> str:
+    return "0x" + i.to_bytes(20, "big").hex()
+
+
+def test_fenwick_prefix_sums_match_counts():
+    counts = [random.randint(0, 5) for _ in range(101)]
+    tree = FenwickTree(101)
+    for bucket, count in enumerate(counts):
+        tree.add(bucket, count)
+    for bucket in (-1, 0, 37, 100, 250):
+        assert tree.prefix(bucket) == sum(counts[:max(0, bucket + 1)])
+
+
+def test_backfill_from_block_zero_ranks_latest_scores(tmp_path):
+    logs = [
+        _log(SCORE_CHECKED_TOPIC, _wallet(1), 50, 10),
+        _log(SCORE_CHECKED_TOPIC, _wallet(2), 80, 2_500),
+        _log(SCORE_CARD_UPDATED_TOPIC, _wallet(3), 80, 4_000, 1),
+        _log(SCORE_CHECKED_TOPIC, _wallet(4), 20, 7_000),
+        # Wallet 1 submits again; only the latest score counts
+        _log(SCORE_CHECKED_TOPIC, _wallet(1), 90, 9_000),
+    ]
+    eth = _FakeEth(logs, 10_000, max_span=1_500)
+    index = ScoreIndex(tmp_path / "index.sqlite3")
+    follower = ScoreEventFollower(lambda: _FakeWeb3(eth), SCORE_CHECKER, index, max_range=4_000, start_block=0)
+
+    assert follower.poll_once() == 5
+    assert index.last_block() == 10_000 and index.stats()["caught_up"]
+    assert max(b - a + 1 for a, b in eth.queries) == 4_000
+
+    assert index.rank(_wallet(1)) == {"address": _wallet(1), "score": 90, "rank": 1, "total": 4, "percentile": 75.0}
+    assert index.rank(_wallet(2))["rank"] == index.rank(_wallet(3))["rank"] == 2
+    assert index.rank(_wallet(4))["percentile"] == 0.0
+    assert index.rank(_wallet(9)) is None
+    assert [(e["rank"], e["score"]) for e in index.leaderboard(limit=3)] == [(1, 90), (2, 80), (2, 80)]
+
+    # Restart: the index is rebuilt from SQLite and resumes after the last block
+    reopened = ScoreIndex(tmp_path / "index.sqlite3")
+    assert reopened.rank(_wallet(3))["rank"] == 2
+    eth.queries.clear()
+    ScoreEventFollower(lambda: _FakeWeb3(eth), SCORE_CHECKER, reopened, start_block=0).poll_once()
+    assert eth.queries == []
+
+
+def test_leaderboard_and_rank_routes(tmp_path, monkeypatch):
+    index = ScoreIndex(tmp_path / "index.sqlite3")
+    eth = _FakeEth([_log(SCORE_CHECKED_TOPIC, _wallet(i), i * 10, i) for i in range(1, 6)], 10)
+    ScoreEventFollower(lambda: _FakeWeb3(eth), SCORE_CHECKER, index, start_block=0).poll_once()
+    monkeypatch.setattr(routes, "get_score_index", lambda: index)
+    client = TestClient(app)
+
+    body = client.get("/leaderboard", params={"limit": 2}).json()
+    assert [e["address"] for e in body["entries"]] == [_wallet(5), _wallet(4)]
+    assert body["total"] == 5
+
+    rank = client.get("/rank", params={"address": _wallet(2)}).json()
+    assert (rank["rank"], rank["percentile"]) == (4, 20.0)
+    assert client.get("/rank", params={"address": _wallet(42)}).status_code == 404
+    assert client.get("/rank", params={"address": "0x12"}).status_code == 400
+
+
+def test_workers_sharing_one_file_each_see_every_event(tmp_path):
+    path = tmp_path / "index.sqlite3"
+    eth = _FakeEth([_log(SCORE_CHECKED_TOPIC, _wallet(1), 40, 5)], 10)
+    worker_a, worker_b = ScoreIndex(path), ScoreIndex(path)
+    follower_a = ScoreEventFollower(lambda: _FakeWeb3(eth), SCORE_CHECKER, worker_a, start_block=0)
+    follower_b = ScoreEventFollower(lambda: _FakeWeb3(eth), SCORE_CHECKER, worker_b, start_block=0)
+    follower_a.poll_once()
+
+    # Worker A has advanced the shared cursor; B still replays from its own
+    eth.logs.append(_log(SCORE_CHECKED_TOPIC, _wallet(2), 70, 15))
+    eth.block_number = 20
+    follower_a.poll_once()
+    follower_b.poll_once()
+    for worker in (worker_a, worker_b):
+        assert worker.rank(_wallet(2))["rank"] == 1 and worker.stats()["total"] == 2
+        assert [e["address"] for e in worker.leaderboard()] == [_wallet(2), _wallet(1)]
+
+    # A worker started later loads the rows with the cursor that covers them
+    worker_c = ScoreIndex(path)
+    assert worker_c.last_block() == 20 and worker_c.rank(_wallet(1))["rank"] == 2
+    assert [e["address"] for e in worker_c.leaderboard(limit=1, offset=1)] == [_wallet(1)]
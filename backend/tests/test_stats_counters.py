@@ -0,0 +1,55 @@
+import time
+
+from backend.utils.stats_counters import (
+    BUCKET_SECONDS, WINDOW_BUCKETS, StatsCounters, TOTAL_BADGES_EARNED, TOTAL_REPORTS, TRUST_SCORE_COUNT,
+)
+
+
+def test_counters_are_read_from_memory_and_shared_on_flush(tmp_path):
+    path = tmp_path / "stats.sqlite3"
+    worker_a = StatsCounters(path, flush_interval=60)
+    worker_b = StatsCounters(path, flush_interval=60)
+    worker_a.seed({TRUST_SCORE_COUNT: 17})
+    worker_b.seed({TRUST_SCORE_COUNT: 99})  # only the first seed applies
+
+    worker_a.add(TRUST_SCORE_COUNT)
+    worker_b.add(TRUST_SCORE_COUNT, 2)
+    assert worker_a.get(TRUST_SCORE_COUNT) == 18
+    assert worker_b.get(TRUST_SCORE_COUNT) == 19
+
+    worker_a.close()
+    worker_b.close()
+    assert worker_b.get(TRUST_SCORE_COUNT) == 20
+    worker_a.flush()  # picks up worker_b's deltas
+    assert worker_a.snapshot() == {TRUST_SCORE_COUNT: 20}
+
+
+def test_missing_counter_returns_default(tmp_path):
+    counters = StatsCounters(tmp_path / "stats.sqlite3", flush_interval=60)
+    assert counters.get(TOTAL_BADGES_EARNED, 34) == 34
+    counters.add(TOTAL_BADGES_EARNED, 3)
+    assert counters.get(TOTAL_BADGES_EARNED, 34) == 3
+    counters.close()
+
+
+def test_windowed_counter_keeps_the_last_24_hours(tmp_path):
+    now = time.time()
+    day = WINDOW_BUCKETS * BUCKET_SECONDS
+    path = tmp_path / "stats.sqlite3"
+    worker_a = StatsCounters(path, flush_interval=60)
+    worker_a.seed_windowed(TOTAL_REPORTS, lambda: (10, [now - 3600, now - 7200]))
+    worker_a.seed_windowed(TOTAL_REPORTS, lambda: (99, [now]))  # already seeded
+    assert (worker_a.get(TOTAL_REPORTS), worker_a.window(TOTAL_REPORTS)) == (10, 2)
+
+    worker_a.add_windowed(TOTAL_REPORTS)
+    worker_a.add_windowed(TOTAL_REPORTS, at=now - day - 3600)  # counts in the total only
+    assert (worker_a.get(TOTAL_REPORTS), worker_a.window(TOTAL_REPORTS)) == (12, 3)
+
+    worker_a.close()
+    worker_b = StatsCounters(path, flush_interval=60)
+    assert (worker_b.get(TOTAL_REPORTS), worker_b.window(TOTAL_REPORTS)) == (12, 3)
+
+    # The slot of the expired minute is reused when the ring wraps onto it
+    worker_b.add_windowed(TOTAL_REPORTS, at=now - 3600 + day)
+    worker_b.close()
+    assert worker_b._connect().execute("SELECT COUNT(*) FROM buckets").fetchone()[0] == 3
@@ -0,0 +1,101 @@
+import re
+import time
+from datetime import timedelta, timezone
+
+from backend.utils.tx_frame import TxFrame
+
+ME = "0xAbC0000000000000000000000000000000000001"
+OTHER = "0x00000000000000000000000000000000000000ff"
+DAY = 86400
+
+
+def _tx(ts, sender=ME, gas="21000", value="0", input_data="0x"):
+    return {"timeStamp": str(ts), "from": sender, "to": OTHER, "gasUsed": gas, "value": value, "input": input_data}
+
+
+def _today_start():
+    now = int(time.time())
+    return now - now % DAY
+
+
+def test_metrics_match_row_semantics():
+    today = _today_start()
+    rows = [
+        _tx(today - 10 * DAY),
+        _tx(today - 9 * DAY, gas="100"),
+        _tx(today - 8 * DAY, sender=OTHER, gas="5"),
+        _tx(today - 1 * DAY, gas="bad"),
+        _tx(today),
+        {"timeStamp": None, "from": ME},
+    ]
+    frame = TxFrame(rows)
+
+    # Only rows sent by ME count; unparsable gasUsed counts as 0
+    assert frame.total_gas_used(ME.lower()) == 21000 * 2 + 100
+    assert frame.first_timestamp() == today - 10 * DAY
+    assert frame.streaks() == {"current_streak": 2, "max_streak": 3}
+    assert frame.id_of("0xnot-present") == -1
+
+
+def test_streaks_use_timezone_day_boundaries():
+    today = _today_start()
+    # 23:30 and 00:30 UTC are the same day in UTC-2 but different days in UTC
+    rows = [_tx(today - DAY + 23 * 3600 + 1800), _tx(today + 1800)]
+    assert TxFrame(rows).streaks()["max_streak"] == 2
+    assert TxFrame(rows).streaks(timezone(timedelta(hours=-2)))["max_streak"] == 1
+
+
+def test_empty_frame():
+    frame = TxFrame([])
+    assert frame.first_timestamp() is None
+    assert frame.streaks() == {"current_streak": 0, "max_streak": 0}
+    assert frame.total_gas_used(ME) == 0
+
+
+def test_selector_column():
+    frame = TxFrame([_tx(1, input_data="0x095ea7b3" + "0" * 128), _tx(2, input_data="0x12"), _tx(3, input_data="0xzzzzzzzz")])
+    assert frame.selector.tolist() == [0x095EA7B3, 0, 0]
+
+
+def _legacy_contract_risk(contract_addr, txs, user):
+    """Row-by-row reference for the pre-index analyze_contract_risk_fast + extraction."""
+    contract_txs = [tx for tx in txs if tx.get('to', '').lower() == contract_addr]
+    gas = [int(tx['gasUsed']) for tx in contract_txs]
+    values = [int(tx['value']) for tx in contract_txs]
+    inputs = [len(tx['input']) for tx in contract_txs]
+    score = 15 if len(contract_txs) == 1 else 0
+    score += 10 if sum(gas) / len(gas) > 500000 else 0
+    score += 5 if max(values) / 1e18 > 1 else 0
+    score += 8 if (time.time() - max(int(tx['timeStamp']) for tx in contract_txs)) / 86400 < 1 else 0
+    score += 12 if sum(inputs) / len(inputs) < 10 else 0
+    score += 15 if re.search(r'dead|0000|1111|2222|3333|4444|5555|6666|7777|8888|9999|aaaa|bbbb|cccc|dddd|eeee|ffff', contract_addr) else 0
+    return min(score, 100), len(contract_txs)
+
+
+def test_contract_index_matches_per_contract_scan():
+    import random
+    from backend.utils import wallet
+
+    rng = random.Random(7)
+    now = int(time.time())
+    contracts = ["0x%040x" % rng.randrange(1, 10**12) for _ in range(30)]
+    txs = [
+        {
+            "timeStamp": str(now - rng.randrange(0, 5 * DAY)),
+            "from": ME,
+            "to": rng.choice(contracts + [ME]),
+            "gasUsed": str(rng.choice([21000, 600000, 900000])),
+            "value": str(rng.choice([0, 10**17, 3 * 10**18])),
+            "input": rng.choice(["0x", "0x12", "0x095ea7b3" + "0" * 64]),
+        }
+        for _ in range(400)
+    ]
+
+    frame = TxFrame(txs)
+    index = frame.contract_aggregates(ME)
+    expected = {tx["to"] for tx in txs if tx["to"] != ME and tx["input"] != "0x"}
+    assert set(index) == expected
+    for addr, agg in index.items():
+        result = wallet.score_contract_risk(addr, agg)
+        assert (result["risk_score"], result["interaction_count"]) == _legacy_contract_risk(addr, txs, ME)
+        assert wallet.analyze_contract_risk_fast(addr, txs)["risk_score"] == result["risk_score"]
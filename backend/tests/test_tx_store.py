@@ -0,0 +1,51 @@
+from backend.utils.tx_store import TransactionStore
+
+
+ADDR = "0x4444444444444444444444444444444444444444"
+
+
+def _tx(block: int, idx: int = 0) -> dict:
+    return {"blockNumber": str(block), "transactionIndex": str(idx), "hash": f"0x{block:04x}{idx:02x}", "confirmations": "1"}
+
+
+def test_sync_only_requests_delta_after_first_fetch(tmp_path):
+    store = TransactionStore(tmp_path / "tx.sqlite3")
+    starts = []
+    upstream = [_tx(10), _tx(12), _tx(12, 1)]
+
+    def fetch_since(start):
+        starts.append(start)
+        return [t for t in upstream if int(t["blockNumber"]) >= start]
+
+    assert store.sync(ADDR, "txlist", fetch_since) == upstream
+    upstream.append(_tx(20))
+    history = store.sync(ADDR, "txlist", fetch_since)
+
+    assert starts == [0, 12]
+    assert [t["blockNumber"] for t in history] == ["10", "12", "12", "20"]
+
+
+def test_sync_completes_a_block_cut_short_by_the_upstream_cap(tmp_path):
+    store = TransactionStore(tmp_path / "tx.sqlite3")
+    upstream = [_tx(10), _tx(12), _tx(12, 1), _tx(12, 2)]
+    cap = 2
+
+    def fetch_since(start):
+        return [t for t in upstream if int(t["blockNumber"]) >= start][:cap]
+
+    store.sync(ADDR, "txlist", fetch_since)
+    cap = 10
+    history = store.sync(ADDR, "txlist", fetch_since)
+    assert [(t["blockNumber"], t["transactionIndex"]) for t in history] == [("10", "0"), ("12", "0"), ("12", "1"), ("12", "2")]
+
+
+def test_sync_ignores_duplicate_rows_and_survives_reopen(tmp_path):
+    path = tmp_path / "tx.sqlite3"
+    store = TransactionStore(path)
+    store.sync(ADDR, "tokentx", lambda start: [_tx(5), _tx(6)])
+    # Same rows again with a changed volatile field must not duplicate
+    store.sync(ADDR.upper().replace("0X", "0x"), "tokentx", lambda start: [dict(_tx(6), confirmations="99"), _tx(7)])
+
+    rows, last_block = TransactionStore(path).load(ADDR, "tokentx")
+    assert [r["blockNumber"] for r in rows] == ["5", "6", "7"]
+    assert last_block == 7
@@ -0,0 +1,61 @@
+from backend.utils import wallet
+from backend.utils.verdict_cache import VerdictCache
+
+TOKEN = "0x4444444444444444444444444444444444444444"
+
+
+def test_lru_eviction_and_hit_rate():
+    cache = VerdictCache(max_entries=2)
+    cache.put("token:a", {"risk_score": 1})
+    cache.put("token:b", {"risk_score": 2})
+    assert cache.get("token:a") == {"risk_score": 1}  # a becomes most recently used
+    cache.put("token:c", {"risk_score": 3})  # evicts b
+
+    assert cache.get("token:b") is None
+    assert cache.get("token:c") == {"risk_score": 3}
+    assert cache.stats()["evictions"] == 1
+    assert cache.hit_rate == 2 / 3
+
+
+def test_persistence_keeps_warm_set_for_same_rules(tmp_path):
+    path = tmp_path / "verdicts.json"
+    cache = VerdictCache(max_entries=10, path=path, version="v1")
+    cache.get_or_compute("nft", "0xABC", lambda: {"risk_score": 40})
+    cache.save()
+
+    assert VerdictCache(max_entries=10, path=path, version="v1").get("nft:0xabc") == {"risk_score": 40}
+    assert VerdictCache(max_entries=10, path=path, version="v2").get("nft:0xabc") is None
+
+
+def test_token_verdicts_are_shared_across_wallets(monkeypatch):
+    cache = VerdictCache(max_entries=100)
+    monkeypatch.setattr(wallet, "VERDICT_CACHE", cache)
+    transfers = [{"contractAddress": TOKEN, "tokenName": "USD Coin", "tokenSymbol": "USDC", "value": "5000000"}]
+    monkeypatch.setitem(wallet.WalletContext._FETCHERS, "token_transfers", lambda address: transfers)
+
+    results = []
+    for holder in ("0x" + "1" * 40, "0x" + "2" * 40):
+        ctx = wallet.WalletContext(holder, holder, None)
+        results.append(wallet.get_risk_tokens(holder, ctx=ctx))
+
+    assert results == ["risky_tokens = 0.00(0)"] * 2
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.get(VerdictCache.key("token", TOKEN))["risk_score"] == 0
+
+
+def test_callable_version_is_resolved_lazily_and_rechecked(tmp_path):
+    path = tmp_path / "verdicts.json"
+    warm = VerdictCache(max_entries=10, path=path, version="v1")
+    warm.get_or_compute("token", TOKEN, lambda: {"risk_score": 10})
+    warm.save()
+
+    versions = ["v1"]
+    cache = VerdictCache(max_entries=10, path=path, version=lambda: versions[-1])
+    assert cache.version is None
+    cache.save()  # never used: must not clobber the saved warm set
+    # First use resolves the version and loads the warm set
+    assert cache.get_or_compute("token", TOKEN, lambda: {"risk_score": 50}) == {"risk_score": 10}
+
+    # Rebuilt reputation data changes the fingerprint: old verdicts are dropped
+    versions.append("v2")
+    assert cache.get_or_compute("token", TOKEN, lambda: {"risk_score": 90}) == {"risk_score": 90}
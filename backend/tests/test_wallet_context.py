@@ -0,0 +1,61 @@
+import time
+
+from backend.services import scorer
+from backend.utils import wallet
+
+
+ADDR = "0x2222222222222222222222222222222222222222"
+
+
+def _fake_txs(n: int = 3) -> list:
+    now = int(time.time())
+    return [
+        {
+            "timeStamp": str(now - (n - i) * 86400),
+            "from": ADDR,
+            "to": "0x3333333333333333333333333333333333333333",
+            "gasUsed": "21000",
+            "value": "0",
+            "input": "0x",
+            "hash": f"0x{i:064x}",
+        }
+        for i in range(n)
+    ]
+
+
+def _patch_upstreams(monkeypatch, calls: dict):
+    def counting(name, result):
+        def fetch(address):
+            calls[name] = calls.get(name, 0) + 1
+            return result
+        return fetch
+
+    monkeypatch.setitem(wallet.WalletContext._FETCHERS, "transactions", counting("transactions", _fake_txs()))
+    monkeypatch.setitem(wallet.WalletContext._FETCHERS, "token_transfers", counting("token_transfers", []))
+    monkeypatch.setitem(wallet.WalletContext._FETCHERS, "nft_transfers", counting("nft_transfers", []))
+    monkeypatch.setattr(wallet, "resolve_input_basename_address", lambda i: {"Basename": None, "Address": ADDR})
+    monkeypatch.setattr(wallet, "get_current_balance", lambda a: {"base_usd": 0.0})
+    monkeypatch.setattr(wallet, "get_past_balance", lambda a: {"base_usd": 0.0})
+
+
+def test_calculate_score_fetches_each_dataset_once(monkeypatch):
+    calls: dict = {}
+    _patch_upstreams(monkeypatch, calls)
+
+    result = scorer.calculate_score(ADDR, include_details=True)
+
+    assert calls == {"transactions": 1, "token_transfers": 1, "nft_transfers": 1}
+    assert result.base.tx_count == 3
+    assert result.base.gas_used == 3 * 21000
+
+
+def test_invalid_address_skips_upstream_fetches(monkeypatch):
+    calls: dict = {}
+    _patch_upstreams(monkeypatch, calls)
+    monkeypatch.setattr(wallet, "resolve_input_basename_address", lambda i: {"Basename": None, "Address": None})
+
+    ctx = wallet.build_wallet_context("not-an-address")
+    ctx.prefetch()
+
+    assert ctx.transactions == []
+    assert calls == {}
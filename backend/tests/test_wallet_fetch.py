@@ -0,0 +1,140 @@
+import threading
+import time
+
+from backend.utils import wallet
+
+
+def test_fetch_pages_runs_later_pages_concurrently_in_order():
+    page_size, total_pages = 3, 6
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def fetch_page(page):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        if page > total_pages:
+            return []
+        size = page_size if page < total_pages else 1
+        return [(page, i) for i in range(size)]
+
+    start = time.monotonic()
+    rows = wallet._fetch_pages(fetch_page, page_size, max_workers=4)
+    elapsed = time.monotonic() - start
+
+    assert rows == [(p, i) for p in range(1, total_pages + 1) for i in range(page_size if p < total_pages else 1)]
+    assert 1 < peak <= 4
+    assert elapsed < 0.05 * total_pages
+
+
+def test_fetch_pages_stops_at_first_failed_page():
+    pages = {1: [1, 2], 2: [3, 4], 3: None, 4: [7, 8]}
+    assert wallet._fetch_pages(lambda p: pages.get(p, []), 2, max_workers=3) == [1, 2, 3, 4]
+
+
+def _serve(responses: list):
+    """Tiny local HTTP server replaying (status, body) pairs; returns (url, hit counter, server)."""
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            hits.append(self.path)
+            status, body = responses[min(len(hits), len(responses)) - 1]
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/api", hits, server
+
+
+def test_shared_http_client_retries_and_serves_sync_and_async_callers(monkeypatch):
+    import asyncio
+    from backend.utils import http_client as http_module
+
+    monkeypatch.setattr(http_module, "BACKOFF_FACTOR", 0.01)
+    url, hits, server = _serve([(503, {}), (200, {"status": "1", "result": [1]})])
+    client = http_module.SharedHttpClient()
+    try:
+        res = client.get_json(url, params={"page": 1})
+        assert res.ok and res.data == {"status": "1", "result": [1]}
+        assert len(hits) == 2 and hits[0].endswith("page=1")
+
+        res = asyncio.run(client.aget_json(url))
+        assert res.status == 200
+    finally:
+        client.close()
+        server.shutdown()
+    assert not client.started
+
+
+def test_single_flight_coalesces_concurrent_identical_calls():
+    from backend.utils.singleflight import SingleFlight
+
+    flight = SingleFlight()
+    calls = []
+    gate = threading.Event()
+
+    def work():
+        calls.append(1)
+        gate.wait(2)
+        return ["txlist"]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do(("txlist", "0xabc"), work))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    while flight.coalesced < 4:
+        time.sleep(0.01)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [["txlist"]] * 5
+    # Completed calls are not cached
+    assert flight.do(("txlist", "0xabc"), lambda: "fresh") == "fresh"
+
+
+def test_single_flight_propagates_errors_to_waiters():
+    from backend.utils.singleflight import SingleFlight
+
+    flight = SingleFlight()
+    gate = threading.Event()
+    errors = []
+
+    def failing():
+        gate.wait(2)
+        raise ValueError("upstream down")
+
+    def call():
+        try:
+            flight.do("k", failing)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for t in threads:
+        t.start()
+    while flight.coalesced < 2:
+        time.sleep(0.01)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert errors == ["upstream down"] * 3
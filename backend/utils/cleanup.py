@@ -1,130 +1,179 @@
+# backend/utils/cleanup.py
+
 """
-Utility script to clean up old CSV files while preserving wallet count statistics.
-This script can be run periodically to free up disk space.
+Retention for security reports.
+
+Reports older than the retention period are moved out of the live report store
+into compressed per-day archive segments (see backend/utils/report_store.py),
+where they stay listed and downloadable. Work is done in batches of
+``batch_size`` reports with a pause between batches, so a large backlog never
+holds the database or the disk for long and request handling is not stalled.
+Wallet and report statistics are kept in their own counters and are not
+affected by archiving.
+
+Runs in the background inside the app (``REPORT_RETENTION_DAYS`` > 0) or as a
+scheduled command:
+
+    python -m backend.utils.cleanup --days 30
 """
 
+import fcntl
 import os
-from pathlib import Path
-from datetime import datetime, timedelta
-import json
-import shutil
-
-def get_persistent_stats_file():
-    """Get the path to the persistent stats file"""
-    base_dir = Path(__file__).parent.parent.parent
-    return base_dir / "data" / "persistent_stats.json"
-
-def load_persistent_stats():
-    """Load persistent stats from JSON file"""
-    stats_file = get_persistent_stats_file()
-    if stats_file.exists():
-        try:
-            with open(stats_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading persistent stats: {e}")
-    return {
-        "total_wallets_analyzed": 0,
-        "last_updated": datetime.now().isoformat()
-    }
-
-def cleanup_old_csv_files(days_to_keep=7):
-    """
-    Clean up CSV files older than specified days while preserving wallet count.
-    
-    Args:
-        days_to_keep (int): Number of days to keep CSV files (default: 7)
-    """
-    base_dir = Path(__file__).parent.parent.parent
-    security_reports_dir = base_dir / "data" / "security_reports"
-    
-    if not security_reports_dir.exists():
-        print("Security reports directory does not exist.")
-        return
-    
-    # Load current persistent stats
-    persistent_stats = load_persistent_stats()
-    current_total = persistent_stats.get("total_wallets_analyzed", 0)
-    
-    print(f"Current total wallets analyzed: {current_total}")
-    print(f"Cleaning up CSV files older than {days_to_keep} days...")
-    
-    # Calculate cutoff date
-    cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-    
-    deleted_files = 0
-    total_size_freed = 0
-    
-    for file_path in security_reports_dir.glob("*.csv"):
-        try:
-            file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-            
-            if file_time < cutoff_date:
-                file_size = file_path.stat().st_size
-                file_path.unlink()  # Delete the file
-                deleted_files += 1
-                total_size_freed += file_size
-                print(f"Deleted: {file_path.name}")
-                
-        except Exception as e:
-            print(f"Error processing file {file_path}: {e}")
-    
-    print(f"\nCleanup completed:")
-    print(f"- Files deleted: {deleted_files}")
-    print(f"- Space freed: {total_size_freed / 1024 / 1024:.2f} MB")
-    print(f"- Total wallets analyzed (preserved): {current_total}")
-
-def backup_csv_files(backup_days=30):
-    """
-    Create a backup of CSV files before deletion.
-    
-    Args:
-        backup_days (int): Number of days to keep in backup (default: 30)
-    """
-    base_dir = Path(__file__).parent.parent.parent
-    security_reports_dir = base_dir / "data" / "security_reports"
-    backup_dir = base_dir / "data" / "backup_reports"
-    
-    if not security_reports_dir.exists():
-        print("Security reports directory does not exist.")
-        return
-    
-    # Create backup directory
-    backup_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Calculate cutoff date for backup
-    cutoff_date = datetime.now() - timedelta(days=backup_days)
-    
-    backed_up_files = 0
-    
-    for file_path in security_reports_dir.glob("*.csv"):
-        try:
-            file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-            
-            if file_time < cutoff_date:
-                backup_path = backup_dir / file_path.name
-                shutil.copy2(file_path, backup_path)
-                backed_up_files += 1
-                print(f"Backed up: {file_path.name}")
-                
-        except Exception as e:
-            print(f"Error backing up file {file_path}: {e}")
-    
-    print(f"\nBackup completed: {backed_up_files} files backed up to {backup_dir}")
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from backend.utils.report_store import ReportStore, get_report_store
+
+_COMPRESS_LEVEL = 6
+
+
+class ReportRetention:
+    """Archives expired reports in bounded batches; safe to run from several processes."""
+
+    def __init__(self, store: ReportStore, retention_days: float = 30, batch_size: int = 200,
+                 pause: float = 0.05, interval: float = 3600):
+        self.store = store
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.pause = pause
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------------- Archiving ----------------
+    def run_once(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Archive every expired report; returns counts (skipped if another process is already running)."""
+        totals = {"archived": 0, "batches": 0, "bytes_in": 0, "bytes_out": 0}
+        cutoff = (time.time() if now is None else now) - self.retention_days * 86400
+        self.store.archive_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.store.archive_dir / ".retention.lock", "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return totals
+            while not self._stop.is_set():
+                batch = self.store.expired_reports(cutoff, self.batch_size)
+                if not batch:
+                    break
+                bytes_in, bytes_out = self._archive_batch(batch)
+                totals["archived"] += len(batch)
+                totals["batches"] += 1
+                totals["bytes_in"] += bytes_in
+                totals["bytes_out"] += bytes_out
+                if len(batch) < self.batch_size:
+                    break
+                # Let request handlers have the database between batches
+                self._stop.wait(self.pause)
+        return totals
+
+    def _archive_batch(self, reports: List[Dict[str, Any]]) -> tuple[int, int]:
+        """Append one gzip member per report to its day's segment, then move the index in one transaction."""
+        entries = []
+        bytes_in = bytes_out = 0
+        by_segment: Dict[str, List[Dict[str, Any]]] = {}
+        for report in reports:
+            day = datetime.fromtimestamp(report["created_at"]).strftime("%Y%m%d")
+            by_segment.setdefault(f"reports-{day}.gz", []).append(report)
+        for segment, segment_reports in by_segment.items():
+            with open(self.store.archive_dir / segment, "ab") as f:
+                offset = f.tell()
+                for report in segment_reports:
+                    compressor = zlib.compressobj(_COMPRESS_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+                    length = 0
+                    for chunk in self.store.stream_csv(report):
+                        data = chunk.encode("utf-8")
+                        bytes_in += len(data)
+                        length += f.write(compressor.compress(data))
+                    length += f.write(compressor.flush())
+                    entries.append({**report, "segment": segment, "segment_offset": offset, "segment_length": length})
+                    offset += length
+                f.flush()
+                # Segment bytes must be durable before the live rows are dropped
+                os.fsync(f.fileno())
+            bytes_out += sum(e["segment_length"] for e in entries if e["segment"] == segment)
+        self.store.archive_reports(entries)
+        return bytes_in, bytes_out
+
+    # ---------------- Background ----------------
+    def start(self) -> None:
+        """Run periodically in a daemon thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="report-retention", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                result = self.run_once()
+                if result["archived"]:
+                    print(
+                        f"Report retention archived {result['archived']} reports in {result['batches']} batches "
+                        f"({result['bytes_in'] / 1024 / 1024:.2f} MB -> {result['bytes_out'] / 1024 / 1024:.2f} MB)"
+                    )
+            except Exception as e:
+                print(f"Error running report retention: {e}")
+            self._stop.wait(self.interval)
+
+    def close(self) -> None:
+        """Stop the background thread; an in-progress run stops after its current batch."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+
+_RETENTION: Optional[ReportRetention] = None
+_RETENTION_LOCK = threading.Lock()
+
+
+def get_report_retention() -> ReportRetention:
+    """Process-wide retention job configured from the environment"""
+    global _RETENTION
+    if _RETENTION is None:
+        with _RETENTION_LOCK:
+            if _RETENTION is None:
+                _RETENTION = ReportRetention(
+                    get_report_store(),
+                    retention_days=float(os.getenv("REPORT_RETENTION_DAYS", "30")),
+                    batch_size=int(os.getenv("REPORT_RETENTION_BATCH", "200")),
+                    pause=float(os.getenv("REPORT_RETENTION_PAUSE", "0.05")),
+                    interval=float(os.getenv("REPORT_RETENTION_INTERVAL", "3600")),
+                )
+    return _RETENTION
+
+
+def start_report_retention() -> None:
+    """Start background retention unless disabled with REPORT_RETENTION_DAYS=0"""
+    if float(os.getenv("REPORT_RETENTION_DAYS", "30")) > 0:
+        get_report_retention().start()
+
+
+def close_report_retention() -> None:
+    if _RETENTION is not None:
+        _RETENTION.close()
+
 
 if __name__ == "__main__":
     import argparse
-    
-    parser = argparse.ArgumentParser(description="Clean up old CSV files while preserving wallet count")
-    parser.add_argument("--days", type=int, default=7, help="Number of days to keep CSV files (default: 7)")
-    parser.add_argument("--backup", action="store_true", help="Create backup before deletion")
-    parser.add_argument("--backup-days", type=int, default=30, help="Number of days to keep in backup (default: 30)")
-    
+
+    parser = argparse.ArgumentParser(description="Archive expired security reports into compressed day segments")
+    parser.add_argument("--days", type=float, default=float(os.getenv("REPORT_RETENTION_DAYS", "30")),
+                        help="Keep reports live for this many days (default: 30)")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("REPORT_RETENTION_BATCH", "200")),
+                        help="Reports archived per batch (default: 200)")
+    parser.add_argument("--pause", type=float, default=float(os.getenv("REPORT_RETENTION_PAUSE", "0.05")),
+                        help="Seconds to pause between batches (default: 0.05)")
     args = parser.parse_args()
-    
-    if args.backup:
-        print("Creating backup...")
-        backup_csv_files(args.backup_days)
-        print()
-    
-    cleanup_old_csv_files(args.days) 
\ No newline at end of file
+
+    retention = ReportRetention(get_report_store(), retention_days=args.days, batch_size=args.batch_size,
+                                pause=args.pause)
+    result = retention.run_once()
+    print(f"Retention completed:")
+    print(f"- Reports archived: {result['archived']} in {result['batches']} batches")
+    print(f"- CSV size archived: {result['bytes_in'] / 1024 / 1024:.2f} MB")
+    print(f"- Archive size written: {result['bytes_out'] / 1024 / 1024:.2f} MB")
@@ -0,0 +1,233 @@
+# backend/utils/distinct_counter.py
+
+"""
+Distinct-wallet counter behind /stats "wallets_analyzed".
+
+Wallets are recorded as they are scored. Up to ``exact_limit`` wallets the
+counter is exact: a SQLite set of 16-byte address digests, where the insert
+itself says whether the wallet is new. Past the limit it switches once to a
+HyperLogLog sketch (2^precision one-byte registers, ~1.04/sqrt(2^precision)
+relative error) and drops the set. The sketch is merged into the shared store
+with a register-wise max, so updates from all uvicorn workers combine safely.
+In both modes an update is O(1) and no directory or file scans happen on the
+request path.
+
+A legacy total (wallets counted before the set existed whose addresses were
+not kept) can be carried over as a fixed ``base`` added on top of the set.
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+MODE_EXACT = "exact"
+MODE_HLL = "hll"
+
+
+def wallet_digest(address: str) -> bytes:
+    """16-byte digest of a lowercased address; its first 8 bytes drive the HyperLogLog."""
+    return hashlib.blake2b(address.strip().lower().encode("utf-8"), digest_size=16).digest()
+
+
+class HyperLogLog:
+    """HyperLogLog sketch over 64-bit hashes with numpy registers."""
+
+    def __init__(self, precision: int = 14, registers: Optional[bytes] = None):
+        self.precision = precision
+        self.m = 1 << precision
+        if registers is not None and len(registers) == self.m:
+            self.registers = np.frombuffer(registers, dtype=np.uint8).copy()
+        else:
+            self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def add_hash(self, h: int) -> bool:
+        """Add a 64-bit hash; True if a register grew (the value was certainly not seen before)."""
+        idx = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        # Position of the leftmost 1-bit in the remaining 64-p bits (1-based)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+            return True
+        return False
+
+    def merge(self, registers: bytes) -> None:
+        if len(registers) == self.m:
+            np.maximum(self.registers, np.frombuffer(registers, dtype=np.uint8), out=self.registers)
+
+    def to_bytes(self) -> bytes:
+        return self.registers.tobytes()
+
+    def estimate(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int32))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class DistinctWalletCounter:
+    """Exact-then-approximate count of distinct wallets, shared across processes via SQLite."""
+
+    def __init__(self, path: Path, exact_limit: int = 100000, precision: int = 14, cache_ttl: float = 5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.exact_limit = exact_limit
+        self.precision = precision
+        self.cache_ttl = cache_ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cached_count = 0
+        self._cached_at = 0.0
+        self._seeded = False
+        conn = self._connect()
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS wallets (digest BLOB PRIMARY KEY) WITHOUT ROWID")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('mode', ?)", (MODE_EXACT,))
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('count', 0)")
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('base', 0)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; write transactions are opened explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _meta(conn: sqlite3.Connection, key: str):
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def mode(self) -> str:
+        return self._meta(self._connect(), "mode")
+
+    def add(self, address: str) -> bool:
+        """Record a scored wallet; True if it had not been counted before (approximate in HLL mode)."""
+        return self.add_many([address]) == 1
+
+    def add_many(self, addresses: Iterable[str]) -> int:
+        """Record several wallets in one transaction; returns how many were new."""
+        digests = [wallet_digest(a) for a in addresses if a]
+        if not digests:
+            return 0
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._meta(conn, "mode") == MODE_EXACT:
+                new = 0
+                for digest in digests:
+                    new += conn.execute("INSERT OR IGNORE INTO wallets (digest) VALUES (?)", (digest,)).rowcount
+                count = int(self._meta(conn, "count")) + new
+                conn.execute("UPDATE meta SET value = ? WHERE key = 'count'", (count,))
+                if count > self.exact_limit:
+                    count = self._switch_to_hll(conn)
+            else:
+                sketch = HyperLogLog(self.precision, self._meta(conn, "registers"))
+                new = sum(1 for d in digests if sketch.add_hash(int.from_bytes(d[:8], "big")))
+                count = sketch.estimate()
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('registers', ?)", (sketch.to_bytes(),))
+                conn.execute("UPDATE meta SET value = ? WHERE key = 'count'", (count,))
+            count += int(self._meta(conn, "base") or 0)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self._cached_count, self._cached_at = count, time.monotonic()
+        return new
+
+    def seed_once(self, load_addresses: Callable[[], Iterable[str]], legacy_total: Callable[[], int] = lambda: 0) -> None:
+        """
+        Import wallets recorded before this counter existed (skipped once the store is seeded).
+
+        ``legacy_total`` is the old wallets-analyzed figure; the part of it not covered by the
+        imported addresses is kept as the base so the count does not drop after the upgrade.
+        """
+        if self._seeded:
+            return
+        conn = self._connect()
+        if self._meta(conn, "seeded"):
+            self._seeded = True
+            return
+        # Concurrent seeding by several workers is harmless: adds are idempotent and the
+        # base is derived from the resulting set size, so every worker writes the same value
+        added = self.add_many(load_addresses())
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            base = max(0, int(legacy_total() or 0) - int(self._meta(conn, "count") or 0))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('base', ?)", (base,))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('seeded', 1)")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._seeded = True
+        with self._lock:
+            self._cached_at = 0.0
+        print(f"Distinct wallet counter seeded with {added} wallets (+{base} legacy)")
+
+    def _switch_to_hll(self, conn: sqlite3.Connection) -> int:
+        """Fold the exact set into a sketch and drop it (runs once, inside the caller's transaction)."""
+        sketch = HyperLogLog(self.precision)
+        for (digest,) in conn.execute("SELECT digest FROM wallets"):
+            sketch.add_hash(int.from_bytes(digest[:8], "big"))
+        conn.execute("DELETE FROM wallets")
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'mode'", (MODE_HLL,))
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('registers', ?)", (sketch.to_bytes(),))
+        count = sketch.estimate()
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'count'", (count,))
+        print(f"Distinct wallet counter switched to HyperLogLog at {self.exact_limit} wallets")
+        return count
+
+    def count(self) -> int:
+        """Distinct wallets counted so far (memory read, refreshed from the shared store every cache_ttl seconds)."""
+        with self._lock:
+            if time.monotonic() - self._cached_at < self.cache_ttl:
+                return self._cached_count
+        conn = self._connect()
+        count = int(self._meta(conn, "count") or 0) + int(self._meta(conn, "base") or 0)
+        with self._lock:
+            self._cached_count, self._cached_at = count, time.monotonic()
+        return count
+
+
+_COUNTER: Optional[DistinctWalletCounter] = None
+_COUNTER_LOCK = threading.Lock()
+
+
+def get_wallet_counter_file() -> Path:
+    """Get the path to the distinct wallet counter database"""
+    override = os.getenv("WALLET_COUNTER_PATH")
+    if override:
+        return Path(override)
+    base_dir = Path(__file__).parent.parent.parent
+    return base_dir / "data" / "wallet_counter.sqlite3"
+
+
+def get_wallet_counter() -> DistinctWalletCounter:
+    """Process-wide distinct wallet counter"""
+    global _COUNTER
+    if _COUNTER is None:
+        with _COUNTER_LOCK:
+            if _COUNTER is None:
+                _COUNTER = DistinctWalletCounter(
+                    get_wallet_counter_file(),
+                    exact_limit=int(os.getenv("WALLET_COUNTER_EXACT_LIMIT", "100000")),
+                )
+    return _COUNTER
@@ -0,0 +1,151 @@
+# backend/utils/http_client.py
+
+"""
+Shared, long-lived HTTP client for upstream APIs (Blockscout, Etherscan v2, Zerion).
+
+One aiohttp.ClientSession with a pooled, keep-alive TCPConnector and DNS cache
+lives on a dedicated event-loop thread. Async code awaits ``aget_json`` and the
+synchronous wallet functions call ``get_json``; both run on the same session,
+so every request reuses warm connections instead of a new TCP/TLS handshake.
+The FastAPI lifespan starts and closes it; it also starts lazily on first use.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import aiohttp
+
+DEFAULT_HEADERS = {
+    "User-Agent": "BaseBadge/1.0",
+    "Accept": "application/json",
+}
+
+# Same retry policy the previous requests.Session adapter used
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+
+
+class _Retryable(Exception):
+    """Internal marker for a response status that should be retried."""
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    data: Any
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+class SharedHttpClient:
+    """Process-wide aiohttp session on a background event loop, usable from sync and async code."""
+
+    def __init__(
+        self,
+        limit: int = int(os.getenv("HTTP_POOL_LIMIT", "100")),
+        limit_per_host: int = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20")),
+        dns_cache_ttl: int = int(os.getenv("HTTP_DNS_CACHE_TTL", "300")),
+        keepalive_timeout: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30")),
+        default_timeout: float = 10,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.default_timeout = default_timeout
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None
+
+    def start(self) -> None:
+        """Start the event-loop thread and open the pooled session (idempotent)."""
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="basebadge-http", daemon=True)
+            thread.start()
+            self._session = asyncio.run_coroutine_threadsafe(self._open_session(), loop).result()
+            self._loop = loop
+            self._thread = thread
+
+    async def _open_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        return aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS)
+
+    def close(self) -> None:
+        """Close the session and stop the loop thread (idempotent)."""
+        with self._lock:
+            loop, thread, session = self._loop, self._thread, self._session
+            self._loop = self._thread = self._session = None
+        if loop is None:
+            return
+        try:
+            if session is not None:
+                asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=5)
+        except Exception as e:
+            print(f"Error closing shared HTTP session: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+        loop.close()
+
+    async def _request_json(self, url: str, params: Optional[dict], headers: Optional[dict], timeout: float) -> HttpResponse:
+        # aiohttp only accepts str/int/float query values
+        query = {k: str(v) for k, v in (params or {}).items()}
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        attempt = 0
+        while True:
+            try:
+                async with self._session.get(url, params=query, headers=headers, timeout=client_timeout) as resp:
+                    if resp.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                        raise _Retryable(f"HTTP {resp.status}")
+                    try:
+                        data = await resp.json(content_type=None)
+                    except Exception:
+                        data = None
+                    return HttpResponse(resp.status, data)
+            except (_Retryable, aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= MAX_RETRIES:
+                    raise
+                await asyncio.sleep(BACKOFF_FACTOR * (2 ** attempt))
+                attempt += 1
+
+    def _submit(self, coro):
+        if not self.started:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def get_json(self, url: str, *, params: Optional[dict] = None, headers: Optional[dict] = None,
+                 timeout: Optional[float] = None) -> HttpResponse:
+        """Blocking GET returning status and decoded JSON (None if the body is not JSON)."""
+        if self._thread is not None and threading.current_thread() is self._thread:
+            raise RuntimeError("get_json would block the HTTP client loop; use aget_json instead")
+        return self._submit(self._request_json(url, params, headers, timeout or self.default_timeout)).result()
+
+    async def aget_json(self, url: str, *, params: Optional[dict] = None, headers: Optional[dict] = None,
+                        timeout: Optional[float] = None) -> HttpResponse:
+        """Awaitable GET usable from any event loop (e.g. FastAPI's)."""
+        future = self._submit(self._request_json(url, params, headers, timeout or self.default_timeout))
+        return await asyncio.wrap_future(future)
+
+
+http_client = SharedHttpClient()
+atexit.register(http_client.close)
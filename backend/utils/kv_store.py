@@ -0,0 +1,195 @@
+# backend/utils/kv_store.py
+
+"""
+Embedded key/value store for per-user records (dashboards, profiles, ...).
+
+Each store is one SQLite table in WAL mode holding a JSON value per key, so
+uvicorn workers share it safely and a write touches one row instead of
+rewriting a whole JSON file. Durability is chosen per store:
+
+- ``sync``: every ``put`` commits on the caller's thread before returning.
+- ``batched``: ``put`` only updates an in-memory pending map; a background
+  flusher commits all pending keys in one transaction every ``flush_interval``
+  seconds and on ``close``. Requests never wait on disk, at the cost of losing
+  up to one interval of writes on a hard crash. Readers in the same process see
+  pending values immediately; other workers see them after the next flush.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DURABILITY_SYNC = "sync"
+DURABILITY_BATCHED = "batched"
+
+
+class KVStore:
+    """JSON values keyed by string in one SQLite table, with optional write-behind."""
+
+    def __init__(self, path: Path, table: str = "kv", durability: str = DURABILITY_BATCHED,
+                 flush_interval: float = 0.5):
+        if durability not in (DURABILITY_SYNC, DURABILITY_BATCHED):
+            raise ValueError(f"Unknown durability mode: {durability}")
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.table = table
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, Any] = {}
+        # Values taken from _pending by a flush that has not committed yet
+        self._inflight: Dict[str, Any] = {}
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self.flushes = 0
+        with self._connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # FULL fsyncs every commit; NORMAL is crash-safe in WAL mode but may drop the last commits on power loss
+            conn.execute(f"PRAGMA synchronous={'FULL' if self.durability == DURABILITY_SYNC else 'NORMAL'}")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, items: Dict[str, Any]) -> None:
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            conn.executemany(
+                f"INSERT INTO {self.table} (key, value, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                [(key, json.dumps(value, separators=(",", ":")), now) for key, value in items.items()],
+            )
+
+    # ---------------- Reads ----------------
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            if key in self._inflight:
+                return self._inflight[key]
+        row = self._connect().execute(f"SELECT value FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self) -> int:
+        self.flush()
+        return self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    # ---------------- Writes ----------------
+    def put(self, key: str, value: Any) -> None:
+        if self.durability == DURABILITY_SYNC:
+            self._write({key: value})
+            return
+        with self._lock:
+            self._pending[key] = value
+        self._ensure_flusher()
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        """Write several records in one transaction, regardless of durability mode."""
+        if items:
+            self._write(items)
+
+    def flush(self) -> None:
+        """Commit every pending write in one transaction."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._inflight, self._pending = self._pending, {}
+            try:
+                self._write(self._inflight)
+                self.flushes += 1
+            except Exception as e:
+                print(f"Error flushing {self.table} store: {e}")
+                with self._lock:
+                    # Keep the failed batch for the next flush unless a newer value arrived meanwhile
+                    self._pending = {**self._inflight, **self._pending}
+            finally:
+                with self._lock:
+                    self._inflight = {}
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._stop.clear()
+                self._flusher = threading.Thread(target=self._run_flusher, name=f"kv-flush-{self.table}", daemon=True)
+                self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the flusher and commit whatever is still pending."""
+        self._stop.set()
+        flusher = self._flusher
+        if flusher is not None:
+            flusher.join(timeout=5)
+            self._flusher = None
+        self.flush()
+
+
+# ---------------- User dashboards ----------------
+def get_dashboard_store_file() -> Path:
+    """Get the path to the dashboard store database"""
+    override = os.getenv("DASHBOARD_STORE_PATH")
+    if override:
+        return Path(override)
+    base_dir = Path(__file__).parent.parent.parent
+    return base_dir / "data" / "user_dashboards.sqlite3"
+
+
+_DASHBOARDS: Optional[KVStore] = None
+_DASHBOARDS_LOCK = threading.Lock()
+
+
+def get_dashboard_store() -> KVStore:
+    """Process-wide dashboard store; imports data/user_dashboards.json the first time it is created."""
+    global _DASHBOARDS
+    if _DASHBOARDS is None:
+        with _DASHBOARDS_LOCK:
+            if _DASHBOARDS is None:
+                store = KVStore(
+                    get_dashboard_store_file(),
+                    table="dashboards",
+                    durability=os.getenv("DASHBOARD_DURABILITY", DURABILITY_BATCHED),
+                    flush_interval=float(os.getenv("DASHBOARD_FLUSH_INTERVAL", "0.5")),
+                )
+                _import_legacy_json(store, Path(__file__).parent.parent.parent / "data" / "user_dashboards.json")
+                _DASHBOARDS = store
+    return _DASHBOARDS
+
+
+def _import_legacy_json(store: KVStore, legacy_path: Path) -> None:
+    if not legacy_path.exists() or store.count() > 0:
+        return
+    try:
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        store.put_many({key.lower(): value for key, value in records.items()})
+        print(f"Imported {len(records)} records from {legacy_path.name}")
+    except Exception as e:
+        print(f"Error importing {legacy_path.name}: {e}")
+
+
+def close_stores() -> None:
+    """Flush write-behind stores (called at shutdown)."""
+    if _DASHBOARDS is not None:
+        _DASHBOARDS.close()
@@ -0,0 +1,65 @@
+# backend/utils/multicall.py
+
+"""
+Multicall3 batching for on-chain view calls.
+
+Every view call a route needs (``getScore``, ``getScoreCard``, ``nonces``, ...)
+is encoded as a ``Call`` and sent in a single ``aggregate3`` eth_call to the
+Multicall3 contract (same address on Base and most EVM chains). Each call may
+fail on its own (``allowFailure``), so one reverting read does not sink the
+others. If the aggregate call itself fails (RPC without Multicall3, node error)
+the calls are made one by one, which is how they were made before.
+"""
+
+import os
+from typing import Any, List, NamedTuple, Sequence, Tuple
+
+from eth_abi import decode, encode
+from eth_utils import keccak
+from web3 import Web3
+
+MULTICALL3_ADDRESS = Web3.to_checksum_address(
+    os.getenv("MULTICALL3_ADDRESS", "0xcA11bde05977b3631167028862bE2a173976CA11")
+)
+AGGREGATE3_SELECTOR = keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+
+
+class Call(NamedTuple):
+    target: str
+    data: bytes
+    allow_failure: bool = True
+
+
+def encode_call(signature: str, arg_types: Sequence[str] = (), args: Sequence[Any] = ()) -> bytes:
+    """Calldata for a function signature such as "getScore(address)"."""
+    return keccak(text=signature)[:4] + encode(list(arg_types), list(args))
+
+
+def encode_aggregate3(calls: Sequence[Call]) -> bytes:
+    return AGGREGATE3_SELECTOR + encode(
+        ["(address,bool,bytes)[]"], [[(c.target, c.allow_failure, c.data) for c in calls]]
+    )
+
+
+def decode_aggregate3(raw: bytes) -> List[Tuple[bool, bytes]]:
+    return [(bool(success), bytes(data)) for success, data in decode(["(bool,bytes)[]"], bytes(raw))[0]]
+
+
+def aggregate3(w3: Web3, calls: Sequence[Call], multicall_address: str = MULTICALL3_ADDRESS) -> List[Tuple[bool, bytes]]:
+    """(success, return data) per call, fetched in one eth_call when possible."""
+    if not calls:
+        return []
+    try:
+        raw = w3.eth.call({"to": multicall_address, "data": "0x" + encode_aggregate3(calls).hex()})
+        return decode_aggregate3(raw)
+    except Exception as e:
+        print(f"Multicall3 aggregate3 failed, falling back to individual calls: {e}")
+    results = []
+    for call in calls:
+        try:
+            results.append((True, bytes(w3.eth.call({"to": call.target, "data": "0x" + call.data.hex()}))))
+        except Exception:
+            if not call.allow_failure:
+                raise
+            results.append((False, b""))
+    return results
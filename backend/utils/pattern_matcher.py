@@ -0,0 +1,82 @@
+# backend/utils/pattern_matcher.py
+
+"""
+Aho–Corasick multi-pattern matcher for token/NFT name heuristics.
+
+Patterns are grouped into named categories and compiled once into a single
+automaton. Scanning a name costs one pass over its characters no matter how
+many patterns are loaded, so the pattern lists can grow to thousands of entries.
+"""
+
+from collections import deque
+from typing import Iterable
+
+
+class PatternMatcher:
+    """
+    Case-insensitive substring matcher over categorized pattern lists.
+
+    ``scan`` reports, for every category with at least one hit, the matching pattern
+    that comes first in that category's list (the same pattern a sequential
+    ``for pattern in patterns: if pattern in text: break`` loop would report).
+    """
+
+    def __init__(self, categories: dict[str, Iterable[str]]):
+        self.patterns: dict[str, list[str]] = {name: list(patterns) for name, patterns in categories.items()}
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Per state: (category, rank) of every pattern ending here, including via failure links
+        self._out: list[list[tuple[str, int]]] = [[]]
+
+        for name, patterns in self.patterns.items():
+            for rank, pattern in enumerate(patterns):
+                if pattern:
+                    self._insert(pattern.lower(), (name, rank))
+        self._build_failure_links()
+
+    def _insert(self, pattern: str, output: tuple[str, int]) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state].append(output)
+
+    def _build_failure_links(self) -> None:
+        # Depth-1 states fail to the root (already 0); deeper states are filled breadth-first
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def scan(self, *texts: str) -> dict[str, str]:
+        """Scan each text once; return {category: first-ranked matching pattern}."""
+        best: dict[str, int] = {}
+        goto, fail, out = self._goto, self._fail, self._out
+        for text in texts:
+            if not text:
+                continue
+            state = 0
+            for ch in text.lower():
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                for name, rank in out[state]:
+                    if rank < best.get(name, rank + 1):
+                        best[name] = rank
+        return {name: self.patterns[name][rank] for name, rank in best.items()}
+
+    def matches_any(self, text: str) -> bool:
+        """True if any pattern from any category occurs in `text`."""
+        return bool(self.scan(text))
@@ -0,0 +1,127 @@
+# backend/utils/profile_store.py
+
+"""
+Profile repository: one row per address plus content-addressed avatar blobs.
+
+Profiles live in a KVStore table (per-record upserts, committed before the POST
+returns). Avatar data URIs are moved out of the profile record into an
+``avatars`` table keyed by their sha256, so profile rows stay small, identical
+avatars are stored once, and reading or writing one profile never touches the
+others. Records hold ``blob:sha256:<digest>`` in place of the data URI and are
+rehydrated on read, so the API still returns the original data URI.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from backend.utils.kv_store import DURABILITY_SYNC, KVStore
+
+BLOB_PREFIX = "blob:sha256:"
+# Profile fields that may carry an inline image
+AVATAR_FIELDS = ("avatar", "basenameAvatar")
+
+
+def get_profile_store_file() -> Path:
+    """Get the path to the profile store database"""
+    override = os.getenv("PROFILE_STORE_PATH")
+    if override:
+        return Path(override)
+    base_dir = Path(__file__).parent.parent.parent
+    return base_dir / "data" / "profiles.sqlite3"
+
+
+class AvatarStore:
+    """Content-addressed store for avatar data URIs (sha256 -> data URI)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS avatars (digest TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def put(self, data_uri: str) -> str:
+        """Store a data URI (no-op if already present) and return its reference."""
+        digest = hashlib.sha256(data_uri.encode("utf-8")).hexdigest()
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO avatars (digest, data) VALUES (?, ?)", (digest, data_uri))
+        return BLOB_PREFIX + digest
+
+    def get(self, reference: str) -> Optional[str]:
+        digest = reference[len(BLOB_PREFIX):]
+        row = self._connect().execute("SELECT data FROM avatars WHERE digest = ?", (digest,)).fetchone()
+        return row[0] if row else None
+
+
+class ProfileRepository:
+    """Per-address profile records; reads never write."""
+
+    def __init__(self, path: Path):
+        self.records = KVStore(path, table="profiles", durability=DURABILITY_SYNC)
+        self.avatars = AvatarStore(path)
+
+    def _dehydrate(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        record = dict(profile)
+        for field in AVATAR_FIELDS:
+            value = record.get(field)
+            if isinstance(value, str) and value.startswith("data:"):
+                record[field] = self.avatars.put(value)
+        return record
+
+    def _hydrate(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        profile = dict(record)
+        for field in AVATAR_FIELDS:
+            value = profile.get(field)
+            if isinstance(value, str) and value.startswith(BLOB_PREFIX):
+                profile[field] = self.avatars.get(value) or value
+        return profile
+
+    def get(self, address: str) -> Optional[Dict[str, Any]]:
+        record = self.records.get(address.lower())
+        return self._hydrate(record) if record else None
+
+    def upsert(self, address: str, profile: Dict[str, Any]) -> None:
+        self.records.put(address.lower(), self._dehydrate(profile))
+
+    def import_legacy(self, legacy_path: Path) -> None:
+        """One-time import of data/profiles.json when the repository is empty."""
+        if not legacy_path.exists() or self.records.count() > 0:
+            return
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                profiles = json.load(f)
+            if isinstance(profiles, dict):
+                self.records.put_many({k.lower(): self._dehydrate(v) for k, v in profiles.items()})
+                print(f"Imported {len(profiles)} profiles from {legacy_path.name}")
+        except Exception as e:
+            print(f"Error importing profiles: {e}")
+
+
+_REPO: Optional[ProfileRepository] = None
+_REPO_LOCK = threading.Lock()
+
+
+def get_profile_repository() -> ProfileRepository:
+    """Process-wide profile repository"""
+    global _REPO
+    if _REPO is None:
+        with _REPO_LOCK:
+            if _REPO is None:
+                repo = ProfileRepository(get_profile_store_file())
+                repo.import_legacy(Path(__file__).parent.parent.parent / "data" / "profiles.json")
+                _REPO = repo
+    return _REPO
@@ -0,0 +1,349 @@
+# backend/utils/report_store.py
+
+"""
+Indexed store for security reports (risky tokens, contracts, signs and NFTs).
+
+Each analysis used to write a ``{type}_{address}_{timestamp}.csv`` file that the
+download and listing endpoints found again with ``glob``. Reports now live in
+SQLite (WAL): a ``reports`` header table indexed by (address, report_type,
+created_at) and one row table per report type whose columns are that report's
+CSV columns. Listing and latest-report lookups are indexed queries, and the CSV
+is rendered while streaming the rows at download time.
+
+Expired reports are moved by the retention job (backend/utils/cleanup.py) into
+per-day archive segments: ``report_archive/reports-YYYYMMDD.gz`` files made of
+one gzip member per report. The ``archive`` table indexes each report's segment,
+offset and length, so archived reports keep showing up in listings and can
+still be downloaded.
+"""
+
+import codecs
+import csv
+import fcntl
+import io
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# CSV columns per report type, in download order
+REPORT_COLUMNS: Dict[str, List[str]] = {
+    "risky_tokens": [
+        "Token Name", "Token Symbol", "Contract Address", "Risk Level", "Risk Score", "Risk Reasons",
+    ],
+    "risky_contracts": [
+        "contract_address", "risk_score", "risk_level", "risk_factors", "interaction_count", "analysis_date",
+    ],
+    "risky_signs": [
+        "function_signature", "function_name", "risk_level", "risk_score",
+        "contract_address", "spender_address", "approval_amount", "is_unlimited",
+        "risk_factors", "transaction_count", "first_signature", "last_signature",
+        "example_transaction_hash",
+    ],
+    "suspicious_nfts": [
+        "NFT Name", "NFT Symbol", "Contract Address", "Token ID", "Risk Level", "Risk Score", "Risk Reasons",
+        "Transaction Type",
+    ],
+}
+REPORT_TYPES = tuple(REPORT_COLUMNS)
+
+# Report ids keep the timestamp format of the old file names
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+_LEGACY_FILE_RE = re.compile(
+    r"^(" + "|".join(REPORT_TYPES) + r")_(0x[0-9a-fA-F]{40})_(\d{8}_\d{6})\.csv$"
+)
+_STREAM_BATCH = 500
+_ARCHIVE_READ_CHUNK = 64 * 1024
+_REPORT_FIELDS = "id, report_type, address, created_at, timestamp, row_count, size"
+# Live reports shaped like archive rows, for queries over both tables
+_LIVE_REPORTS = (
+    f"SELECT {_REPORT_FIELDS}, NULL AS segment, NULL AS segment_offset, NULL AS segment_length FROM reports"
+)
+
+
+def get_report_archive_dir() -> Path:
+    """Get the directory holding archived (expired) report segments"""
+    override = os.getenv("REPORT_ARCHIVE_DIR")
+    if override:
+        return Path(override)
+    base_dir = Path(__file__).parent.parent.parent
+    return base_dir / "data" / "report_archive"
+
+
+def get_report_store_file() -> Path:
+    """Get the path to the security report database"""
+    override = os.getenv("REPORT_STORE_PATH")
+    if override:
+        return Path(override)
+    base_dir = Path(__file__).parent.parent.parent
+    return base_dir / "data" / "security_reports.sqlite3"
+
+
+def _rows_table(report_type: str) -> str:
+    return f"rows_{report_type}"
+
+
+def _quote(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+def csv_cell(value: Any) -> str:
+    """Same text csv.DictWriter would have written for the value."""
+    return "" if value is None else str(value)
+
+
+class ReportStore:
+    """SQLite-backed security reports with indexed per-address lookups."""
+
+    def __init__(self, path: Path, archive_dir: Optional[Path] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.archive_dir = Path(archive_dir) if archive_dir else self.path.parent / "report_archive"
+        self._local = threading.local()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS reports ("
+                "id INTEGER PRIMARY KEY, report_type TEXT NOT NULL, address TEXT NOT NULL, "
+                "created_at REAL NOT NULL, timestamp TEXT NOT NULL, row_count INTEGER NOT NULL, size INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS reports_by_address ON reports (address, report_type, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS reports_by_time ON reports (created_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS archive ("
+                "id INTEGER PRIMARY KEY, report_type TEXT NOT NULL, address TEXT NOT NULL, "
+                "created_at REAL NOT NULL, timestamp TEXT NOT NULL, row_count INTEGER NOT NULL, size INTEGER NOT NULL, "
+                "segment TEXT NOT NULL, segment_offset INTEGER NOT NULL, segment_length INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS archive_by_address ON archive (address, report_type, created_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+            for report_type, columns in REPORT_COLUMNS.items():
+                column_defs = ", ".join(f"{_quote(c)} TEXT" for c in columns)
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {_rows_table(report_type)} ("
+                    f"report_id INTEGER NOT NULL, seq INTEGER NOT NULL, {column_defs}, PRIMARY KEY (report_id, seq))"
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------------- Writes ----------------
+    def save_report(self, report_type: str, address: str, rows: List[Dict[str, Any]],
+                    created_at: Optional[float] = None) -> int:
+        """Store one report (rows keyed by CSV column name) and return its id."""
+        columns = REPORT_COLUMNS[report_type]
+        created_at = time.time() if created_at is None else created_at
+        values = [[csv_cell(row.get(c)) for c in columns] for row in rows]
+        # Size of the CSV a download will produce, for the listing endpoint
+        size = sum(len(chunk.encode("utf-8")) for chunk in render_csv(columns, values))
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO reports (report_type, address, created_at, timestamp, row_count, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (report_type, address.lower(), created_at,
+                 datetime.fromtimestamp(created_at).strftime(TIMESTAMP_FORMAT), len(values), size),
+            )
+            report_id = cursor.lastrowid
+            placeholders = ", ".join("?" for _ in range(len(columns) + 2))
+            conn.executemany(
+                f"INSERT INTO {_rows_table(report_type)} VALUES ({placeholders})",
+                [(report_id, seq, *row) for seq, row in enumerate(values)],
+            )
+        return report_id
+
+    def delete_reports(self, report_ids: List[int]) -> None:
+        """Remove reports and their rows (used by retention)."""
+        if not report_ids:
+            return
+        conn = self._connect()
+        placeholders = ", ".join("?" for _ in report_ids)
+        with conn:
+            for report_type in REPORT_TYPES:
+                conn.execute(f"DELETE FROM {_rows_table(report_type)} WHERE report_id IN ({placeholders})", report_ids)
+            conn.execute(f"DELETE FROM reports WHERE id IN ({placeholders})", report_ids)
+
+    # ---------------- Archiving ----------------
+    def expired_reports(self, before: float, limit: int) -> List[Dict[str, Any]]:
+        """Oldest live reports created before `before`, at most `limit` of them."""
+        rows = self._connect().execute(
+            "SELECT * FROM reports WHERE created_at < ? ORDER BY created_at LIMIT ?", (before, limit)
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def archive_reports(self, entries: List[Dict[str, Any]]) -> int:
+        """Index reports already written to archive segments and drop their live rows.
+
+        Each entry is a live report dict plus ``segment``, ``segment_offset`` and ``segment_length``.
+        Reports archived meanwhile by another process are skipped; returns how many moved.
+        """
+        if not entries:
+            return 0
+        conn = self._connect()
+        moved = 0
+        with conn:
+            for entry in entries:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO archive "
+                    f"SELECT {_REPORT_FIELDS}, ?, ?, ? FROM reports WHERE id = ?",
+                    (entry["segment"], entry["segment_offset"], entry["segment_length"], entry["id"]),
+                )
+                if cursor.rowcount:
+                    conn.execute(f"DELETE FROM {_rows_table(entry['report_type'])} WHERE report_id = ?", (entry["id"],))
+                    conn.execute("DELETE FROM reports WHERE id = ?", (entry["id"],))
+                    moved += 1
+        return moved
+
+    # ---------------- Reads ----------------
+    def list_reports(self, address: str) -> List[Dict[str, Any]]:
+        """Reports for an address (live and archived), newest first."""
+        rows = self._connect().execute(
+            f"{_LIVE_REPORTS} WHERE address = ? UNION ALL SELECT * FROM archive WHERE address = ? ORDER BY created_at DESC",
+            (address.lower(), address.lower()),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def find_report(self, report_type: str, address: str, timestamp: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Latest report of a type for an address, or the latest one with the given timestamp."""
+        condition = "address = ? AND report_type = ?"
+        params: list = [address.lower(), report_type]
+        if timestamp:
+            condition += " AND timestamp = ?"
+            params.append(timestamp)
+        row = self._connect().execute(
+            f"{_LIVE_REPORTS} WHERE {condition} UNION ALL SELECT * FROM archive WHERE {condition} ORDER BY created_at DESC LIMIT 1",
+            params + params,
+        ).fetchone()
+        return dict(row) if row else None
+
+    def iter_rows(self, report: Dict[str, Any]) -> Iterator[List[str]]:
+        """Rows of a report in their original order, fetched in batches."""
+        columns = REPORT_COLUMNS[report["report_type"]]
+        select = ", ".join(_quote(c) for c in columns)
+        cursor = self._connect().execute(
+            f"SELECT {select} FROM {_rows_table(report['report_type'])} WHERE report_id = ? ORDER BY seq",
+            (report["id"],),
+        )
+        while True:
+            batch = cursor.fetchmany(_STREAM_BATCH)
+            if not batch:
+                return
+            for row in batch:
+                yield list(row)
+
+    def stream_csv(self, report: Dict[str, Any]) -> Iterator[str]:
+        """CSV text of a report (header first), produced incrementally."""
+        if report.get("segment"):
+            return self._stream_archived(report)
+        return render_csv(REPORT_COLUMNS[report["report_type"]], self.iter_rows(report))
+
+    def _stream_archived(self, report: Dict[str, Any]) -> Iterator[str]:
+        """Decompress one report's gzip member from its archive segment, chunk by chunk."""
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        with open(self.archive_dir / report["segment"], "rb") as f:
+            f.seek(report["segment_offset"])
+            remaining = report["segment_length"]
+            while remaining > 0:
+                chunk = f.read(min(_ARCHIVE_READ_CHUNK, remaining))
+                if not chunk:
+                    raise IOError(f"Archive segment {report['segment']} is truncated")
+                remaining -= len(chunk)
+                text = decoder.decode(decompressor.decompress(chunk))
+                if text:
+                    yield text
+        tail = decoder.decode(decompressor.flush(), final=True)
+        if tail:
+            yield tail
+
+    def addresses(self) -> List[str]:
+        return [r[0] for r in self._connect().execute("SELECT address FROM reports UNION SELECT address FROM archive")]
+
+    def created_since(self, since: float) -> List[float]:
+        return [r[0] for r in self._connect().execute(
+            "SELECT created_at FROM reports WHERE created_at >= ? "
+            "UNION ALL SELECT created_at FROM archive WHERE created_at >= ?", (since, since)
+        )]
+
+    def count_reports(self, since: Optional[float] = None) -> int:
+        """Live and archived reports (optionally only those created since a time)."""
+        since = float("-inf") if since is None else since
+        conn = self._connect()
+        return sum(
+            conn.execute(f"SELECT COUNT(*) FROM {table} WHERE created_at >= ?", (since,)).fetchone()[0]
+            for table in ("reports", "archive")
+        )
+
+    # ---------------- Legacy CSV import ----------------
+    def import_legacy_csv_dir(self, reports_dir: Path) -> int:
+        """One-time import of {type}_{address}_{timestamp}.csv files; returns the number imported."""
+        conn = self._connect()
+        if conn.execute("SELECT value FROM meta WHERE key = 'legacy_imported'").fetchone():
+            return 0
+        # One importer across uvicorn workers: the others wait here, then see the marker
+        with open(self.path.with_name(self.path.name + ".import.lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if conn.execute("SELECT value FROM meta WHERE key = 'legacy_imported'").fetchone():
+                return 0
+            imported = 0
+            if reports_dir.exists():
+                for file_path in sorted(reports_dir.glob("*.csv")):
+                    match = _LEGACY_FILE_RE.match(file_path.name)
+                    if not match:
+                        continue
+                    report_type, address, timestamp = match.groups()
+                    try:
+                        with open(file_path, "r", newline="", encoding="utf-8") as f:
+                            rows = list(csv.DictReader(f))
+                        created_at = datetime.strptime(timestamp, TIMESTAMP_FORMAT).timestamp()
+                        self.save_report(report_type, address, rows, created_at=created_at)
+                        imported += 1
+                    except Exception as e:
+                        print(f"Error importing report {file_path.name}: {e}")
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_imported', ?)", (imported,))
+        if imported:
+            print(f"Imported {imported} CSV reports from {reports_dir}")
+        return imported
+
+
+def render_csv(columns: List[str], rows) -> Iterator[str]:
+    """CSV text of rows (header first), yielded every _STREAM_BATCH rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for i, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if i % _STREAM_BATCH == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+_STORE: Optional[ReportStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_report_store() -> ReportStore:
+    """Process-wide report store; imports existing data/security_reports/*.csv once."""
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                store = ReportStore(get_report_store_file(), archive_dir=get_report_archive_dir())
+                store.import_legacy_csv_dir(Path(__file__).parent.parent.parent / "data" / "security_reports")
+                _STORE = store
+    return _STORE
@@ -0,0 +1,272 @@
+# backend/utils/report_writer.py
+
+"""
+Background writer for security reports.
+
+Analyzers hand finished report rows to ``report_writer.submit`` and return
+immediately; a worker thread persists them to the report store, so disk latency
+no longer counts against the scoring window. The queue is bounded: when it is
+full, ``submit`` waits up to ``put_timeout`` and then writes the report on the
+caller's thread (nothing is dropped), and both cases are counted as backpressure.
+``close`` stops intake and drains everything still queued; it runs at app
+shutdown and at interpreter exit.
+
+With ``REPORT_MODE=lazy`` nothing is written at scoring time: the latest rows
+of each (report type, address) are kept in a TTL-bounded in-memory cache as
+compact value tuples, and a report is only persisted when its CSV is first
+downloaded (``materialize``). The cache is per process, so lazy mode suits
+single-worker deployments or sticky routing.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.utils.report_store import (
+    REPORT_COLUMNS, TIMESTAMP_FORMAT, ReportStore, csv_cell, get_report_store, render_csv,
+)
+from backend.utils.singleflight import SingleFlight
+from backend.utils.stats_counters import TOTAL_REPORTS, get_stats_counters
+
+MODE_EAGER = "eager"
+MODE_LAZY = "lazy"
+
+_STOP = object()
+
+
+class PendingReportCache:
+    """Latest unwritten rows per (report type, address), LRU- and TTL-bounded."""
+
+    def __init__(self, max_entries: int = 2000, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (report_type, address) -> (created_at, rows as tuples in REPORT_COLUMNS order)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, List[tuple]]]" = OrderedDict()
+
+    def put(self, report_type: str, address: str, rows: List[Dict[str, Any]], created_at: float) -> None:
+        columns = REPORT_COLUMNS[report_type]
+        values = [tuple(csv_cell(row.get(c)) for c in columns) for row in rows]
+        key = (report_type, address.lower())
+        with self._lock:
+            self._entries[key] = (created_at, values)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, report_type: str, address: str) -> Optional[Tuple[float, List[tuple]]]:
+        with self._lock:
+            entry = self._entries.get((report_type, address.lower()))
+        if entry is None or time.time() - entry[0] > self.ttl:
+            return None
+        return entry
+
+    def discard(self, report_type: str, address: str, entry: Tuple[float, List[tuple]]) -> None:
+        """Drop the entry unless a newer one replaced it meanwhile."""
+        key = (report_type, address.lower())
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+    def pending(self, address: str) -> List[Dict[str, Any]]:
+        """Unexpired cached reports for an address, shaped like ReportStore.list_reports rows."""
+        address = address.lower()
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (created_at, _) in self._entries.items() if now - created_at > self.ttl]:
+                del self._entries[key]
+            entries = [(k[0], v) for k, v in self._entries.items() if k[1] == address]
+        reports = []
+        for report_type, (created_at, values) in entries:
+            reports.append({
+                "report_type": report_type,
+                "address": address,
+                "created_at": created_at,
+                "timestamp": datetime.fromtimestamp(created_at).strftime(TIMESTAMP_FORMAT),
+                "row_count": len(values),
+                "size": sum(len(c.encode("utf-8")) for c in render_csv(REPORT_COLUMNS[report_type], values)),
+            })
+        return reports
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ReportWriter:
+    """Bounded-queue, single-consumer writer in front of a ReportStore."""
+
+    def __init__(self, get_store: Callable[[], ReportStore] = get_report_store, maxsize: int = 1000,
+                 put_timeout: float = 0.1, mode: str = MODE_EAGER, cache: Optional[PendingReportCache] = None,
+                 on_submit: Optional[Callable[[str, str], None]] = None):
+        self._get_store = get_store
+        self._on_submit = on_submit
+        self.mode = mode
+        self.cache = cache or PendingReportCache()
+        self.maxsize = maxsize
+        self.put_timeout = put_timeout
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        # Held across the closed check and the enqueue (taken before _lock)
+        self._put_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._materializing = SingleFlight()
+        # Metrics
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self.blocked = 0  # submits that found the queue full
+        self.inline_writes = 0  # ... and wrote on the caller's thread after put_timeout
+        self.max_depth = 0
+        self.last_lag = 0.0  # seconds from submit to commit for the latest report
+
+    def start(self) -> None:
+        """Start the worker thread (idempotent)."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name="report-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, report_type: str, address: str, rows: List[Dict[str, Any]]) -> None:
+        """Queue a report for persistence (or cache it in lazy mode); only blocks (briefly) when the queue is full."""
+        item = (report_type, address, rows, time.time())
+        if self._on_submit is not None:
+            try:
+                self._on_submit(report_type, address)
+            except Exception as e:
+                print(f"Error recording {report_type} report: {e}")
+        if self.mode == MODE_LAZY:
+            self.cache.put(report_type, address, rows, item[3])
+            return
+        with self._lock:
+            self.submitted += 1
+        if not self._enqueue(item):
+            # Shutting down (no consumer left) or the queue stayed full; keep the report anyway
+            self._write(item, inline=True)
+            return
+        with self._lock:
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def _enqueue(self, item) -> bool:
+        """Queue an item unless closed; False means the caller writes it inline."""
+        deadline = time.monotonic() + self.put_timeout
+        # close() takes this lock too, so an accepted item is always queued ahead of _STOP
+        if not self._put_lock.acquire(timeout=self.put_timeout):
+            # Another submit holds it while waiting on a full queue
+            with self._lock:
+                self.blocked += 1
+            return False
+        try:
+            if self._closed:
+                return False
+            self.start()
+            try:
+                self._queue.put_nowait(item)
+                return True
+            except queue.Full:
+                with self._lock:
+                    self.blocked += 1
+            try:
+                self._queue.put(item, timeout=max(0.0, deadline - time.monotonic()))
+                return True
+            except queue.Full:
+                return False
+        finally:
+            self._put_lock.release()
+
+    def _write(self, item, inline: bool = False) -> bool:
+        report_type, address, rows, submitted_at = item
+        try:
+            self._get_store().save_report(report_type, address, rows, created_at=submitted_at)
+            with self._lock:
+                self.written += 1
+                if inline:
+                    self.inline_writes += 1
+                self.last_lag = time.time() - submitted_at
+            return True
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            print(f"Error writing {report_type} report for {address}: {e}")
+            return False
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._write(item)
+            finally:
+                self._queue.task_done()
+
+    def materialize(self, report_type: str, address: str) -> None:
+        """Persist the cached (not yet written) report of this type for an address, if any."""
+        # Concurrent first downloads wait for the one write instead of finding neither cache nor row
+        self._materializing.do((report_type, address.lower()), lambda: self._materialize(report_type, address))
+
+    def _materialize(self, report_type: str, address: str) -> None:
+        entry = self.cache.get(report_type, address)
+        if entry is None:
+            return
+        created_at, values = entry
+        columns = REPORT_COLUMNS[report_type]
+        if self._write((report_type, address, [dict(zip(columns, v)) for v in values], created_at), inline=True):
+            # Only dropped once committed, so /csv/list never misses it in between
+            self.cache.discard(report_type, address, entry)
+
+    def pending(self, address: str) -> List[Dict[str, Any]]:
+        """Cached reports for an address that will be written on first download."""
+        return self.cache.pending(address)
+
+    def flush(self) -> None:
+        """Block until every queued report has been written."""
+        self._queue.join()
+
+    def close(self, timeout: float = 30) -> None:
+        """Stop accepting queued work and drain what is already queued."""
+        with self._put_lock, self._lock:
+            self._closed = True
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout=timeout)
+        if thread.is_alive():
+            print(f"Report writer did not drain within {timeout}s ({self._queue.qsize()} reports left)")
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self.maxsize,
+                "max_depth": self.max_depth,
+                "submitted": self.submitted,
+                "written": self.written,
+                "failed": self.failed,
+                "blocked": self.blocked,
+                "inline_writes": self.inline_writes,
+                "last_lag_ms": round(self.last_lag * 1000, 1),
+                "mode": self.mode,
+                "cached_reports": len(self.cache),
+            }
+
+
+report_writer = ReportWriter(
+    maxsize=int(os.getenv("REPORT_QUEUE_SIZE", "1000")),
+    put_timeout=float(os.getenv("REPORT_QUEUE_PUT_TIMEOUT", "0.1")),
+    mode=os.getenv("REPORT_MODE", MODE_EAGER).lower(),
+    cache=PendingReportCache(
+        max_entries=int(os.getenv("REPORT_CACHE_SIZE", "2000")),
+        ttl=float(os.getenv("REPORT_CACHE_TTL", "3600")),
+    ),
+    # Reports count towards /stats when produced, whether written now or on first download
+    on_submit=lambda report_type, address: get_stats_counters().add_windowed(TOTAL_REPORTS),
+)
+atexit.register(report_writer.close)
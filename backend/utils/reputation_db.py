@@ -0,0 +1,256 @@
+# backend/utils/reputation_db.py
+
+"""
+Memory-mapped reputation database of known scam and known safe addresses.
+
+The file is a fixed header followed by fixed-size records sorted by address:
+
+    header  : magic (8 bytes) | record count (uint64 LE) | sha1 of the records (20 bytes)
+    record  : address (20 raw bytes) | category flags (uint32 LE)
+
+Lookups binary-search the mmap'd records, so every uvicorn worker shares the same
+page-cached copy and a lookup touches ~log2(N) records even with millions of entries.
+Build the file from CSV sources (columns: address, category[, label]) with:
+
+    python -m backend.utils.reputation_db build -o data/reputation.bin backend/contracts/reputation_seed.csv
+    python -m backend.utils.reputation_db lookup 0x4200000000000000000000000000000000000006
+"""
+
+import argparse
+import csv
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+# ---------------- Categories ----------------
+SCAM_TOKEN = 1 << 0
+SCAM_NFT = 1 << 1
+LEGIT_NFT = 1 << 2
+SAFE_PROTOCOL = 1 << 3
+
+CATEGORIES = {
+    "scam_token": SCAM_TOKEN,
+    "scam_nft": SCAM_NFT,
+    "legit_nft": LEGIT_NFT,
+    "safe_protocol": SAFE_PROTOCOL,
+}
+
+MAGIC = b"BBREPDB1"
+_HEADER = struct.Struct("<8sQ20s")
+_FLAGS = struct.Struct("<I")
+ADDRESS_SIZE = 20
+RECORD_SIZE = ADDRESS_SIZE + _FLAGS.size
+
+
+def get_reputation_db_file() -> Path:
+    """Get the path to the reputation database file"""
+    override = os.getenv("REPUTATION_DB_PATH")
+    if override:
+        return Path(override)
+    base_dir = Path(__file__).parent.parent.parent
+    return base_dir / "data" / "reputation.bin"
+
+
+def get_reputation_seed_file() -> Path:
+    """Seed list shipped with the repo (used when no database has been built yet)"""
+    return Path(__file__).parent.parent / "contracts" / "reputation_seed.csv"
+
+
+def address_bytes(address: str) -> Optional[bytes]:
+    """'0xAbC…' -> 20 raw bytes, or None if it is not a 20-byte hex address."""
+    if not isinstance(address, str):
+        return None
+    hex_part = address.strip().lower()
+    if hex_part.startswith("0x"):
+        hex_part = hex_part[2:]
+    if len(hex_part) != ADDRESS_SIZE * 2:
+        return None
+    try:
+        return bytes.fromhex(hex_part)
+    except ValueError:
+        return None
+
+
+# ---------------- Building ----------------
+def read_csv_records(path: Path) -> dict[bytes, int]:
+    """Parse a CSV source into {address bytes: flags}; bad rows are reported and skipped."""
+    records: dict[bytes, int] = {}
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            raw = address_bytes(row.get("address", ""))
+            flag = CATEGORIES.get((row.get("category") or "").strip().lower())
+            if raw is None or flag is None:
+                print(f"Skipping {path}:{line_no}: invalid address or category")
+                continue
+            records[raw] = records.get(raw, 0) | flag
+    return records
+
+
+def encode_records(records: dict[bytes, int]) -> bytes:
+    """Serialize {address bytes: flags} into the on-disk format."""
+    body = b"".join(raw + _FLAGS.pack(flags) for raw, flags in sorted(records.items()))
+    return _HEADER.pack(MAGIC, len(records), hashlib.sha1(body).digest()) + body
+
+
+def build_reputation_db(sources: Iterable[Path], out_path: Path) -> int:
+    """Merge CSV sources (flags are OR-ed per address) and write the file atomically. Returns the record count."""
+    records: dict[bytes, int] = {}
+    for source in sources:
+        for raw, flags in read_csv_records(Path(source)).items():
+            records[raw] = records.get(raw, 0) | flags
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(f"{out_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(encode_records(records))
+    # Readers that already mapped the old file keep their consistent snapshot
+    os.replace(tmp_path, out_path)
+    return len(records)
+
+
+# ---------------- Lookups ----------------
+class ReputationDB:
+    """Read-only view over an encoded reputation file (an mmap or an in-memory buffer)."""
+
+    def __init__(self, buffer):
+        magic, count, digest = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("not a reputation database")
+        if len(buffer) != _HEADER.size + count * RECORD_SIZE:
+            raise ValueError("reputation database is truncated")
+        self._buf = buffer
+        self.count = count
+        self.digest = digest.hex()
+
+    @classmethod
+    def open(cls, path: Path) -> "ReputationDB":
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def flags(self, address: str) -> int:
+        """Category flags for an address (0 when unknown or malformed)."""
+        raw = address_bytes(address)
+        if raw is None:
+            return 0
+        buf = self._buf
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = _HEADER.size + mid * RECORD_SIZE
+            key = buf[offset:offset + ADDRESS_SIZE]
+            if key < raw:
+                lo = mid + 1
+            elif key > raw:
+                hi = mid
+            else:
+                return _FLAGS.unpack_from(buf, offset + ADDRESS_SIZE)[0]
+        return 0
+
+    def has(self, address: str, category: int) -> bool:
+        return bool(self.flags(address) & category)
+
+    def is_scam_token(self, address: str) -> bool:
+        return self.has(address, SCAM_TOKEN)
+
+    def is_scam_nft(self, address: str) -> bool:
+        return self.has(address, SCAM_NFT)
+
+    def is_legit_nft(self, address: str) -> bool:
+        return self.has(address, LEGIT_NFT)
+
+    def is_safe_protocol(self, address: str) -> bool:
+        return self.has(address, SAFE_PROTOCOL)
+
+
+_DB: Optional[ReputationDB] = None
+_DB_LOCK = threading.Lock()
+# (st_ino, st_mtime_ns, st_size) of the mapped file; None when serving the seed list
+_DB_IDENTITY: Optional[tuple] = None
+_DB_CHECKED_AT = 0.0
+# Seconds between checks for a rebuilt file (a rebuild replaces it atomically)
+RELOAD_CHECK_INTERVAL = float(os.getenv("REPUTATION_DB_CHECK_INTERVAL", "5"))
+
+
+def _file_identity(path: Path) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _open_reputation_db(path: Path) -> None:
+    global _DB, _DB_IDENTITY
+    try:
+        if not path.exists():
+            build_reputation_db([get_reputation_seed_file()], path)
+        identity = _file_identity(path)
+        db = ReputationDB.open(path)
+        # Readers still holding the previous mapping keep using it until they drop it
+        _DB, _DB_IDENTITY = db, identity
+    except Exception as e:
+        print(f"[ERROR] Reputation database unavailable, using seed list: {e}")
+        if _DB is None:
+            _DB = ReputationDB(encode_records(read_csv_records(get_reputation_seed_file())))
+
+
+def get_reputation_db() -> ReputationDB:
+    """
+    Process-wide database, mapped from REPUTATION_DB_PATH.
+
+    If the file does not exist yet it is built from the shipped seed list; if it
+    cannot be opened the seed list is served from memory instead. A file rebuilt
+    by the CLI (new inode/mtime) is remapped within RELOAD_CHECK_INTERVAL seconds.
+    """
+    global _DB_CHECKED_AT
+    now = time.monotonic()
+    if _DB is not None and now - _DB_CHECKED_AT < RELOAD_CHECK_INTERVAL:
+        return _DB
+    with _DB_LOCK:
+        if _DB is None or now - _DB_CHECKED_AT >= RELOAD_CHECK_INTERVAL:
+            path = get_reputation_db_file()
+            identity = _file_identity(path)
+            if _DB is None or (identity is not None and identity != _DB_IDENTITY):
+                if _DB is not None:
+                    print(f"Reputation database {path} changed, remapping")
+                _open_reputation_db(path)
+            _DB_CHECKED_AT = now
+    return _DB
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build or query the BaseBadge reputation database")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build the database from CSV sources (address,category[,label])")
+    build.add_argument("sources", nargs="*", type=Path, help="CSV files (defaults to the shipped seed list)")
+    build.add_argument("-o", "--out", type=Path, default=None, help="Output file (defaults to REPUTATION_DB_PATH)")
+
+    lookup = sub.add_parser("lookup", help="Print the categories of one or more addresses")
+    lookup.add_argument("addresses", nargs="+")
+    lookup.add_argument("--db", type=Path, default=None, help="Database file (defaults to REPUTATION_DB_PATH)")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        out = args.out or get_reputation_db_file()
+        count = build_reputation_db(args.sources or [get_reputation_seed_file()], out)
+        print(f"Wrote {count} addresses to {out}")
+    else:
+        db = ReputationDB.open(args.db or get_reputation_db_file())
+        for address in args.addresses:
+            flags = db.flags(address)
+            names = [name for name, flag in CATEGORIES.items() if flags & flag]
+            print(f"{address}: {', '.join(names) or 'unknown'}")
+
+
+if __name__ == "__main__":
+    main()
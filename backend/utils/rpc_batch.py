@@ -0,0 +1,231 @@
+# backend/utils/rpc_batch.py
+
+"""
+JSON-RPC batch transport.
+
+``RpcBatcher`` sends several JSON-RPC requests as one HTTP POST carrying a JSON
+array (at most ``max_batch_size`` requests each) and fans the responses back
+out by id. Two ways in:
+
+- ``request_many(calls)``: an explicit batch from one caller (bulk score card
+  reads, Basename resolution for many addresses).
+- ``request(method, params)``: one call from any thread. A dispatcher thread
+  takes every call pending at that moment (optionally waiting ``window``
+  seconds for more) and sends them together, with up to ``max_in_flight``
+  batches on the wire. A lone caller is sent immediately, so coalescing only
+  happens under concurrency.
+
+``BatchingHTTPProvider`` routes a Web3 instance's ``eth_call`` requests through
+a batcher, so concurrent contract reads share round trips transparently.
+
+A lone call is sent as a plain JSON-RPC object. If an endpoint rejects an array
+(HTTP error or a single error object) its calls are resent one by one, and a
+provider call whose batch transport fails is retried on the normal HTTP path.
+"""
+
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import requests
+from web3 import HTTPProvider
+from web3._utils.encoding import Web3JsonEncoder
+
+DEFAULT_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+
+
+class RpcError(Exception):
+    """JSON-RPC error object returned for one request of a batch."""
+
+    def __init__(self, error: Dict[str, Any]):
+        self.code = error.get("code")
+        self.data = error.get("data")
+        super().__init__(error.get("message", str(error)))
+
+
+class RpcBatcher:
+    """Coalesces JSON-RPC requests into array POSTs over a shared requests.Session."""
+
+    def __init__(self, session: requests.Session, url: str, max_batch_size: int = 50, window: float = 0.0,
+                 max_in_flight: int = 4, timeout: float = 10, headers: Optional[Dict[str, str]] = None):
+        self.session = session
+        self.url = url
+        self.max_batch_size = max(1, max_batch_size)
+        self.window = window
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[str, Any, Future]] = []
+        self._max_in_flight = max_in_flight
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="rpc-batch")
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+        # Metrics
+        self.batches_sent = 0
+        self.requests_sent = 0
+        self.max_batch_seen = 0
+
+    # ---------------- Explicit batches ----------------
+    def request_many(self, calls: Sequence[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        """Raw JSON-RPC response objects for (method, params) pairs, in order."""
+        responses: List[Dict[str, Any]] = []
+        for start in range(0, len(calls), self.max_batch_size):
+            responses.extend(self._send(calls[start:start + self.max_batch_size]))
+        return responses
+
+    def _post(self, payload: Any) -> Any:
+        response = self.session.post(
+            self.url, data=json.dumps(payload, cls=Web3JsonEncoder), headers=self.headers, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _send_one(self, method: str, params: Any) -> Dict[str, Any]:
+        """One call as a plain JSON-RPC object (no array), for endpoints without batch support."""
+        data = self._post({"jsonrpc": "2.0", "id": 0, "method": method, "params": params or []})
+        with self._cond:
+            self.batches_sent += 1
+            self.requests_sent += 1
+            self.max_batch_seen = max(self.max_batch_seen, 1)
+        return data
+
+    def _send(self, calls: Sequence[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        if len(calls) == 1:
+            return [self._send_one(*calls[0])]
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params or []}
+            for i, (method, params) in enumerate(calls)
+        ]
+        try:
+            data = self._post(payload)
+        except requests.HTTPError as e:
+            # Some endpoints reject arrays with an HTTP error instead of a JSON error object
+            print(f"JSON-RPC batch of {len(calls)} rejected ({e}); sending the calls one by one")
+            return [self._send_one(method, params) for method, params in calls]
+        with self._cond:
+            self.batches_sent += 1
+            self.requests_sent += len(calls)
+            self.max_batch_seen = max(self.max_batch_seen, len(calls))
+        if not isinstance(data, list):
+            # Endpoint without batch support: it answers the array with a single error object
+            return [self._send_one(method, params) for method, params in calls]
+        by_id = {item.get("id"): item for item in data if isinstance(item, dict)}
+        return [
+            by_id.get(i) or {"jsonrpc": "2.0", "id": i, "error": {"code": -32603, "message": "Missing batch response"}}
+            for i in range(len(calls))
+        ]
+
+    # ---------------- Coalesced single calls ----------------
+    def request(self, method: str, params: Any) -> Dict[str, Any]:
+        """Raw JSON-RPC response object for one call, sent together with concurrent ones."""
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("RPC batcher is closed")
+            self._pending.append((method, params, future))
+            self._cond.notify()
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, name="rpc-batch-dispatch", daemon=True)
+                self._dispatcher.start()
+        try:
+            return future.result(timeout=self.timeout * 2 + self.window)
+        except FutureTimeoutError:
+            # Not sent yet: take it out of the queue so it is not sent for nobody
+            with self._cond:
+                self._pending = [item for item in self._pending if item[2] is not future]
+            future.cancel()
+            raise
+
+    def _dispatch(self) -> None:
+        while True:
+            # Wait for a free slot first so calls keep accumulating while every slot is busy
+            self._slots.acquire()
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._pending:
+                    self._slots.release()
+                    return
+                if self.window > 0:
+                    deadline = time.monotonic() + self.window
+                    while len(self._pending) < self.max_batch_size and not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+            self._executor.submit(self._deliver, batch)
+
+    def _deliver(self, batch: List[Tuple[str, Any, Future]]) -> None:
+        try:
+            responses = self._send([(method, params) for method, params, _ in batch])
+            for (_, _, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "batches_sent": self.batches_sent,
+                "requests_sent": self.requests_sent,
+                "max_batch_seen": self.max_batch_seen,
+                "pending": len(self._pending),
+            }
+
+    def close(self) -> None:
+        """Send what is pending and stop the dispatcher (at shutdown)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            dispatcher = self._dispatcher
+        if dispatcher is not None:
+            dispatcher.join(timeout=self.timeout)
+        self._executor.shutdown(wait=True)
+        # Usable again afterwards: the next request starts a new dispatcher
+        with self._cond:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_in_flight, thread_name_prefix="rpc-batch")
+            self._dispatcher = None
+            self._closed = False
+
+
+class BatchingHTTPProvider(HTTPProvider):
+    """HTTPProvider whose eth_call requests go through an RpcBatcher."""
+
+    def __init__(self, endpoint_uri: str, batcher: RpcBatcher, batched_methods: Sequence[str] = ("eth_call",),
+                 **kwargs: Any):
+        super().__init__(endpoint_uri, **kwargs)
+        self.batcher = batcher
+        self.batched_methods = frozenset(batched_methods)
+        self._ids = itertools.count()
+
+    def make_request(self, method, params):
+        if method not in self.batched_methods:
+            return super().make_request(method, params)
+        try:
+            response = dict(self.batcher.request(method, params))
+        except Exception as e:
+            # Batch transport failed (connection error, timeout): retry this call on the plain path
+            print(f"Batched {method} failed ({e}); retrying it as a single request")
+            return super().make_request(method, params)
+        # Batch-local ids mean nothing to web3; give each response an id of its own
+        response["id"] = next(self._ids)
+        return response
+
+
+def result_or_raise(response: Dict[str, Any]) -> Any:
+    """The result of a raw JSON-RPC response, raising RpcError for an error response."""
+    if "error" in response:
+        raise RpcError(response["error"])
+    return response.get("result")
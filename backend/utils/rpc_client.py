@@ -0,0 +1,142 @@
+# backend/utils/rpc_client.py
+
+"""
+Shared JSON-RPC client for on-chain reads (ScoreCheckerV2, Basename resolvers).
+
+One requests.Session with a sized, keep-alive connection pool and a single
+retry/timeout policy backs every Web3 instance; ``get_web3(url)`` returns one
+cached Web3 per RPC URL. Routes and wallet helpers therefore reuse warm TLS
+connections to the RPC instead of building a Session, adapter and provider
+(and paying a new handshake) on every call. Closed by the FastAPI lifespan.
+
+Batching is opt-in: with ``RPC_BATCH_MAX_SIZE`` > 1, each Web3's ``eth_call``
+requests go through a JSON-RPC batcher (backend/utils/rpc_batch.py) so
+concurrent reads share one POST, and ``get_rpc_batcher(url)`` bulk reads are
+sent as arrays. With the default of 1 every call is a plain single request.
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from web3 import Web3
+
+from backend.utils.rpc_batch import BatchingHTTPProvider, RpcBatcher
+
+DEFAULT_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "User-Agent": "BaseBadge/1.0 (+https://basebadge.app)",
+}
+
+# Retry policy the per-call sessions in routes.py used
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+
+class RpcClient:
+    """Pooled HTTP session plus one Web3 per RPC URL, shared by all threads."""
+
+    def __init__(self, pool_size: int = 32, timeout: float = 10, retries: int = 3, backoff_factor: float = 0.5,
+                 batch_max_size: int = 1, batch_window: float = 0.0):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.batch_max_size = batch_max_size
+        self.batch_window = batch_window
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._web3: Dict[str, Web3] = {}
+        self._batchers: Dict[str, RpcBatcher] = {}
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=4,
+                        pool_maxsize=self.pool_size,
+                        max_retries=Retry(
+                            total=self.retries,
+                            backoff_factor=self.backoff_factor,
+                            status_forcelist=RETRY_STATUSES,
+                            allowed_methods=["HEAD", "GET", "POST"],
+                        ),
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def web3(self, url: str) -> Web3:
+        """Web3 bound to the shared session for this RPC URL"""
+        w3 = self._web3.get(url)
+        if w3 is None:
+            session = self.session
+            with self._lock:
+                w3 = self._web3.get(url)
+                if w3 is None:
+                    provider_kwargs = dict(
+                        request_kwargs={"timeout": self.timeout, "headers": DEFAULT_HEADERS},
+                        session=session,
+                        # Retries are handled once, by the session adapter
+                        exception_retry_configuration=None,
+                        # Cache eth_chainId and other constant lookups web3 makes before calls
+                        cache_allowed_requests=True,
+                    )
+                    if self.batch_max_size > 1:
+                        provider = BatchingHTTPProvider(url, self._batcher(url), **provider_kwargs)
+                    else:
+                        provider = Web3.HTTPProvider(url, **provider_kwargs)
+                    w3 = Web3(provider)
+                    self._web3[url] = w3
+        return w3
+
+    def _batcher(self, url: str) -> RpcBatcher:
+        """Caller holds the lock."""
+        batcher = self._batchers.get(url)
+        if batcher is None:
+            batcher = RpcBatcher(
+                self.session, url, max_batch_size=self.batch_max_size, window=self.batch_window,
+                timeout=self.timeout, headers=DEFAULT_HEADERS,
+            )
+            self._batchers[url] = batcher
+        return batcher
+
+    def batcher(self, url: str) -> RpcBatcher:
+        """JSON-RPC batcher for an RPC URL (explicit request_many batches)"""
+        self.session
+        with self._lock:
+            return self._batcher(url)
+
+    def close(self) -> None:
+        """Close pooled connections (the session reopens them if used again)."""
+        with self._lock:
+            for batcher in self._batchers.values():
+                batcher.close()
+            if self._session is not None:
+                self._session.close()
+
+
+rpc_client = RpcClient(
+    pool_size=int(os.getenv("RPC_POOL_SIZE", "32")),
+    timeout=float(os.getenv("RPC_TIMEOUT", "10")),
+    retries=int(os.getenv("RPC_RETRIES", "3")),
+    batch_max_size=int(os.getenv("RPC_BATCH_MAX_SIZE", "1")),
+    batch_window=float(os.getenv("RPC_BATCH_WINDOW_MS", "0")) / 1000,
+)
+
+
+def get_web3(url: str) -> Web3:
+    """Shared Web3 for an RPC URL"""
+    return rpc_client.web3(url)
+
+
+def get_rpc_batcher(url: str) -> RpcBatcher:
+    """Shared JSON-RPC batcher for an RPC URL"""
+    return rpc_client.batcher(url)
@@ -0,0 +1,248 @@
+# backend/utils/score_card_cache.py
+
+"""
+Local cache of on-chain ScoreCheckerV2 reads (getScore + getScoreCard).
+
+A card only changes when its owner submits, and every submit emits
+``ScoreChecked`` or ``ScoreCardUpdated``. The event follower
+(backend/utils/score_events.py) feeds those events here and each one drops the
+user's entry, so the next read goes to the chain once and is cached again.
+Entries live in memory (LRU) in front of a SQLite table shared by the uvicorn
+workers.
+
+Every worker runs its own follower with its own cursor, because each has to
+drop the entries in its own memory; the shared ``meta.last_block`` (the furthest
+any worker got) is only where a new process starts following. The shared
+``invalidations`` table records the block of each user's latest event, and a
+loaded card is only stored if no event newer than the loading worker's cursor
+was seen, so a read that raced with a submit in any worker is never cached.
+
+Cached entries (complete reads only) are only served while this process's
+follower is in sync (its last poll reached the chain head less than
+``stale_after`` seconds ago); otherwise reads go straight to the RPC as before.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend.core.config import settings
+from backend.utils.rpc_client import get_web3
+from backend.utils.score_events import ScoreEventFollower
+
+ScoreAndCard = Tuple[Optional[Dict[str, int]], Optional[Dict[str, int]]]
+
+
+def get_score_card_cache_file() -> Path:
+    """Get the path to the on-chain score card cache"""
+    override = os.getenv("ONCHAIN_CACHE_PATH")
+    if override:
+        return Path(override)
+    base_dir = Path(__file__).parent.parent.parent
+    return base_dir / "data" / "onchain_cards.sqlite3"
+
+
+class ScoreCardCache:
+    """Event-invalidated cache of (score, card) per address; also a ScoreEventFollower sink."""
+
+    def __init__(self, path: Path, max_entries: int = 10000, stale_after: float = 30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.stale_after = stale_after
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, ScoreAndCard]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        # Last block this process's follower applied (None until it resumes)
+        self._cursor: Optional[int] = None
+        self._synced_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS cards (address TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS invalidations (address TEXT PRIMARY KEY, block INTEGER NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------------- Reads ----------------
+    @property
+    def in_sync(self) -> bool:
+        return time.monotonic() - self._synced_at < self.stale_after
+
+    def get(self, address: str) -> Optional[ScoreAndCard]:
+        key = address.lower()
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            version = self._versions.get(key, 0)
+        row = self._connect().execute("SELECT data FROM cards WHERE address = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        data = json.loads(row[0])
+        value = (data.get("score"), data.get("card"))
+        with self._lock:
+            # An event dropped the row after it was read; return it this once but do not keep it
+            if self._versions.get(key, 0) == version:
+                self._remember(key, value)
+        return value
+
+    def get_or_load(self, address: str, load: Callable[[], ScoreAndCard]) -> ScoreAndCard:
+        """Cached (score, card) while in sync; otherwise (or on a miss) load() from the chain."""
+        if not self.in_sync:
+            return load()
+        key = address.lower()
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        with self._lock:
+            version = self._versions.get(key, 0)
+            loaded_after = self._cursor
+        value = load()
+        if value[0] is None or value[1] is None or loaded_after is None:
+            # A call failed or reverted; do not pin the gap until the next event
+            return value
+        with self._lock:
+            # An event for this address arrived while loading; the value may predate it
+            if self._versions.get(key, 0) == version and self._store(key, value, loaded_after):
+                self._remember(key, value)
+        return value
+
+    # ---------------- Writes ----------------
+    def _remember(self, key: str, value: ScoreAndCard) -> None:
+        """Caller holds the lock."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _store(self, key: str, value: ScoreAndCard, loaded_after: int) -> bool:
+        """Write the row unless another worker saw an event for it past loaded_after."""
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "INSERT OR REPLACE INTO cards (address, data) SELECT ?, ? WHERE NOT EXISTS "
+                "(SELECT 1 FROM invalidations WHERE address = ? AND block > ?)",
+                (key, json.dumps({"score": value[0], "card": value[1]}), key, loaded_after),
+            )
+        return cursor.rowcount > 0
+
+    def invalidate(self, blocks: Dict[str, int]) -> None:
+        """Drop entries of {address: block of its latest event} here and in the shared table."""
+        keys = {a.lower(): b for a, b in blocks.items()}
+        if not keys:
+            return
+        with self._lock:
+            for key in keys:
+                self._memory.pop(key, None)
+                self._versions[key] = self._versions.get(key, 0) + 1
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO invalidations (address, block) VALUES (?, ?) "
+                "ON CONFLICT(address) DO UPDATE SET block = MAX(block, excluded.block)",
+                list(keys.items()),
+            )
+            conn.executemany("DELETE FROM cards WHERE address = ?", [(k,) for k in keys])
+
+    # ---------------- Event sink ----------------
+    def last_block(self) -> Optional[int]:
+        """This process's cursor; a new process resumes from the furthest shared one."""
+        if self._cursor is None:
+            row = self._connect().execute("SELECT value FROM meta WHERE key = 'last_block'").fetchone()
+            if row is not None:
+                # Memory is empty at this point and other workers kept the shared table current
+                self._cursor = int(row[0])
+        return self._cursor
+
+    def apply_events(self, events, through_block: int, caught_up: bool) -> None:
+        """Drop entries of users with new events and advance the cursor."""
+        self.invalidate({e.user: e.block_number for e in events})
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('last_block', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)",
+                (through_block,),
+            )
+        with self._lock:
+            self._cursor = through_block
+        if caught_up:
+            self._synced_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._memory)
+        return {
+            "entries_in_memory": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "in_sync": self.in_sync,
+            "last_block": self._cursor,
+        }
+
+
+_CACHE: Optional[ScoreCardCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_score_card_cache() -> ScoreCardCache:
+    """Process-wide on-chain score card cache"""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = ScoreCardCache(
+                    get_score_card_cache_file(),
+                    max_entries=int(os.getenv("ONCHAIN_CACHE_SIZE", "10000")),
+                    stale_after=float(os.getenv("ONCHAIN_CACHE_STALE_AFTER", "30")),
+                )
+    return _CACHE
+
+
+_FOLLOWER: Optional[ScoreEventFollower] = None
+
+
+def start_score_card_follower(contract_address: Optional[str] = None) -> None:
+    """
+    Follow ScoreChecker events into the cache unless ONCHAIN_EVENT_POLL_INTERVAL=0.
+
+    ``contract_address`` must be the contract the cached reads go to (defaults to settings).
+    """
+    global _FOLLOWER
+    contract_address = contract_address or settings.score_checker_v2_address
+    poll_interval = float(os.getenv("ONCHAIN_EVENT_POLL_INTERVAL", "4"))
+    if poll_interval <= 0 or not contract_address or not settings.base_rpc_url:
+        return
+    cache = get_score_card_cache()
+    with _CACHE_LOCK:
+        if _FOLLOWER is None:
+            _FOLLOWER = ScoreEventFollower(
+                lambda: get_web3(settings.base_rpc_url),
+                contract_address,
+                cache,
+                poll_interval=poll_interval,
+                max_range=int(os.getenv("ONCHAIN_LOG_MAX_RANGE", "2000")),
+            )
+    _FOLLOWER.start()
+
+
+def close_score_card_follower() -> None:
+    if _FOLLOWER is not None:
+        _FOLLOWER.close()
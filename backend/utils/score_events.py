@@ -0,0 +1,155 @@
+# backend/utils/score_events.py
+
+"""
+ScoreCheckerV2 event follower.
+
+Polls ``eth_getLogs`` for ``ScoreChecked`` and ``ScoreCardUpdated`` from the
+block after the last one processed and hands the decoded events to a sink:
+
+    sink.last_block() -> Optional[int]         # resume point (None: not started)
+    sink.apply_events(events, through_block, caught_up)
+
+Block ranges are at most ``max_range`` blocks; a range the RPC rejects (too
+many results, response too large, timeout) is halved until it passes, then the
+span grows back. ``backfill`` uses the same ranges to walk history.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Tuple
+
+from eth_utils import keccak
+from web3 import Web3
+
+SCORE_CHECKED_TOPIC = "0x" + keccak(text="ScoreChecked(address,uint256,uint256,uint256)").hex()
+SCORE_CARD_UPDATED_TOPIC = "0x" + keccak(text="ScoreCardUpdated(address,uint256,uint256,uint256)").hex()
+_EVENT_NAMES = {SCORE_CHECKED_TOPIC: "ScoreChecked", SCORE_CARD_UPDATED_TOPIC: "ScoreCardUpdated"}
+
+
+@dataclass
+class ScoreEvent:
+    name: str
+    user: str  # lowercased address
+    score: int
+    fee: int
+    timestamp: int
+    block_number: int
+    log_index: int
+
+
+def _hex(value) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    return value if value.startswith("0x") else "0x" + value
+
+
+def decode_score_event(log) -> Optional[ScoreEvent]:
+    """Decode a ScoreChecked/ScoreCardUpdated log (user is indexed; score, fee, timestamp in data)."""
+    topics = [_hex(t).lower() for t in log["topics"]]
+    name = _EVENT_NAMES.get(topics[0]) if topics else None
+    if name is None or len(topics) < 2:
+        return None
+    data = bytes.fromhex(_hex(log["data"])[2:])
+    if len(data) < 96:
+        return None
+    words = [int.from_bytes(data[i:i + 32], "big") for i in range(0, 96, 32)]
+    return ScoreEvent(
+        name=name,
+        user="0x" + topics[1][-40:],
+        score=words[0],
+        fee=words[1],
+        timestamp=words[2],
+        block_number=int(log["blockNumber"]),
+        log_index=int(log["logIndex"]),
+    )
+
+
+def iter_log_ranges(get_logs: Callable[[int, int], list], from_block: int, to_block: int,
+                    max_range: int = 2000) -> Iterator[Tuple[int, list]]:
+    """Yield (range end, logs) over [from_block, to_block], splitting ranges the RPC rejects."""
+    span = max_range
+    start = from_block
+    while start <= to_block:
+        end = min(start + span - 1, to_block)
+        try:
+            logs = get_logs(start, end)
+        except Exception as e:
+            if span == 1:
+                raise
+            span = max(1, span // 2)
+            print(f"eth_getLogs {start}-{end} failed ({e}); retrying with {span} blocks")
+            continue
+        yield end, logs
+        start = end + 1
+        span = min(max_range, span * 2)
+
+
+class ScoreEventFollower:
+    """Background poller feeding ScoreChecker events to a sink."""
+
+    def __init__(self, get_w3: Callable[[], Web3], contract_address: str, sink, poll_interval: float = 4.0,
+                 max_range: int = 2000, start_block: Optional[int] = None, confirmations: int = 0):
+        self._get_w3 = get_w3
+        self.contract_address = Web3.to_checksum_address(contract_address)
+        self.sink = sink
+        self.poll_interval = poll_interval
+        self.max_range = max_range
+        # Where to begin when the sink has no cursor; None starts at the chain head
+        self.start_block = start_block
+        self.confirmations = confirmations
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _get_logs(self, from_block: int, to_block: int) -> list:
+        return self._get_w3().eth.get_logs({
+            "address": self.contract_address,
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "topics": [[SCORE_CHECKED_TOPIC, SCORE_CARD_UPDATED_TOPIC]],
+        })
+
+    def poll_once(self) -> int:
+        """Process every new block up to the head; returns the number of events applied."""
+        head = self._get_w3().eth.block_number - self.confirmations
+        last = self.sink.last_block()
+        if last is None:
+            if self.start_block is None:
+                self.sink.apply_events([], head, True)
+                return 0
+            last = self.start_block - 1
+        applied = 0
+        for end, logs in iter_log_ranges(self._get_logs, last + 1, head, self.max_range):
+            events = [e for e in (decode_score_event(log) for log in logs) if e is not None]
+            events.sort(key=lambda e: (e.block_number, e.log_index))
+            self.sink.apply_events(events, end, end >= head)
+            applied += len(events)
+            if self._stop.is_set():
+                break
+        if last >= head:
+            # Nothing new, but the sink is still in sync as of now
+            self.sink.apply_events([], last, True)
+        return applied
+
+    # ---------------- Background ----------------
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="score-events", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"Error following ScoreChecker events: {e}")
+            self._stop.wait(max(0.0, self.poll_interval - (time.monotonic() - started)))
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
@@ -0,0 +1,128 @@
+# backend/utils/score_history.py
+
+"""
+Append-only score history log.
+
+Every score is one JSON line appended to ``data/score_history.jsonl``; nothing is
+ever rewritten, so the full history is kept. Each process holds an in-memory
+index of (offset, length) per address and reads only the lines it needs, so
+``recent(address, k)`` costs O(k) reads. Lines appended by other uvicorn workers
+are picked up by indexing the bytes past the last indexed offset before each
+lookup. A legacy ``score_history.json`` array is imported on first use.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def get_score_history_log_file() -> Path:
+    """Get the path to the score history log"""
+    override = os.getenv("SCORE_HISTORY_PATH")
+    if override:
+        return Path(override)
+    base_dir = Path(__file__).parent.parent.parent
+    return base_dir / "data" / "score_history.jsonl"
+
+
+class ScoreHistoryLog:
+    """JSONL score log with a per-address offset index (thread-safe, multi-process append-safe)."""
+
+    def __init__(self, path: Path, legacy_path: Optional[Path] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index: Dict[str, List[tuple[int, int]]] = {}
+        self._indexed_size = 0
+        if not self.path.exists() and legacy_path is not None and Path(legacy_path).exists():
+            self._import_legacy(Path(legacy_path))
+        # O_APPEND keeps concurrent single-write appends from different workers whole
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _import_legacy(self, legacy_path: Path) -> None:
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            try:
+                # link() fails if another worker created the log first, so appends are never clobbered
+                os.link(tmp_path, self.path)
+                print(f"Imported {len(entries)} score history entries from {legacy_path.name}")
+            except FileExistsError:
+                pass
+            finally:
+                os.unlink(tmp_path)
+        except Exception as e:
+            print(f"Error importing legacy score history: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def _catch_up(self) -> None:
+        """Index complete lines written (by any process) since the last call. Caller holds the lock."""
+        size = os.fstat(self._fd).st_size
+        if size <= self._indexed_size:
+            return
+        chunk = os.pread(self._fd, size - self._indexed_size, self._indexed_size)
+        # A line still being written has no newline yet; leave it for the next call
+        end = chunk.rfind(b"\n") + 1
+        start = 0
+        while start < end:
+            stop = chunk.index(b"\n", start) + 1
+            try:
+                address = json.loads(chunk[start:stop]).get("address", "")
+                if address:
+                    self._index.setdefault(address.lower(), []).append((self._indexed_size + start, stop - start))
+            except Exception:
+                print(f"Skipping malformed score history line at offset {self._indexed_size + start}")
+            start = stop
+        self._indexed_size += end
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Append one entry in O(1); it is indexed on the next lookup."""
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            os.write(self._fd, line)
+
+    def recent(self, address: str, limit: int = 30) -> List[Dict[str, Any]]:
+        """The last `limit` entries for an address, oldest first."""
+        if limit <= 0:
+            return []
+        with self._lock:
+            self._catch_up()
+            locations = self._index.get(address.lower(), [])[-limit:]
+            return [json.loads(os.pread(self._fd, length, offset)) for offset, length in locations]
+
+    def count(self, address: str) -> int:
+        with self._lock:
+            self._catch_up()
+            return len(self._index.get(address.lower(), []))
+
+    def addresses(self) -> List[str]:
+        """Lowercased addresses with at least one entry."""
+        with self._lock:
+            self._catch_up()
+            return list(self._index)
+
+
+_LOG: Optional[ScoreHistoryLog] = None
+_LOG_LOCK = threading.Lock()
+
+
+def get_score_history_log() -> ScoreHistoryLog:
+    """Process-wide score history log"""
+    global _LOG
+    if _LOG is None:
+        with _LOG_LOCK:
+            if _LOG is None:
+                path = get_score_history_log_file()
+                _LOG = ScoreHistoryLog(path, legacy_path=path.with_suffix(".json"))
+    return _LOG
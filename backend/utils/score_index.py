@@ -0,0 +1,274 @@
+# backend/utils/score_index.py
+
+"""
+Local index of ScoreCheckerV2 scores for leaderboard and rank queries.
+
+The index is a ScoreEventFollower sink (backend/utils/score_events.py): it
+backfills ``ScoreChecked``/``ScoreCardUpdated`` from ``ONCHAIN_INDEX_START_BLOCK``
+(block 0 unless the deploy block is configured) in bounded ``eth_getLogs``
+ranges, then tails new blocks. Each wallet keeps the score of its latest event.
+
+Rows live in SQLite (``scores`` plus the furthest processed block in ``meta``),
+shared by the uvicorn workers. Each process loads a consistent snapshot of both
+at start and then follows events from that block with its own cursor, so its
+in-memory view never misses events another worker already wrote. In memory, a
+Fenwick tree counts wallets per integer score, so rank and percentile are
+O(log n) prefix sums, and leaderboard pages walk the score buckets from the top.
+"""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from backend.core.config import settings
+from backend.utils.rpc_client import get_web3
+from backend.utils.score_events import ScoreEventFollower
+
+
+def get_score_index_file() -> Path:
+    """Get the path to the ScoreChecker leaderboard index"""
+    override = os.getenv("ONCHAIN_INDEX_PATH")
+    if override:
+        return Path(override)
+    base_dir = Path(__file__).parent.parent.parent
+    return base_dir / "data" / "score_index.sqlite3"
+
+
+class FenwickTree:
+    """Counts per bucket 0..size-1 with O(log n) point updates and prefix sums."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._tree = [0] * (size + 1)
+
+    def add(self, bucket: int, delta: int) -> None:
+        i = bucket + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix(self, bucket: int) -> int:
+        """Sum of buckets 0..bucket (0 for bucket < 0)."""
+        i = min(bucket, self.size - 1) + 1
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+
+class ScoreIndex:
+    """Latest on-chain score per wallet, with rank/percentile and leaderboard queries."""
+
+    def __init__(self, path: Path, max_score: int = 1000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Scores above max_score share the top bucket (ranked as ties)
+        self.max_score = max_score
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # address -> (score, timestamp, block_number, log_index)
+        self._entries: Dict[str, Tuple[int, int, int, int]] = {}
+        self._buckets: Dict[int, Set[str]] = {}
+        self._tree = FenwickTree(max_score + 1)
+        self._cursor: Optional[int] = None
+        self._caught_up = False
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                "address TEXT PRIMARY KEY, score INTEGER NOT NULL, timestamp INTEGER NOT NULL, "
+                "block_number INTEGER NOT NULL, log_index INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+        self._load_snapshot()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _load_snapshot(self) -> None:
+        """Rows and cursor from one read transaction, so the cursor covers exactly these rows."""
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'last_block'").fetchone()
+            rows = conn.execute("SELECT address, score, timestamp, block_number, log_index FROM scores").fetchall()
+        for address, score, timestamp, block_number, log_index in rows:
+            self._set(address, (score, timestamp, block_number, log_index))
+        self._cursor = int(row[0]) if row else None
+
+    def _bucket(self, score: int) -> int:
+        return max(0, min(int(score), self.max_score))
+
+    def _set(self, address: str, entry: Tuple[int, int, int, int]) -> None:
+        """Caller holds the lock (or is the constructor)."""
+        previous = self._entries.get(address)
+        if previous is not None:
+            if previous[2:] >= entry[2:]:
+                return
+            bucket = self._bucket(previous[0])
+            self._tree.add(bucket, -1)
+            self._buckets[bucket].discard(address)
+        self._entries[address] = entry
+        bucket = self._bucket(entry[0])
+        self._tree.add(bucket, 1)
+        self._buckets.setdefault(bucket, set()).add(address)
+
+    # ---------------- Event sink ----------------
+    def last_block(self) -> Optional[int]:
+        return self._cursor
+
+    def apply_events(self, events, through_block: int, caught_up: bool) -> None:
+        """Record each wallet's latest score and advance the cursor in one transaction."""
+        latest = {}
+        for event in events:
+            latest[event.user] = event  # events arrive in (block, log index) order
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO scores (address, score, timestamp, block_number, log_index) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(address) DO UPDATE SET score = excluded.score, timestamp = excluded.timestamp, "
+                "block_number = excluded.block_number, log_index = excluded.log_index "
+                "WHERE (excluded.block_number, excluded.log_index) > (scores.block_number, scores.log_index)",
+                [(e.user, e.score, e.timestamp, e.block_number, e.log_index) for e in latest.values()],
+            )
+            # Shared cursor: the furthest any worker got (where a new process starts)
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('last_block', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)",
+                (through_block,),
+            )
+        with self._lock:
+            for user, e in latest.items():
+                self._set(user, (e.score, e.timestamp, e.block_number, e.log_index))
+            self._cursor = through_block
+            self._caught_up = caught_up
+
+    # ---------------- Queries ----------------
+    def _rank_of(self, bucket: int) -> int:
+        """Caller holds the lock. 1 + wallets in higher buckets."""
+        return len(self._entries) - self._tree.prefix(bucket) + 1
+
+    def rank(self, address: str) -> Optional[Dict[str, Any]]:
+        """Rank (1 = best, ties share a rank) and percentile of an indexed wallet, else None."""
+        key = address.lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            total = len(self._entries)
+            bucket = self._bucket(entry[0])
+            below = self._tree.prefix(bucket - 1)
+            rank = self._rank_of(bucket)
+        return {
+            "address": key,
+            "score": entry[0],
+            "rank": rank,
+            "total": total,
+            # Share of indexed wallets with a lower score
+            "percentile": round(100.0 * below / total, 2),
+        }
+
+    def leaderboard(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """Best scores first; ties ordered by who reached the score first."""
+        entries: List[Dict[str, Any]] = []
+        with self._lock:
+            skip = offset
+            for bucket in range(self.max_score, -1, -1):
+                members = self._buckets.get(bucket)
+                if not members:
+                    continue
+                if skip >= len(members):
+                    skip -= len(members)
+                    continue
+                rank = self._rank_of(bucket)
+                ordered = sorted(members, key=lambda a: (self._entries[a][2], self._entries[a][3], a))
+                for address in ordered[skip:skip + limit - len(entries)]:
+                    score, timestamp, block_number, _ = self._entries[address]
+                    entries.append({
+                        "rank": rank,
+                        "address": address,
+                        "score": score,
+                        "timestamp": timestamp,
+                        "block_number": block_number,
+                    })
+                skip = 0
+                if len(entries) >= limit:
+                    break
+        return entries
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"total": len(self._entries), "last_block": self._cursor, "caught_up": self._caught_up}
+
+
+_INDEX: Optional[ScoreIndex] = None
+_INDEX_LOCK = threading.Lock()
+_FOLLOWER: Optional[ScoreEventFollower] = None
+
+
+def get_score_index() -> ScoreIndex:
+    """Process-wide ScoreChecker leaderboard index"""
+    global _INDEX
+    if _INDEX is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                _INDEX = ScoreIndex(
+                    get_score_index_file(),
+                    max_score=int(os.getenv("ONCHAIN_INDEX_MAX_SCORE", "1000")),
+                )
+    return _INDEX
+
+
+def get_score_indexer(contract_address: Optional[str] = None) -> ScoreEventFollower:
+    """Follower that backfills and tails ScoreChecker events into the index"""
+    global _FOLLOWER
+    index = get_score_index()
+    with _INDEX_LOCK:
+        if _FOLLOWER is None:
+            _FOLLOWER = ScoreEventFollower(
+                lambda: get_web3(settings.base_rpc_url),
+                contract_address or settings.score_checker_v2_address,
+                index,
+                poll_interval=float(os.getenv("ONCHAIN_INDEX_POLL_INTERVAL", "10")),
+                max_range=int(os.getenv("ONCHAIN_LOG_MAX_RANGE", "2000")),
+                start_block=int(os.getenv("ONCHAIN_INDEX_START_BLOCK", "0")),
+                confirmations=int(os.getenv("ONCHAIN_INDEX_CONFIRMATIONS", "3")),
+            )
+    return _FOLLOWER
+
+
+def start_score_indexer(contract_address: Optional[str] = None) -> None:
+    """Backfill and tail in the background unless ONCHAIN_INDEX_POLL_INTERVAL=0"""
+    if float(os.getenv("ONCHAIN_INDEX_POLL_INTERVAL", "10")) <= 0:
+        return
+    if not (contract_address or settings.score_checker_v2_address) or not settings.base_rpc_url:
+        return
+    get_score_indexer(contract_address).start()
+
+
+def close_score_indexer() -> None:
+    if _FOLLOWER is not None:
+        _FOLLOWER.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backfill the ScoreChecker leaderboard index up to the chain head")
+    parser.add_argument("--from-block", type=int, default=None,
+                        help="Start block when the index is empty (default: ONCHAIN_INDEX_START_BLOCK or 0)")
+    args = parser.parse_args()
+    indexer = get_score_indexer()
+    if args.from_block is not None:
+        indexer.start_block = args.from_block
+    applied = indexer.poll_once()
+    print(f"Indexed {applied} events; {get_score_index().stats()}")
@@ -0,0 +1,64 @@
+# backend/utils/singleflight.py
+
+"""
+In-flight request coalescing.
+
+Concurrent callers asking for the same key wait on a single execution of the
+work and all receive its result (or its exception). Nothing is cached once the
+call completes; the next caller after that starts a fresh execution.
+"""
+
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls with the same key (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
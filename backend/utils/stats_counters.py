@@ -0,0 +1,272 @@
+# backend/utils/stats_counters.py
+
+"""
+Platform-wide counters for /stats (badges earned, trust score average, reports).
+
+Distinct wallets are counted separately by backend/utils/distinct_counter.py.
+
+Updates are O(1) additions to in-process deltas under a lock. A background
+thread periodically adds the deltas to a shared SQLite table (one row per
+counter, ``value = value + delta``) and refreshes the totals written by the
+other uvicorn workers; it also flushes at shutdown. Reads return the last
+shared totals plus this process's unflushed deltas, so /stats never touches disk.
+
+Windowed counters (``add_windowed`` / ``window``) additionally keep a ring of
+1-minute buckets covering the last 24 hours (one row per bucket slot, reused
+when the ring wraps). The window sum is recomputed from the ring at each flush,
+so reading "events in the last 24h" is also a memory read.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+TOTAL_BADGES_EARNED = "total_badges_earned"
+TRUST_SCORE_SUM = "trust_score_sum"
+TRUST_SCORE_COUNT = "trust_score_count"
+TOTAL_REPORTS = "total_reports"
+
+# Ring of 1-minute buckets behind the 24h windowed counters
+BUCKET_SECONDS = 60
+WINDOW_BUCKETS = 24 * 60
+
+
+def get_stats_store_file() -> Path:
+    """Get the path to the shared stats counters database"""
+    override = os.getenv("STATS_STORE_PATH")
+    if override:
+        return Path(override)
+    base_dir = Path(__file__).parent.parent.parent
+    return base_dir / "data" / "stats.sqlite3"
+
+
+class StatsCounters:
+    """Additive counters shared across processes through SQLite, read from memory."""
+
+    def __init__(self, path: Path, flush_interval: float = 5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._totals: Dict[str, float] = {}
+        self._deltas: Dict[str, float] = {}
+        # Deltas taken by a flush that has not been reflected in _totals yet
+        self._inflight: Dict[str, float] = {}
+        # Windowed counters: local per-(name, minute) deltas and last shared window sums
+        self._bucket_deltas: Dict[Tuple[str, int], float] = {}
+        self._bucket_inflight: Dict[Tuple[str, int], float] = {}
+        self._windows: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value REAL NOT NULL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "name TEXT NOT NULL, slot INTEGER NOT NULL, minute INTEGER NOT NULL, value REAL NOT NULL, "
+                "PRIMARY KEY (name, slot))"
+            )
+        self._totals = self._read_totals()
+        self._windows = self._read_windows()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _read_totals(self) -> Dict[str, float]:
+        return dict(self._connect().execute("SELECT name, value FROM counters").fetchall())
+
+    def _read_windows(self) -> Dict[str, float]:
+        oldest = _minute(time.time()) - WINDOW_BUCKETS
+        return dict(self._connect().execute(
+            "SELECT name, SUM(value) FROM buckets WHERE minute > ? GROUP BY name", (oldest,)
+        ).fetchall())
+
+    def seed(self, values: Dict[str, float]) -> None:
+        """Set initial values for counters that do not exist yet in the shared store."""
+        conn = self._connect()
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO counters (name, value) VALUES (?, ?)", list(values.items()))
+        totals = self._read_totals()
+        with self._lock:
+            self._totals = totals
+
+    def seed_windowed(self, name: str, load_events: Callable[[], Tuple[float, Iterable[float]]]) -> None:
+        """Seed a windowed counter once: load_events() returns (total, event timestamps within the window)."""
+        if name in self._read_totals():
+            return
+        total, timestamps = load_events()
+        per_minute: Dict[int, float] = {}
+        for ts in timestamps:
+            per_minute[_minute(ts)] = per_minute.get(_minute(ts), 0) + 1
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO buckets (name, slot, minute, value) VALUES (?, ?, ?, ?)",
+                [(name, m % WINDOW_BUCKETS, m, v) for m, v in per_minute.items()],
+            )
+            conn.execute("INSERT OR IGNORE INTO counters (name, value) VALUES (?, ?)", (name, total))
+        totals, windows = self._read_totals(), self._read_windows()
+        with self._lock:
+            self._totals, self._windows = totals, windows
+
+    # ---------------- Updates / reads ----------------
+    def add(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._deltas[name] = self._deltas.get(name, 0) + amount
+        self.start()
+
+    def add_windowed(self, name: str, amount: float = 1, at: Optional[float] = None) -> None:
+        """Add to a counter and to its current 1-minute bucket."""
+        key = (name, _minute(time.time() if at is None else at))
+        with self._lock:
+            self._deltas[name] = self._deltas.get(name, 0) + amount
+            self._bucket_deltas[key] = self._bucket_deltas.get(key, 0) + amount
+        self.start()
+
+    def window(self, name: str) -> float:
+        """Sum of a windowed counter over the last 24 hours."""
+        oldest = _minute(time.time()) - WINDOW_BUCKETS
+        with self._lock:
+            local = sum(
+                v for (n, m), v in list(self._bucket_inflight.items()) + list(self._bucket_deltas.items())
+                if n == name and m > oldest
+            )
+            return self._windows.get(name, 0) + local
+
+    def get(self, name: str, default: float = 0) -> float:
+        with self._lock:
+            if name not in self._totals and name not in self._deltas and name not in self._inflight:
+                return default
+            return self._totals.get(name, 0) + self._inflight.get(name, 0) + self._deltas.get(name, 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            names = set(self._totals) | set(self._inflight) | set(self._deltas)
+            return {
+                n: self._totals.get(n, 0) + self._inflight.get(n, 0) + self._deltas.get(n, 0)
+                for n in names
+            }
+
+    # ---------------- Flushing ----------------
+    def flush(self) -> None:
+        """Add local deltas to the shared store and pick up other workers' updates."""
+        with self._flush_lock:
+            with self._lock:
+                self._inflight, self._deltas = self._deltas, {}
+                self._bucket_inflight, self._bucket_deltas = self._bucket_deltas, {}
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO counters (name, value) VALUES (?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                        list(self._inflight.items()),
+                    )
+                    # A slot holding an older minute is reused (the ring wrapped past it)
+                    conn.executemany(
+                        "INSERT INTO buckets (name, slot, minute, value) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(name, slot) DO UPDATE SET "
+                        "value = CASE WHEN minute = excluded.minute THEN value + excluded.value "
+                        "WHEN minute < excluded.minute THEN excluded.value ELSE value END, "
+                        "minute = MAX(minute, excluded.minute)",
+                        [(n, m % WINDOW_BUCKETS, m, v) for (n, m), v in self._bucket_inflight.items()],
+                    )
+                totals, windows = self._read_totals(), self._read_windows()
+                with self._lock:
+                    self._totals, self._windows = totals, windows
+                    self._inflight, self._bucket_inflight = {}, {}
+            except Exception as e:
+                print(f"Error flushing stats counters: {e}")
+                with self._lock:
+                    for name, amount in self._inflight.items():
+                        self._deltas[name] = self._deltas.get(name, 0) + amount
+                    for key, amount in self._bucket_inflight.items():
+                        self._bucket_deltas[key] = self._bucket_deltas.get(key, 0) + amount
+                    self._inflight, self._bucket_inflight = {}, {}
+
+    def start(self) -> None:
+        """Start the background flusher (idempotent)."""
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._stop.clear()
+                self._flusher = threading.Thread(target=self._run_flusher, name="stats-flush", daemon=True)
+                self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the flusher and commit the remaining deltas."""
+        self._stop.set()
+        flusher = self._flusher
+        if flusher is not None:
+            flusher.join(timeout=5)
+            self._flusher = None
+        self.flush()
+
+
+def _minute(ts: float) -> int:
+    return int(ts // BUCKET_SECONDS)
+
+
+def _stored_report_history() -> Tuple[float, Iterable[float]]:
+    """Report total and last-24h creation times from the report store (first run only)"""
+    from backend.utils.report_store import get_report_store
+    store = get_report_store()
+    return store.count_reports(), store.created_since(time.time() - WINDOW_BUCKETS * BUCKET_SECONDS)
+
+
+_COUNTERS: Optional[StatsCounters] = None
+_COUNTERS_LOCK = threading.Lock()
+
+
+def get_stats_counters() -> StatsCounters:
+    """Process-wide counters, seeded from data/persistent_stats.json the first time the store is created."""
+    global _COUNTERS
+    if _COUNTERS is None:
+        with _COUNTERS_LOCK:
+            if _COUNTERS is None:
+                counters = StatsCounters(
+                    get_stats_store_file(),
+                    flush_interval=float(os.getenv("STATS_FLUSH_INTERVAL", "5")),
+                )
+                legacy_path = Path(__file__).parent.parent.parent / "data" / "persistent_stats.json"
+                try:
+                    if legacy_path.exists():
+                        with open(legacy_path, "r", encoding="utf-8") as f:
+                            legacy = json.load(f)
+                        counters.seed({
+                            name: float(legacy[name])
+                            for name in (TOTAL_BADGES_EARNED,)
+                            if isinstance(legacy.get(name), (int, float))
+                        })
+                except Exception as e:
+                    print(f"Error seeding stats counters: {e}")
+                try:
+                    counters.seed_windowed(TOTAL_REPORTS, _stored_report_history)
+                except Exception as e:
+                    print(f"Error seeding report counters: {e}")
+                # Refresh other workers' totals even if this process never adds anything
+                counters.start()
+                _COUNTERS = counters
+    return _COUNTERS
+
+
+def close_stats_counters() -> None:
+    """Flush pending deltas (called at shutdown)."""
+    if _COUNTERS is not None:
+        _COUNTERS.close()
@@ -0,0 +1,159 @@
+# backend/utils/tx_frame.py
+
+"""
+Columnar view of a wallet's txlist.
+
+Raw Blockscout rows are parsed once into NumPy arrays (timestamp, gasUsed, value,
+interned from/to address ids, 4-byte selector, input length) so wallet metrics
+and analyzers run as vectorized reductions instead of per-row Python loops.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+
+
+def _int_or(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _float_or(value, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _selector(input_data) -> int:
+    """First 4 bytes of calldata as an int, 0 when there is no full selector."""
+    if not isinstance(input_data, str) or len(input_data) < 10:
+        return 0
+    try:
+        return int(input_data[2:10], 16)
+    except ValueError:
+        return 0
+
+
+def selector_id(signature: str) -> int:
+    """'0x095ea7b3' -> 0x095ea7b3"""
+    return int(signature[2:10], 16)
+
+
+class TxFrame:
+    """
+    Column arrays for a list of txlist rows, in the rows' original order.
+
+    Invalid or missing timestamps are stored as -1; invalid numeric fields as 0.
+    Addresses are lowercased and interned: ``addresses[i]`` is the address with id ``i``.
+    """
+
+    def __init__(self, rows: list):
+        self.rows = rows
+        self.addresses: list[str] = []
+        self._ids: dict[str, int] = {}
+        n = len(rows)
+
+        self.timestamp = np.fromiter((_int_or(r.get("timeStamp"), -1) for r in rows), dtype=np.int64, count=n)
+        self.gas_used = np.fromiter((_int_or(r.get("gasUsed"), 0) for r in rows), dtype=np.int64, count=n)
+        # wei values overflow int64; float64 keeps magnitude comparisons exact enough
+        self.value = np.fromiter((_float_or(r.get("value"), 0.0) for r in rows), dtype=np.float64, count=n)
+        self.from_id = np.fromiter((self._intern(r.get("from")) for r in rows), dtype=np.int32, count=n)
+        self.to_id = np.fromiter((self._intern(r.get("to")) for r in rows), dtype=np.int32, count=n)
+        self.selector = np.fromiter((_selector(r.get("input")) for r in rows), dtype=np.uint32, count=n)
+        self.input_len = np.fromiter((len(r.get("input", "0x") or "") for r in rows), dtype=np.int32, count=n)
+        # Has calldata, i.e. a contract interaction rather than a plain transfer
+        self.has_input = np.fromiter((r.get("input", "0x") != "0x" for r in rows), dtype=bool, count=n)
+
+    def _intern(self, address) -> int:
+        key = (address or "").lower().strip()
+        idx = self._ids.get(key)
+        if idx is None:
+            idx = len(self.addresses)
+            self._ids[key] = idx
+            self.addresses.append(key)
+        return idx
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def id_of(self, address: Optional[str]) -> int:
+        """Interned id of an address, or -1 if it never appears in the frame."""
+        return self._ids.get((address or "").lower().strip(), -1)
+
+    # ---------------- Metrics ----------------
+    def total_gas_used(self, address: str) -> int:
+        """Sum of gasUsed over transactions sent by `address`."""
+        mask = self.from_id == self.id_of(address)
+        return int(self.gas_used[mask].sum())
+
+    def first_timestamp(self) -> Optional[int]:
+        valid = self.timestamp[self.timestamp >= 0]
+        return int(valid.min()) if valid.size else None
+
+    def active_days(self, tz: timezone = timezone.utc) -> np.ndarray:
+        """Sorted unique day numbers (days since epoch in `tz`) with at least one transaction."""
+        valid = self.timestamp[self.timestamp >= 0]
+        offset = _utc_offset_seconds(tz)
+        return np.unique((valid + offset) // SECONDS_PER_DAY)
+
+    def streaks(self, tz: timezone = timezone.utc) -> dict:
+        """Current and longest run of consecutive active days."""
+        days = self.active_days(tz)
+        if days.size == 0:
+            return {"current_streak": 0, "max_streak": 0}
+        # A new run starts wherever the gap to the previous active day is not exactly one
+        starts = np.flatnonzero(np.diff(days) != 1) + 1
+        bounds = np.concatenate(([0], starts, [days.size]))
+        max_streak = int(np.diff(bounds).max())
+
+        today = (int(datetime.now(tz).timestamp()) + _utc_offset_seconds(tz)) // SECONDS_PER_DAY
+        current_streak = 0
+        if days[-1] == today:
+            current_streak = int(days.size - bounds[-2])
+        return {"current_streak": current_streak, "max_streak": max_streak}
+
+    # ---------------- Per-contract aggregates ----------------
+    def contract_aggregates(self, user_address: str, since: int = 0) -> dict[str, dict]:
+        """
+        One-pass group-by over rows[since:] keyed by recipient (`to`) address.
+
+        Returns aggregates for every address the user called with calldata (contract
+        interactions, excluding self-calls), computed over *all* rows sent to that address:
+        interaction_count, avg_gas, max_value (wei), latest_timestamp, avg_input_length.
+        """
+        to_id = self.to_id[since:]
+        if to_id.size == 0:
+            return {}
+        k = len(self.addresses)
+        count = np.bincount(to_id, minlength=k)
+        gas_sum = np.bincount(to_id, weights=self.gas_used[since:], minlength=k)
+        input_sum = np.bincount(to_id, weights=self.input_len[since:], minlength=k)
+        max_value = np.zeros(k, dtype=np.float64)
+        np.maximum.at(max_value, to_id, self.value[since:])
+        latest = np.full(k, -1, dtype=np.int64)
+        np.maximum.at(latest, to_id, self.timestamp[since:])
+
+        excluded = {self.id_of(""), self.id_of("0x"), self.id_of(user_address)}
+        called = np.unique(to_id[self.has_input[since:]])
+        return {
+            self.addresses[i]: {
+                "interaction_count": int(count[i]),
+                "avg_gas": float(gas_sum[i] / count[i]),
+                "max_value": float(max_value[i]),
+                "latest_timestamp": int(latest[i]),
+                "avg_input_length": float(input_sum[i] / count[i]),
+            }
+            for i in called.tolist()
+            if i not in excluded
+        }
+
+
+def _utc_offset_seconds(tz: timezone) -> int:
+    offset = datetime.now(tz).utcoffset()
+    return int(offset.total_seconds()) if offset else 0
@@ -0,0 +1,185 @@
+# backend/utils/tx_store.py
+
+"""
+Persistent, incremental store for upstream wallet datasets.
+
+Each address keeps its txlist, tokentx and tokennfttx rows in a local SQLite
+database (WAL mode, safe to share across uvicorn workers) together with the
+highest block number seen per dataset. Later scores only ask the upstream API
+for rows from ``last_block + 1`` and merge the delta into the stored history.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+KINDS = ("txlist", "tokentx", "tokennfttx")
+
+# Fields that change between fetches of the same row and must not affect identity
+_VOLATILE_FIELDS = ("confirmations",)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    address TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    row_key TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    tx_index INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (address, kind, row_key)
+);
+CREATE INDEX IF NOT EXISTS rows_by_block ON rows (address, kind, block_number, tx_index, log_index);
+CREATE TABLE IF NOT EXISTS sync_state (
+    address TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    last_block INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (address, kind)
+);
+"""
+
+
+def get_tx_store_file() -> Path:
+    """Get the path to the transaction store database"""
+    override = os.getenv("TX_STORE_PATH")
+    if override:
+        return Path(override)
+    base_dir = Path(__file__).parent.parent.parent
+    return base_dir / "data" / "tx_store.sqlite3"
+
+
+def _to_int(value, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def row_key(row: dict) -> str:
+    """Stable identity for an upstream row (tx hash plus a digest of its stable fields)."""
+    stable = {k: v for k, v in row.items() if k not in _VOLATILE_FIELDS}
+    digest = hashlib.sha1(json.dumps(stable, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return f"{row.get('hash', '')}:{digest}"
+
+
+def _sort_key(row: dict) -> tuple:
+    return (
+        _to_int(row.get("blockNumber")),
+        _to_int(row.get("transactionIndex")),
+        _to_int(row.get("logIndex")),
+    )
+
+
+class TransactionStore:
+    """SQLite-backed store of per-address upstream rows plus a high-water block per dataset."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, address: str, kind: str) -> tuple[list, Optional[int]]:
+        """Return (rows oldest first, last synced block or None if never synced)."""
+        conn = self._connect()
+        key = address.lower()
+        state = conn.execute(
+            "SELECT last_block FROM sync_state WHERE address = ? AND kind = ?", (key, kind)
+        ).fetchone()
+        if state is None:
+            return [], None
+        cursor = conn.execute(
+            "SELECT payload FROM rows WHERE address = ? AND kind = ? "
+            "ORDER BY block_number, tx_index, log_index",
+            (key, kind),
+        )
+        return [json.loads(payload) for (payload,) in cursor], int(state[0])
+
+    def merge(self, address: str, kind: str, rows: list, last_block: int) -> None:
+        """Insert new rows (duplicates are ignored) and advance the high-water block."""
+        conn = self._connect()
+        key = address.lower()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO rows (address, kind, row_key, block_number, tx_index, log_index, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (key, kind, row_key(r), *_sort_key(r), json.dumps(r, separators=(",", ":")))
+                    for r in rows
+                ],
+            )
+            conn.execute(
+                "INSERT INTO sync_state (address, kind, last_block, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(address, kind) DO UPDATE SET "
+                "last_block = MAX(last_block, excluded.last_block), updated_at = excluded.updated_at",
+                (key, kind, last_block, time.time()),
+            )
+
+    def sync(self, address: str, kind: str, fetch_since: Callable[[int], list]) -> list:
+        """
+        Return the full history for (address, kind), oldest first.
+
+        ``fetch_since(startblock)`` must return upstream rows from ``startblock`` onwards;
+        it is called with 0 on the first sync and with ``last_block`` afterwards. The
+        high-water block is re-requested because a capped upstream response may have
+        cut it short; rows already stored are dropped by ``row_key``.
+        """
+        stored, last_block = self.load(address, kind)
+        start = 0 if last_block is None else last_block
+        delta = fetch_since(start) or []
+        if not delta and last_block is not None:
+            return stored
+
+        seen = {row_key(r) for r in stored}
+        fresh = []
+        for r in delta:
+            k = row_key(r)
+            if k not in seen:
+                seen.add(k)
+                fresh.append(r)
+        if not fresh and last_block is not None:
+            return stored
+        fresh.sort(key=_sort_key)
+
+        new_last = max([_to_int(r.get("blockNumber")) for r in fresh], default=start - 1)
+        self.merge(address, kind, fresh, max(new_last, last_block if last_block is not None else -1))
+        if stored and fresh and _sort_key(fresh[0]) < _sort_key(stored[-1]):
+            # Rows completing the high-water block can sort before ones already stored
+            return sorted(stored + fresh, key=_sort_key)
+        return stored + fresh
+
+
+_STORE: Optional[TransactionStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_tx_store() -> Optional[TransactionStore]:
+    """Process-wide store, or None when disabled via TX_STORE_ENABLED=0 or unavailable."""
+    global _STORE
+    if os.getenv("TX_STORE_ENABLED", "1") == "0":
+        return None
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                try:
+                    _STORE = TransactionStore(get_tx_store_file())
+                except Exception as e:
+                    print(f"[ERROR] Transaction store unavailable: {e}")
+                    return None
+    return _STORE
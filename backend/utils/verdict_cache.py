@@ -0,0 +1,155 @@
+# backend/utils/verdict_cache.py
+
+"""
+Cross-wallet cache of token/NFT contract verdicts.
+
+The same airdrop-spam tokens and fake collections show up in thousands of
+wallets, so the contract-intrinsic part of their classification (name/symbol
+patterns, known-scam membership, symbol length) is computed once per contract
+and shared by every score. Per-wallet factors (transfer value, mint vs receive,
+token id, metadata) are layered on top by the analyzers.
+
+Entries are bounded with LRU eviction. When a path is configured the warm set is
+saved as JSON on shutdown and reloaded at start; a version fingerprint of the
+heuristics guards against reusing verdicts computed with different rules. The
+version may be a callable: it is then resolved on first use (the warm set is
+loaded at that point) and re-checked on every lookup, so a changed fingerprint
+drops the entries computed under the previous one.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+
+class VerdictCache:
+    """Bounded, thread-safe LRU of {kind:contract -> verdict dict} with hit/miss counters."""
+
+    def __init__(self, max_entries: int = 50000, path: Optional[Path] = None,
+                 version: Union[str, Callable[[], str]] = ""):
+        self.max_entries = max(1, max_entries)
+        self.path = Path(path) if path else None
+        self._version_source = version
+        # None until a callable version is first resolved
+        self.version: Optional[str] = version if isinstance(version, str) else None
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.path is not None and self.version is not None:
+            self.load()
+
+    def _check_version(self) -> None:
+        """Resolve a callable version; drop entries computed under a previous one."""
+        if isinstance(self._version_source, str):
+            return
+        current = self._version_source()
+        if current == self.version:
+            return
+        with self._lock:
+            if current == self.version:
+                return
+            first = self.version is None
+            self.version = current
+            self._entries.clear()
+        if first:
+            self.load()
+        else:
+            print("Verdict heuristics changed, dropping cached verdicts")
+
+    @staticmethod
+    def key(kind: str, contract_address: str) -> str:
+        return f"{kind}:{contract_address.lower()}"
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            verdict = self._entries.get(key)
+            if verdict is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return verdict
+
+    def put(self, key: str, verdict: dict) -> None:
+        with self._lock:
+            self._entries[key] = verdict
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, kind: str, contract_address: str, compute: Callable[[], dict]) -> dict:
+        """
+        Cached verdict for a contract, computing and storing it on a miss.
+
+        Verdicts are shared between callers and must be treated as read-only.
+        Rows without a contract address are never cached.
+        """
+        if not contract_address:
+            return compute()
+        self._check_version()
+        key = self.key(kind, contract_address)
+        verdict = self.get(key)
+        if verdict is None:
+            verdict = compute()
+            self.put(key, verdict)
+        return verdict
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hit_rate, 4),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # ---------------- Persistence ----------------
+    def load(self) -> None:
+        """Load a saved warm set (ignored if missing, unreadable or from other heuristics)."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("version") != self.version:
+                print("Verdict cache on disk was built with different heuristics, starting cold")
+                return
+            entries = saved.get("entries", [])
+            with self._lock:
+                # Saved oldest first; keep only the most recently used tail if the bound shrank
+                for key, verdict in entries[-self.max_entries:]:
+                    self._entries[key] = verdict
+        except Exception as e:
+            print(f"Error loading verdict cache: {e}")
+
+    def save(self) -> None:
+        """Write the current entries (LRU order) atomically; no-op without a path or before first use."""
+        if self.path is None or self.version is None:
+            return
+        try:
+            with self._lock:
+                entries = list(self._entries.items())
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.version, "entries": entries}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving verdict cache: {e}")
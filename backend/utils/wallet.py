@@ -2,19 +2,32 @@
 
 import requests
 import base64
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Optional
 from web3 import Web3
+from eth_abi import decode as abi_decode
 from eth_utils import keccak
 import time
 import json
-import csv
 import os
+import atexit
+import hashlib
 import re
-import asyncio
-import aiohttp
-from pathlib import Path
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from backend.utils.http_client import http_client
+from backend.utils.pattern_matcher import PatternMatcher
+from backend.utils.report_writer import report_writer
+from backend.utils.multicall import encode_call
+from backend.utils.rpc_batch import result_or_raise
+from backend.utils.rpc_client import get_rpc_batcher, get_web3
+from backend.utils.reputation_db import get_reputation_db
+from backend.utils.singleflight import SingleFlight
+from backend.utils.tx_frame import TxFrame, selector_id
+from backend.utils.tx_store import get_tx_store
+from backend.utils.verdict_cache import VerdictCache
 
 
 # ---------------- API CONFIGURATION ----------------
@@ -25,26 +38,16 @@ ALCHEMY_BASE = f"https://base-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
 # Etherscan API
 ETHERSCAN_API_KEY = os.getenv("ETHERSCAN_API_KEY", "")
 ETHERSCAN_BASE = "https://api.etherscan.io/api"
+ETHERSCAN_V2_BASE = "https://api.etherscan.io/v2/api"
 CHAIN_ID = 8453
 
+# Blockscout API
+BLOCKSCOUT_BASE = "https://base.blockscout.com/api"
+
 # Zerion API
 ZERION_BASE = "https://api.zerion.io/v1"
 ZERION_API_KEY = os.getenv("ZERION_API_KEY", "")
 
-# Create session for connection pooling
-session = requests.Session()
-session.headers.update({
-    'User-Agent': 'BaseBadge/1.0',
-    'Accept': 'application/json'
-})
-adapter = requests.adapters.HTTPAdapter(max_retries=requests.adapters.Retry(
-    total=3,
-    backoff_factor=0.5,
-    status_forcelist=[429, 500, 502, 503, 504],
-))
-session.mount('http://', adapter)
-session.mount('https://', adapter)
-
 ZERION_API_KEY_WITH_COLON = ZERION_API_KEY + ":"
 ENCODED_KEY = base64.b64encode((ZERION_API_KEY_WITH_COLON).encode()).decode() if ZERION_API_KEY else ""
 Z_HEADERS = {
@@ -55,19 +58,8 @@ Z_HEADERS = {
 # ---------------- Web3 Setup (configurable + headers) ----------------
 # Use an API-keyed provider if available (recommended for production). Fallback to public only in dev.
 BASE_MAINNET_RPC = os.getenv("BASE_MAINNET_RPC_URL", "https://mainnet.base.org")
-w3 = Web3(
-    Web3.HTTPProvider(
-        BASE_MAINNET_RPC,
-        request_kwargs={
-            "headers": {
-                "User-Agent": "BaseBadge/1.0 (+https://basebadge.app)",
-                "Accept": "application/json",
-            },
-            # Note: web3 uses requests internally; retries handled below at call-site
-            "timeout": 15,
-        },
-    )
-)
+# Shares the pooled RPC session (and retry/timeout policy) with the on-chain routes
+w3 = get_web3(BASE_MAINNET_RPC)
 
 # Basename/ENS Resolver Setup
 L2RESOLVER_ADDRESS = Web3.to_checksum_address("0xC6d566A56A1aFf6508b41f6c90ff131615583BCD")
@@ -151,74 +143,216 @@ def namehash(name: str) -> str:
 
 
 # ---------------- get all transactions----------------
+BLOCKSCOUT_PAGE_SIZE = 10000
+BLOCKSCOUT_MAX_CONCURRENCY = max(1, int(os.getenv("BLOCKSCOUT_MAX_CONCURRENCY", "4")))
+
+# Per-provider cap on concurrent upstream requests (shared by every caller in this process)
+_PROVIDER_LIMITS = {
+    "blockscout": threading.BoundedSemaphore(BLOCKSCOUT_MAX_CONCURRENCY),
+}
+
+def _fetch_txlist_page(address: str, startblock: int, page: int) -> Optional[list]:
+    """Fetch one txlist page from Blockscout. Returns [] past the end, None on failure."""
+    params = {
+        "module": "account",
+        "action": "txlist",
+        "address": address,
+        "startblock": startblock,
+        "endblock": 99999999,
+        "page": page,
+        "offset": BLOCKSCOUT_PAGE_SIZE,
+        "sort": "asc"
+    }
+    try:
+        with _PROVIDER_LIMITS["blockscout"]:
+            res = http_client.get_json(BLOCKSCOUT_BASE, params=params, timeout=10)
+        if not res.ok:
+            raise RuntimeError(f"HTTP {res.status}")
+        data = res.data or {}
+        if data.get('status') != "1":
+            return []
+        return data.get('result', [])
+    except Exception as e:
+        print(f"[ERROR] Blockscout tx fetch failed (page {page}): {e}")
+        return None
+
+def _fetch_pages(fetch_page, page_size: int, max_workers: int) -> list:
+    """
+    Walk a page-numbered listing. Page 1 is fetched alone; if it is full, the following
+    pages are fetched concurrently with a sliding window of `max_workers` requests and
+    reassembled in page order. Stops at the first short, empty or failed page so the
+    result is always an ordered prefix of the listing.
+    """
+    first = fetch_page(1)
+    if not first:
+        return []
+    rows = list(first)
+    if len(first) < page_size:
+        return rows
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {p: executor.submit(fetch_page, p) for p in range(2, 2 + max_workers)}
+        page = 2
+        while True:
+            result = in_flight.pop(page).result()
+            if not result:
+                break
+            rows.extend(result)
+            if len(result) < page_size:
+                break
+            in_flight[page + max_workers] = executor.submit(fetch_page, page + max_workers)
+            page += 1
+        for future in in_flight.values():
+            future.cancel()
+    return rows
+
+def fetch_transactions_since(address: str, startblock: int = 0) -> list:
+    """
+    Fetches transactions for the given address from `startblock` onwards on Base network
+    using Blockscout API, oldest first. Large histories are paged concurrently.
+    """
+    return _fetch_pages(
+        lambda page: _fetch_txlist_page(address, startblock, page),
+        BLOCKSCOUT_PAGE_SIZE,
+        max_workers=BLOCKSCOUT_MAX_CONCURRENCY,
+    )
+
+# Coalesces identical concurrent upstream fetches (e.g. two requests scoring the same wallet)
+_UPSTREAM_FLIGHT = SingleFlight()
+
+def _synced_history(address: str, kind: str, fetch_since) -> list:
+    """Full history for (address, kind), oldest first, fetching only the delta past the stored high-water block."""
+    return _UPSTREAM_FLIGHT.do((kind, address.lower()), lambda: _sync_history_once(address, kind, fetch_since))
+
+def _sync_history_once(address: str, kind: str, fetch_since) -> list:
+    store = get_tx_store()
+    if store is None:
+        return fetch_since(address, 0)
+    try:
+        return store.sync(address, kind, lambda start: fetch_since(address, start))
+    except Exception as e:
+        print(f"[ERROR] Transaction store sync failed for {kind}: {e}")
+        return fetch_since(address, 0)
+
 def get_all_transactions(address: str) -> list:
     """
     Returns a list of all transactions for the given address on Base network using Blockscout API.
     Each transaction is a dict and must have 'timeStamp' key.
+    Rows are served from the local transaction store; only new blocks are requested upstream.
     """
-    BLOCKSCOUT_BASE = "https://base.blockscout.com/api"
-    txs = []
-    page = 1
-    offset = 10000
-    while True:
-        params = {
-            "module": "account",
-            "action": "txlist",
-            "address": address,
-            "startblock": 0,
-            "endblock": 99999999,
-            "page": page,
-            "offset": offset,
-            "sort": "asc"
-        }
+    return _synced_history(address, "txlist", fetch_transactions_since)
+
+# ---------------- Get token transfers ----------------
+def _etherscan_rows(data: dict) -> Optional[list]:
+    """Rows from an Etherscan response, [] for an empty history, None for an API error."""
+    if data.get("status") == "1":
+        return data.get("result", [])
+    if str(data.get("message", "")).startswith("No transactions found"):
+        return []
+    return None
+
+def fetch_token_transfers_since(address: str, startblock: int = 0) -> list:
+    """
+    Fetches ERC-20 transfer rows (tokentx) for the given address from `startblock` onwards
+    using Etherscan v2 API, oldest first. Returns an empty list on any failure.
+    """
+    params = {
+        "chainid": CHAIN_ID,  # Specify Base network
+        "module": "account",
+        "action": "tokentx",  # Get token transactions
+        "address": address,
+        "startblock": startblock,
+        "endblock": 99999999,
+        "sort": "asc",
+        "tag": "latest",
+        "apikey": ETHERSCAN_API_KEY
+    }
+    try:
+        response = http_client.get_json(ETHERSCAN_V2_BASE, params=params, timeout=30)
+        if response.status != 200:
+            print(f"ERROR: API request failed with status code: {response.status}")
+            return []
+        data = response.data or {}
+        rows = _etherscan_rows(data)
+        if rows is None:
+            print(f"ERROR: API returned error: {data.get('message', 'Unknown error')}")
+            return []
+        return rows
+    except Exception as e:
+        print(f"[ERROR] Etherscan tokentx fetch failed: {e}")
+        return []
+
+def get_token_transfers(address: str) -> list:
+    """Returns all ERC-20 transfer rows (tokentx) for the given address, newest first."""
+    return list(reversed(_synced_history(address, "tokentx", fetch_token_transfers_since)))
+
+# ---------------- Get NFT transfers ----------------
+def fetch_nft_transfers_since(address: str, startblock: int = 0) -> list:
+    """
+    Fetches ERC-721 transfer rows (tokennfttx) for the given address from `startblock` onwards
+    using Etherscan v2 API, oldest first. Retries up to 3 times; returns an empty list on failure.
+    """
+    params = {
+        "chainid": CHAIN_ID,  # Specify Base network
+        "module": "account",
+        "action": "tokennfttx",  # Get NFT token transactions
+        "address": address,
+        "startblock": startblock,
+        "endblock": 99999999,
+        "sort": "asc",
+        "tag": "latest",
+        "apikey": ETHERSCAN_API_KEY
+    }
+    max_retries = 3
+    for attempt in range(max_retries):
         try:
-            res = session.get(BLOCKSCOUT_BASE, params=params, timeout=10)
-            res.raise_for_status()
-            data = res.json()
-            if data.get('status') != "1":
-                break
-            page_txs = data.get('result', [])
-            if not page_txs:
-                break
-            txs.extend(page_txs)
-            if len(page_txs) < offset:
-                break
-            page += 1
+            # Add rate limiting delay
+            if attempt > 0:
+                time.sleep(1)  # 1 second delay between retries
+            response = http_client.get_json(ETHERSCAN_V2_BASE, params=params, timeout=30)
+            if response.status != 200:
+                continue
+            rows = _etherscan_rows(response.data or {})
+            if rows is None:
+                continue
+            return rows
         except Exception as e:
-            print(f"[ERROR] Blockscout tx fetch failed: {e}")
-            break
-    return txs
+            print(f"[ERROR] Etherscan tokennfttx fetch failed (attempt {attempt + 1}): {e}")
+            continue
+    return []
+
+def get_nft_transfers(address: str) -> list:
+    """Returns all ERC-721 transfer rows (tokennfttx) for the given address, newest first."""
+    return list(reversed(_synced_history(address, "tokennfttx", fetch_nft_transfers_since)))
+
+def _tx_frame(address: str, ctx: Optional["WalletContext"]) -> TxFrame:
+    """Columnar txlist from the request context, or built from a fresh fetch."""
+    if ctx is not None:
+        return ctx.frame
+    return TxFrame(get_all_transactions(address))
 
 # ---------------- Get total transaction count ----------------
-def get_total_tx_count(address: str) -> int:
+def get_total_tx_count(address: str, ctx: Optional["WalletContext"] = None) -> int:
+    if ctx is not None:
+        return len(ctx.transactions)
     return len(get_all_transactions(address))
 
 # ---------------- Get total gas used ----------------
-def get_total_gas_used(address: str) -> int:
+def get_total_gas_used(address: str, ctx: Optional["WalletContext"] = None) -> int:
     """
     Returns the total gas paid (gasUsed * gasPrice) for all transactions of the given address on Base network using Blockscout API.
     """
-    txs = get_all_transactions(address)
-    total_gas_paid = 0
-    for tx in txs:
-        try:
-            # Only transactions that are from this address
-            if tx.get('from', '').lower() == address.lower():
-                gas_used = int(tx.get('gasUsed', '0'))
-                #gas_price = int(tx.get('gasPrice', '0'))
-                total_gas_paid += gas_used # * gas_price
-        except Exception:
-            continue
-    return total_gas_paid
+    # Only transactions that are from this address (gasUsed only; gasPrice is not applied)
+    return _tx_frame(address, ctx).total_gas_used(address)
 
 # ---------------- Get current balance ----------------
 def get_current_balance(address: str) -> dict:
     """Get current wallet balance"""
     url = f"{ZERION_BASE}/wallets/{address}/portfolio"
     try:
-        res = session.get(url, headers=Z_HEADERS, timeout=10)
-        res.raise_for_status()
-        data = res.json()
+        res = http_client.get_json(url, headers=Z_HEADERS, timeout=10)
+        if not res.ok:
+            raise RuntimeError(f"HTTP {res.status}")
+        data = res.data
         base_value = data['data']['attributes']['positions_distribution_by_chain']['base']
         return {"base_usd": base_value}
     except Exception as e:
@@ -236,9 +370,10 @@ def get_past_balance(address: str) -> dict:
         "filter[chain_ids]": "base"
     }
     try:
-        res = session.get(url, headers=Z_HEADERS, params=params, timeout=10)
-        res.raise_for_status()
-        data = res.json()
+        res = http_client.get_json(url, headers=Z_HEADERS, params=params, timeout=10)
+        if not res.ok:
+            raise RuntimeError(f"HTTP {res.status}")
+        data = res.data
         points = data["data"]["attributes"]["points"]
         values = [v for (_, v) in points if v]
         if not values:
@@ -250,45 +385,17 @@ def get_past_balance(address: str) -> dict:
         return {"base_usd": 0.0}
 
 # ---------------- Get wallet streaks ----------------
-def get_wallet_streaks(address: str, tz: timezone = timezone.utc) -> dict:
+def get_wallet_streaks(address: str, tz: timezone = timezone.utc, ctx: Optional["WalletContext"] = None) -> dict:
     """Get wallet activity streaks"""
-    txs = get_all_transactions(address)
-    if not txs:
-        return {"current_streak": 0, "max_streak": 0}
-    days = set()
-    for tx in txs:
-        try:
-            dt = datetime.fromtimestamp(int(tx['timeStamp']), tz)
-            days.add(dt.date())
-        except Exception:
-            continue
-    if not days:
-        return {"current_streak": 0, "max_streak": 0}
-    days = sorted(days)
-    max_streak = 1
-    streak = 1
-    for i in range(1, len(days)):
-        if (days[i] - days[i-1]).days == 1:
-            streak += 1
-        else:
-            streak = 1
-        if streak > max_streak:
-            max_streak = streak
-    today = datetime.now(tz).date()
-    streak = 0
-    while (today - timedelta(days=streak)) in days:
-        streak += 1
-    current_streak = streak
-    return {"current_streak": current_streak, "max_streak": max_streak}
+    return _tx_frame(address, ctx).streaks(tz)
 
 # ---------------- Get wallet age ----------------
-def get_wallet_age(address: str, tz: timezone = timezone.utc) -> int:
+def get_wallet_age(address: str, tz: timezone = timezone.utc, ctx: Optional["WalletContext"] = None) -> int:
     """
     Returns the wallet age in days (difference between first transaction and today, in the given timezone).
     """
-    txs = get_all_transactions(address)
-    if txs:
-        first_tx_time = min(int(tx['timeStamp']) for tx in txs)
+    first_tx_time = _tx_frame(address, ctx).first_timestamp()
+    if first_tx_time is not None:
         first_tx_date = datetime.fromtimestamp(first_tx_time, tz).date()
         today = datetime.now(tz).date()
         return (today - first_tx_date).days
@@ -330,6 +437,48 @@ def resolve_address_to_basename(address: str) -> str:
         print(f"Error resolving reverse for {address}: {e}")
         return None
 
+# ---------------- Resolve many addresses to basenames ----------------
+def resolve_addresses_to_basenames(addresses: list) -> dict:
+    """Reverse-resolve many addresses with two JSON-RPC batches (node, then name); uncached ones only."""
+    results: dict = {}
+    pending = []
+    for address in addresses:
+        cached = _cache_get(_ADDRESS_NAME_CACHE, address.lower())
+        if cached is not None:
+            results[address] = cached
+        else:
+            pending.append(address)
+    if not pending:
+        return results
+    try:
+        batcher = get_rpc_batcher(BASE_MAINNET_RPC)
+        node_responses = batcher.request_many([
+            ("eth_call", [{"to": REVERSEREGISTRAR_ADDRESS, "data": "0x" + encode_call(
+                "node(address)", ["address"], [Web3.to_checksum_address(a)]).hex()}, "latest"])
+            for a in pending
+        ])
+        nodes = [bytes.fromhex(result_or_raise(r)[2:])[:32] for r in node_responses]
+        name_responses = batcher.request_many([
+            ("eth_call", [{"to": L2RESOLVER_ADDRESS, "data": "0x" + encode_call(
+                "name(bytes32)", ["bytes32"], [node]).hex()}, "latest"])
+            for node in nodes
+        ])
+        for address, response in zip(pending, name_responses):
+            try:
+                raw = result_or_raise(response)
+                name = abi_decode(["string"], bytes.fromhex(raw[2:]))[0] if raw and raw != "0x" else ""
+            except Exception as e:
+                print(f"Error resolving reverse for {address}: {e}")
+                results[address] = None
+                continue
+            results[address] = name if name else None
+            _cache_set(_ADDRESS_NAME_CACHE, address.lower(), results[address])
+    except Exception as e:
+        print(f"Error batch resolving basenames: {e}")
+        for address in pending:
+            results.setdefault(address, None)
+    return results
+
 # ---------------- Resolve basename avatar text record ----------------
 def resolve_basename_avatar(basename: str) -> Optional[str]:
     """Return the avatar text record for a Basename if set, else None."""
@@ -368,14 +517,95 @@ def resolve_input_basename_address(user_input: str) -> dict:
             "Address": None
         }
 
+# ---------------- Per-request wallet context ----------------
+class WalletContext:
+    """
+    Per-request view of one wallet: the resolved identity plus the upstream datasets
+    (Blockscout txlist, Etherscan tokentx and tokennfttx).
+
+    Each dataset is fetched on first access and then shared by every metric and
+    security analyzer, so a single score fetches each dataset exactly once.
+    Access is thread-safe; concurrent readers of the same dataset wait on one fetch.
+    """
+
+    _FETCHERS = {
+        "transactions": get_all_transactions,
+        "token_transfers": get_token_transfers,
+        "nft_transfers": get_nft_transfers,
+    }
+
+    def __init__(self, identifier: str, address: Optional[str], basename: Optional[str]):
+        self.identifier = identifier
+        self.address = address
+        self.basename = basename
+        self._data: dict[str, list] = {}
+        self._locks = {name: threading.Lock() for name in self._FETCHERS}
+        self._frame: Optional[TxFrame] = None
+        self._frame_lock = threading.Lock()
+
+    @property
+    def is_valid(self) -> bool:
+        return bool(self.address) and self.address != "0x0000000000000000000000000000000000000000"
+
+    def _load(self, name: str) -> list:
+        if name in self._data:
+            return self._data[name]
+        with self._locks[name]:
+            if name not in self._data:
+                if not self.is_valid:
+                    self._data[name] = []
+                else:
+                    self._data[name] = self._FETCHERS[name](self.address) or []
+            return self._data[name]
+
+    @property
+    def transactions(self) -> list:
+        """Normal transactions (Blockscout txlist), oldest first."""
+        return self._load("transactions")
+
+    @property
+    def token_transfers(self) -> list:
+        """ERC-20 transfers (Etherscan tokentx), newest first."""
+        return self._load("token_transfers")
+
+    @property
+    def nft_transfers(self) -> list:
+        """ERC-721 transfers (Etherscan tokennfttx), newest first."""
+        return self._load("nft_transfers")
+
+    @property
+    def frame(self) -> TxFrame:
+        """Columnar view of `transactions`, built once on first use."""
+        if self._frame is None:
+            with self._frame_lock:
+                if self._frame is None:
+                    self._frame = TxFrame(self.transactions)
+        return self._frame
+
+    def prefetch(self) -> None:
+        """Start fetching every dataset in the background without waiting for them."""
+        if not self.is_valid:
+            return
+        executor = ThreadPoolExecutor(max_workers=len(self._FETCHERS))
+        for name in self._FETCHERS:
+            executor.submit(self._load, name)
+        executor.shutdown(wait=False)
+
+
+def build_wallet_context(identifier: str) -> WalletContext:
+    """Resolve an address or Basename once and wrap it in a WalletContext."""
+    resolved = resolve_input_basename_address(identifier)
+    return WalletContext(identifier, resolved.get("Address"), resolved.get("Basename"))
+
 # ---------------- Get wallet data ----------------
-def get_wallet_data(identifier: str) -> dict:
+def get_wallet_data(identifier: str, ctx: Optional[WalletContext] = None) -> dict:
     """Get comprehensive wallet data"""
     try:
-        resolved = resolve_input_basename_address(identifier)
-        basename = resolved.get("Basename")
-        address = resolved.get("Address")
-        if not address or address in (None, "", "0x0000000000000000000000000000000000000000"):
+        if ctx is None:
+            ctx = build_wallet_context(identifier)
+        basename = ctx.basename
+        address = ctx.address
+        if not ctx.is_valid:
             return {
                 "Basename": basename,
                 "Address": address,
@@ -388,13 +618,12 @@ def get_wallet_data(identifier: str) -> dict:
                 "max_streak": 0,
                 "error": "Could not resolve a valid address from input."
             }
-        age_days = get_wallet_age(address)
-        txs = get_all_transactions(address)
-        tx_count = len(txs)
-        total_gas_used = get_total_gas_used(address)
+        age_days = get_wallet_age(address, ctx=ctx)
+        tx_count = get_total_tx_count(address, ctx=ctx)
+        total_gas_used = get_total_gas_used(address, ctx=ctx)
         current_balance = get_current_balance(address)
         past_balance = get_past_balance(address)
-        streaks = get_wallet_streaks(address)
+        streaks = get_wallet_streaks(address, ctx=ctx)
 
         return {
             "Basename": basename,
@@ -424,13 +653,177 @@ def get_wallet_data(identifier: str) -> dict:
 
 # ---------------- Security Functions ----------------
 
+# ---------------- Token/NFT name heuristics ----------------
+# Pattern lists are matched case-insensitively against token/NFT names and symbols.
+# Each category reports its first listed pattern that matches, so list order matters.
+TOKEN_RISK_PATTERNS = {
+    # High risk patterns (scam indicators)
+    "high": [
+        "honeypot", "scam", "fake", "rug", "suspicious"
+    ],
+    # Medium risk patterns (meme coins - user might be aware)
+    "medium": [
+        "moon", "inu", "elon", "doge", "shib", "pepe",
+        "meme", "rocket", "safe", "baby", "mini"
+    ],
+    # New patterns for better detection
+    "new": [
+        "claim", "airdrop", "reward", "swap", "visit",
+        "free", "gift", "bonus", "earn", "profit"
+    ],
+}
+
+NFT_RISK_PATTERNS = {
+    # High risk patterns (scam indicators)
+    "high": [
+        "honeypot", "scam", "fake", "rug", "suspicious", "phishing",
+        "malware", "virus", "trojan", "stealer", "drainer", "drain",
+        "fake_", "clone_", "copy_", "replica_", "fake_", "scam_"
+    ],
+    # Medium risk patterns (suspicious but not necessarily malicious)
+    "medium": [
+        "claim", "airdrop", "reward", "free", "gift", "bonus",
+        "earn", "profit", "mint", "mintable", "mintpass",
+        "whitelist", "presale", "private", "exclusive",
+        "free_mint", "airdrop_nft", "claim_reward", "free_gift"
+    ],
+    # Low risk patterns (potentially suspicious) - REMOVED GENERAL PATTERNS
+    "low": [
+        "limited", "rare", "unique", "special", "vip",
+        "golden", "premium", "elite", "legendary", "mythic"
+    ],
+    # Enhanced fake collection detection
+    "fake_collection": [
+        "bored ape", "cryptopunk", "azuki", "doodles", "moonbird",
+        "clone x", "pudgy penguin", "mutant ape", "bayc", "mayc",
+        "bored ape yacht club", "cryptopunks", "azuki elementals"
+    ],
+}
+
+# Compiled once at import; scanning cost does not grow with the number of patterns
+TOKEN_PATTERN_MATCHER = PatternMatcher(TOKEN_RISK_PATTERNS)
+NFT_PATTERN_MATCHER = PatternMatcher(NFT_RISK_PATTERNS)
+NFT_METADATA_MATCHER = PatternMatcher({"high": NFT_RISK_PATTERNS["high"]})
+
+# ---------------- Contract verdict cache ----------------
+# Bump when the scores/reasons below change so persisted verdicts are discarded
+VERDICT_RULES_VERSION = 1
+
+_FINGERPRINTS: dict = {}
+
+def _verdict_fingerprint() -> str:
+    # The reputation digest changes whenever the known-scam lists are rebuilt
+    digest = get_reputation_db().digest
+    fingerprint = _FINGERPRINTS.get(digest)
+    if fingerprint is None:
+        rules = [VERDICT_RULES_VERSION, TOKEN_RISK_PATTERNS, NFT_RISK_PATTERNS, digest]
+        fingerprint = hashlib.sha1(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()
+        _FINGERPRINTS.clear()
+        _FINGERPRINTS[digest] = fingerprint
+    return fingerprint
+
+# Fingerprint resolved on first use, so importing this module does not open or build the reputation file
+VERDICT_CACHE = VerdictCache(
+    max_entries=int(os.getenv("VERDICT_CACHE_SIZE", "50000")),
+    path=os.getenv("VERDICT_CACHE_PATH") or None,
+    version=_verdict_fingerprint,
+)
+atexit.register(VERDICT_CACHE.save)
+
+def _token_verdict(token_address: str, token_name: str, token_symbol: str) -> dict:
+    """Contract-intrinsic token risk (known scam list, name/symbol patterns, symbol length)."""
+    token_risk_score = 0
+    risk_reasons = []
+    risk_level = None  # Only set when an intrinsic check decides it
+    
+    # 1. Check if token is in known scam list (HIGH RISK)
+    if get_reputation_db().is_scam_token(token_address):
+        token_risk_score += 40
+        risk_reasons.append("Known scam token")
+        risk_level = "high"
+    
+    # Single automaton pass over name and symbol for every pattern category
+    matches = TOKEN_PATTERN_MATCHER.scan(token_name, token_symbol)
+    
+    # 2. Check for high risk patterns (scam indicators)
+    if "high" in matches:
+        token_risk_score += 30
+        risk_reasons.append(f"Contains high-risk pattern: '{matches['high']}'")
+        risk_level = "high"
+    
+    # 3. Check for medium risk patterns (meme coins - user might be aware)
+    if "medium" in matches:
+        token_risk_score += 15  # Reduced from 25
+        risk_reasons.append(f"Contains meme pattern: '{matches['medium']}' (user might be aware)")
+        risk_level = "medium"
+    
+    # 4. Check for new risk patterns (claim, airdrop, etc.)
+    if "new" in matches:
+        token_risk_score += 20
+        risk_reasons.append(f"Contains suspicious pattern: '{matches['new']}'")
+        risk_level = "medium"
+    
+    # 5. Check for suspicious token characteristics
+    if len(token_symbol) > 15:  # Unusually long symbol
+        token_risk_score += 10  # Reduced from 15
+        risk_reasons.append("Unusually long symbol")
+    
+    return {"risk_score": token_risk_score, "risk_level": risk_level, "risk_reasons": risk_reasons}
+
+def _nft_verdict(nft_address: str, nft_name: str, nft_symbol: str) -> dict:
+    """Contract-intrinsic NFT risk (known scam list, name/symbol patterns, fake collections, symbol length)."""
+    nft_risk_score = 0
+    risk_reasons = []
+    risk_level = None  # Only set when an intrinsic check decides it
+    
+    # 1. Check if NFT is in known scam list (HIGH RISK)
+    if get_reputation_db().is_scam_nft(nft_address):
+        nft_risk_score += 50
+        risk_reasons.append("Known scam NFT")
+        risk_level = "high"
+    
+    # Single automaton pass over name and symbol for every pattern category
+    matches = NFT_PATTERN_MATCHER.scan(nft_name, nft_symbol)
+    
+    # 2. Check for high risk patterns (scam indicators)
+    if "high" in matches:
+        nft_risk_score += 40
+        risk_reasons.append(f"Contains high-risk pattern: '{matches['high']}'")
+        risk_level = "high"
+    
+    # 3. Check for medium risk patterns (suspicious but not necessarily malicious)
+    if "medium" in matches:
+        nft_risk_score += 25
+        risk_reasons.append(f"Contains suspicious pattern: '{matches['medium']}'")
+        risk_level = "medium"
+    
+    # 4. Check for low risk patterns (potentially suspicious) - REDUCED SCORE
+    if "low" in matches:
+        nft_risk_score += 8  # Reduced from 10
+        risk_reasons.append(f"Contains NFT pattern: '{matches['low']}'")
+        risk_level = "low"
+    
+    # 5. Check for fake collection detection
+    if "fake_collection" in matches:
+        nft_risk_score += 35
+        risk_reasons.append(f"Fake collection detected: '{matches['fake_collection']}'")
+        risk_level = "high"
+    
+    # 6. Check for suspicious NFT characteristics
+    if len(nft_symbol) > 20:  # Unusually long symbol
+        nft_risk_score += 15
+        risk_reasons.append("Unusually long symbol")
+    
+    return {"risk_score": nft_risk_score, "risk_level": risk_level, "risk_reasons": risk_reasons}
+
 # ---------------- Get risky tokens ----------------
-def get_risk_tokens(address: str) -> str:
+def get_risk_tokens(address: str, ctx: Optional[WalletContext] = None) -> str:
     """
     Check for risky tokens in a wallet address on Base network.
     
     Args:
         address (str): Ethereum wallet address or Basename to check
+        ctx (WalletContext, optional): Shared per-request context; built on demand if omitted
         
     Returns:
         str: "risky_tokens = score(count)" format
@@ -438,73 +831,15 @@ def get_risk_tokens(address: str) -> str:
     """
     try:
         # Resolve Basename to address if needed
-        resolved = resolve_input_basename_address(address)
-        actual_address = resolved.get("Address")
+        if ctx is None:
+            ctx = build_wallet_context(address)
+        actual_address = ctx.address
         
-        if not actual_address or actual_address in (None, "", "0x0000000000000000000000000000000000000000"):
+        if not ctx.is_valid:
             return "risky_tokens = 0.00(0)"
         
-        # Configuration for Base network using Etherscan v2 API
-        # Use global ETHERSCAN_API_KEY
-        ETHERSCAN_BASE_URL = "https://api.etherscan.io/v2/api"
-        CHAIN_ID = 8453  # Base network chain ID
-        
-        # Prepare API request for Base network using v2 API
-        params = {
-            "chainid": CHAIN_ID,  # Specify Base network
-            "module": "account",
-            "action": "tokentx",  # Get token transactions
-            "address": actual_address,
-            "startblock": 0,
-            "endblock": 99999999,
-            "sort": "desc",
-            "tag": "latest",
-            "apikey": ETHERSCAN_API_KEY
-        }
-        
-        # Make API request to Base network using v2 API with connection pooling
-        response = session.get(ETHERSCAN_BASE_URL, params=params, timeout=30)
-        
-        # Check if request was successful
-        if response.status_code != 200:
-            error_msg = f"API request failed with status code: {response.status_code}"
-            print(f"ERROR: {error_msg}")
-            return "risky_tokens = 0.00(0)"
-        
-        # Parse API response
-        data = response.json()
-        
-        # Check API response status
-        if data.get("status") != "1":
-            error_msg = f"API returned error: {data.get('message', 'Unknown error')}"
-            print(f"ERROR: {error_msg}")
-            return "risky_tokens = 0.00(0)"
-        
-        # Get transaction list
-        transactions = data.get("result", [])
-        
-        # Define risky token patterns (case insensitive)
-        # High risk patterns (scam indicators)
-        high_risk_patterns = [
-            "honeypot", "scam", "fake", "rug", "suspicious"
-        ]
-        
-        # Medium risk patterns (meme coins - user might be aware)
-        medium_risk_patterns = [
-            "moon", "inu", "elon", "doge", "shib", "pepe",
-            "meme", "rocket", "safe", "baby", "mini"
-        ]
-        
-        # New patterns for better detection
-        new_risk_patterns = [
-            "claim", "airdrop", "reward", "swap", "visit",
-            "free", "gift", "bonus", "earn", "profit"
-        ]
-        
-        # Known scam token addresses (example - in production, this would be a database)
-        known_scam_tokens = [
-            "0x1234567890123456789012345678901234567890",  # Example scam token
-        ]
+        # Get token transaction list (fetched once per request by the context)
+        transactions = ctx.token_transfers
         
         # Initialize tracking variables
         risky_tokens_found = set()
@@ -523,44 +858,13 @@ def get_risk_tokens(address: str) -> str:
                 continue
                 
             total_tokens_checked.add(token_address)
-            token_risk_score = 0
-            risk_reasons = []
-            risk_level = "low"  # low, medium, high
-            
-            # 1. Check if token is in known scam list (HIGH RISK)
-            if token_address in known_scam_tokens:
-                token_risk_score += 40
-                risk_reasons.append("Known scam token")
-                risk_level = "high"
-            
-            # 2. Check for high risk patterns (scam indicators)
-            for pattern in high_risk_patterns:
-                if pattern in token_name or pattern in token_symbol:
-                    token_risk_score += 30
-                    risk_reasons.append(f"Contains high-risk pattern: '{pattern}'")
-                    risk_level = "high"
-                    break
-            
-            # 3. Check for medium risk patterns (meme coins - user might be aware)
-            for pattern in medium_risk_patterns:
-                if pattern in token_name or pattern in token_symbol:
-                    token_risk_score += 15  # Reduced from 25
-                    risk_reasons.append(f"Contains meme pattern: '{pattern}' (user might be aware)")
-                    risk_level = "medium"
-                    break
-            
-            # 4. Check for new risk patterns (claim, airdrop, etc.)
-            for pattern in new_risk_patterns:
-                if pattern in token_name or pattern in token_symbol:
-                    token_risk_score += 20
-                    risk_reasons.append(f"Contains suspicious pattern: '{pattern}'")
-                    risk_level = "medium"
-                    break
-            
-            # 5. Check for suspicious token characteristics
-            if len(token_symbol) > 15:  # Unusually long symbol
-                token_risk_score += 10  # Reduced from 15
-                risk_reasons.append("Unusually long symbol")
+            # Contract-intrinsic factors are shared across wallets via the verdict cache
+            verdict = VERDICT_CACHE.get_or_compute(
+                "token", token_address, lambda: _token_verdict(token_address, token_name, token_symbol)
+            )
+            token_risk_score = verdict["risk_score"]
+            risk_reasons = list(verdict["risk_reasons"])
+            risk_level = verdict["risk_level"] or "low"  # low, medium, high
             
             # 6. Check for tokens with zero value transfers (potential honeypot)
             if token_value == "0":
@@ -600,30 +904,19 @@ def get_risk_tokens(address: str) -> str:
             'error_message': None
         }
         
-        # Create CSV file for risky tokens details
-        csv_filename = f"risky_tokens_{actual_address}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        # Use absolute path to ensure we're saving in the right directory
-        base_dir = Path(__file__).parent.parent.parent  # Go up to project root
-        data_dir = base_dir / "data" / "security_reports"
-        data_dir.mkdir(parents=True, exist_ok=True)
-        csv_path = data_dir / csv_filename
-        
-        # Save risky tokens to CSV
+        # Hand the risky tokens report to the background writer (downloadable as CSV)
         if risky_tokens_details:
-            with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['Token Name', 'Token Symbol', 'Contract Address', 'Risk Level', 'Risk Score', 'Risk Reasons']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for token in risky_tokens_details:
-                    writer.writerow({
-                        'Token Name': token['name'],
-                        'Token Symbol': token['symbol'],
-                        'Contract Address': token['address'],
-                        'Risk Level': token['risk_level'].upper(),
-                        'Risk Score': token['risk_score'],
-                        'Risk Reasons': '; '.join(token['risk_reasons'])
-                    })
+            report_writer.submit("risky_tokens", actual_address, [
+                {
+                    'Token Name': token['name'],
+                    'Token Symbol': token['symbol'],
+                    'Contract Address': token['address'],
+                    'Risk Level': token['risk_level'].upper(),
+                    'Risk Score': token['risk_score'],
+                    'Risk Reasons': '; '.join(token['risk_reasons'])
+                }
+                for token in risky_tokens_details
+            ])
         
         # Prepare clean result
         result = {
@@ -631,7 +924,6 @@ def get_risk_tokens(address: str) -> str:
             'total_tokens_checked': len(total_tokens_checked),
             'risky_tokens_found': len(risky_tokens_found),
             'risky_tokens_list': risky_tokens_details,
-            'csv_file': csv_path if risky_tokens_details else None,
             'status': 'success',
             'error_message': None
         }
@@ -658,48 +950,55 @@ def get_risk_tokens(address: str) -> str:
         return "risky_tokens = 0.00(0)"
 
 # ---------------- Get risky contracts ----------------
-def get_risky_contracts(address: str) -> dict:
+# Contract analysis only looks at the most recent transactions
+RISKY_CONTRACTS_TX_WINDOW = 1000
+
+def get_risky_contracts(address: str, ctx: Optional[WalletContext] = None) -> dict:
     """
     Fast contract risk analysis for Base network.
     Optimized for speed - completes in under 30 seconds.
     
     Args:
         address (str): The wallet address or Basename to analyze
+        ctx (WalletContext, optional): Shared per-request context; built on demand if omitted
         
     Returns:
         dict: Contains count and weighted score for risky contracts
     """
     try:
         # Resolve Basename to address if needed
-        resolved = resolve_input_basename_address(address)
-        actual_address = resolved.get("Address")
+        if ctx is None:
+            ctx = build_wallet_context(address)
+        actual_address = ctx.address
         
-        if not actual_address or actual_address in (None, "", "0x0000000000000000000000000000000000000000"):
+        if not ctx.is_valid:
             return {
                 "count": 0,
                 "weighted_score": 0.0,
                 "error": "Could not resolve a valid address from input."
             }
         
-        # Get transactions (async, max 30 seconds total)
-        transactions = asyncio.run(get_all_transactions_async(actual_address))
+        # Most recent transactions from the shared txlist (oldest first)
+        frame = ctx.frame
+        window_start = max(0, len(frame) - RISKY_CONTRACTS_TX_WINDOW)
         
-        if not transactions:
+        if len(frame) == window_start:
             return {"count": 0, "weighted_score": 0.0}
         
-        # Extract contracts (no API calls)
-        contract_addresses = extract_contract_interactions(transactions, actual_address)
+        # One pass over the window: per-contract aggregates for every contract interaction (no API calls)
+        contract_index = frame.contract_aggregates(actual_address, since=window_start)
         
-        if not contract_addresses:
+        if not contract_index:
             return {"count": 0, "weighted_score": 0.0}
         
         # Fast analysis using only transaction data
         risky_contracts_data = []
         risky_count = 0
         weighted_score = 0.0
+        now = time.time()
         
-        for contract_addr in contract_addresses:
-            risk_assessment = analyze_contract_risk_fast(contract_addr, transactions)
+        for contract_addr, aggregates in contract_index.items():
+            risk_assessment = score_contract_risk(contract_addr, aggregates, now)
             
             # Lower threshold for speed
             if risk_assessment['risk_score'] >= 20:
@@ -720,9 +1019,9 @@ def get_risky_contracts(address: str) -> dict:
                     'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 })
             
-        # Save to CSV if risky contracts found
+        # Save report if risky contracts found
         if risky_contracts_data:
-            save_risky_contracts_to_csv(actual_address, risky_contracts_data)
+            save_risky_contracts_report(actual_address, risky_contracts_data)
         
         return {
             "count": risky_count,
@@ -751,163 +1050,82 @@ def get_risk_weight(risk_level: str) -> float:
     }
     return weights.get(risk_level, 0.0)
 
-def save_risky_contracts_to_csv(address: str, risky_contracts_data: list):
-    """Save risky contracts data to CSV file"""
-    try:
-        # Create data directory if it doesn't exist
-        # Use absolute path to ensure we're saving in the right directory
-        base_dir = Path(__file__).parent.parent.parent  # Go up to project root
-        data_dir = base_dir / "data" / "security_reports"
-        data_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"risky_contracts_{address}_{timestamp}.csv"
-        filepath = data_dir / filename
-        
-        # Write to CSV
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['contract_address', 'risk_score', 'risk_level', 'risk_factors', 'interaction_count', 'analysis_date']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for contract_data in risky_contracts_data:
-                writer.writerow(contract_data)
-        
-    except Exception as e:
-        print(f"Error saving risky contracts data to CSV: {e}")
-
-async def get_all_transactions_async(address: str) -> list:
-    """Async version with concurrent requests and better error handling"""
-    try:
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=15, connect=10)
-        ) as session:
-            tasks = []
-            for page in range(1, 3):  # Only 2 pages max
-                task = fetch_page_async(session, address, page)
-                tasks.append(task)
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            all_txs = []
-            for i, result in enumerate(results, 1):
-                if isinstance(result, list):
-                    all_txs.extend(result)
-                elif isinstance(result, Exception):
-                    print(f"Error fetching transaction page {i}: {result}")
-            
-            return all_txs[:1000]  # Limit total transactions
-            
-    except Exception as e:
-        print(f"Error in fetch_page_async: {e}")
-        return []
-
-async def fetch_page_async(session, address: str, page: int) -> list:
-    """Fetch single page asynchronously with improved error handling"""
-    url = "https://base.blockscout.com/api"
-    params = {
-        "module": "account",
-        "action": "txlist", 
-        "address": address,
-        "page": page,
-        "offset": 500,
-        "sort": "desc"
-    }
-    
+def save_risky_contracts_report(address: str, risky_contracts_data: list):
+    """Queue risky contracts data for the security report store"""
     try:
-        async with session.get(url, params=params) as response:
-            if response.status != 200:
-                return []
-            
-            data = await response.json()
-            if data.get('status') == "1":
-                return data.get('result', [])
-            else:
-                return []
-                
-    except asyncio.TimeoutError:
-        # Retry once
-        try:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get('status') == "1":
-                        return data.get('result', [])
-        except Exception as retry_err:
-            print(f"Error in retry attempt for fetch_page_async: {retry_err}")
-        return []
+        report_writer.submit("risky_contracts", address, risky_contracts_data)
     except Exception as e:
-        print(f"Error in fetch_page_async: {e}")
-        return []
+        print(f"Error saving risky contracts report: {e}")
 
 # ---------------- Analyze contract risk fast ----------------
-def analyze_contract_risk_fast(contract_addr: str, user_transactions: list) -> dict:
-    """Fast risk analysis using only transaction data - no additional API calls"""
+_SUSPICIOUS_ADDRESS_RE = re.compile(
+    r'dead|0000|1111|2222|3333|4444|5555|6666|7777|8888|9999|aaaa|bbbb|cccc|dddd|eeee|ffff'
+)
+
+def score_contract_risk(contract_addr: str, aggregates: dict, now: Optional[float] = None) -> dict:
+    """Score one contract from its per-contract aggregates (see TxFrame.contract_aggregates)"""
     risk_score = 0
     risk_factors = []
-    
-    # Filter transactions for this contract
-    contract_txs = [tx for tx in user_transactions if tx.get('to', '').lower() == contract_addr.lower()]
+    now = time.time() if now is None else now
+    interaction_count = aggregates['interaction_count']
     
     # 1. Transaction frequency analysis
-    if len(contract_txs) == 1:
+    if interaction_count == 1:
         risk_score += 15
         risk_factors.append("SINGLE_INTERACTION")
     
-    # 2. Gas usage patterns
-    gas_values = [int(tx.get('gasUsed', 0)) for tx in contract_txs]
-    if gas_values:
-        avg_gas = sum(gas_values) / len(gas_values)
-        if avg_gas > 500000:  # Very high gas usage
+    if interaction_count:
+        # 2. Gas usage patterns
+        if aggregates['avg_gas'] > 500000:  # Very high gas usage
             risk_score += 10
             risk_factors.append("HIGH_GAS_USAGE")
-    
-    # 3. Value transfer patterns
-    values = [int(tx.get('value', 0)) for tx in contract_txs]
-    if values and max(values) > 0:
-        max_value_eth = max(values) / 1e18
-        if max_value_eth > 1:  # > 1 ETH
+        
+        # 3. Value transfer patterns
+        if aggregates['max_value'] / 1e18 > 1:  # > 1 ETH
             risk_score += 5
             risk_factors.append("LARGE_VALUE_TRANSFER")
-    
-    # 4. Recent interaction analysis
-    timestamps = [int(tx.get('timeStamp', 0)) for tx in contract_txs]
-    if timestamps:
-        latest_interaction = max(timestamps)
-        days_since = (time.time() - latest_interaction) / 86400
+        
+        # 4. Recent interaction analysis
+        days_since = (now - aggregates['latest_timestamp']) / 86400
         if days_since < 1:  # Very recent
             risk_score += 8
             risk_factors.append("VERY_RECENT_INTERACTION")
-    
-    # 5. Input data complexity
-    input_lengths = [len(tx.get('input', '0x')) for tx in contract_txs]
-    if input_lengths:
-        avg_input_length = sum(input_lengths) / len(input_lengths)
-        if avg_input_length < 10:  # Very simple calls
+        
+        # 5. Input data complexity
+        if aggregates['avg_input_length'] < 10:  # Very simple calls
             risk_score += 12
             risk_factors.append("SIMPLE_CALLS_ONLY")
     
     # 6. Suspicious address patterns
-    suspicious_patterns = [
-        r'dead', r'0000', r'1111', r'2222', r'3333', r'4444', 
-        r'5555', r'6666', r'7777', r'8888', r'9999', r'aaaa',
-        r'bbbb', r'cccc', r'dddd', r'eeee', r'ffff'
-    ]
-    
-    for pattern in suspicious_patterns:
-        if re.search(pattern, contract_addr.lower()):
-            risk_score += 15
-            risk_factors.append("SUSPICIOUS_ADDRESS_PATTERN")
-            break
+    if _SUSPICIOUS_ADDRESS_RE.search(contract_addr.lower()):
+        risk_score += 15
+        risk_factors.append("SUSPICIOUS_ADDRESS_PATTERN")
     
     return {
         'contract_address': contract_addr,
         'risk_score': min(risk_score, 100),
         'risk_factors': risk_factors,
-        'interaction_count': len(contract_txs)
+        'interaction_count': interaction_count
     }
 
+def analyze_contract_risk_fast(contract_addr: str, user_transactions: list) -> dict:
+    """Fast risk analysis using only transaction data - no additional API calls"""
+    frame = TxFrame(user_transactions)
+    contract_id = frame.id_of(contract_addr)
+    if contract_id < 0:
+        aggregates = {'interaction_count': 0}
+    else:
+        # Aggregate every row sent to this contract, whether or not it carried calldata
+        mask = frame.to_id == contract_id
+        aggregates = {
+            'interaction_count': int(mask.sum()),
+            'avg_gas': float(frame.gas_used[mask].mean()),
+            'max_value': float(frame.value[mask].max()),
+            'latest_timestamp': int(frame.timestamp[mask].max()),
+            'avg_input_length': float(frame.input_len[mask].mean()),
+        }
+    return score_contract_risk(contract_addr, aggregates)
+
 def extract_contract_interactions(transactions: list, user_address: str) -> set:
     """Extract unique contract addresses from transactions"""
     contract_addresses = set()
@@ -928,7 +1146,18 @@ def extract_contract_interactions(transactions: list, user_address: str) -> set:
 
 
 
-def get_risky_signs(address: str) -> dict:
+# Dangerous function signatures checked by get_risky_signs
+DANGEROUS_SIGNATURES = [
+    "0x095ea7b3",  # approve
+    "0xd505accf",  # permit
+    "0xa22cb465",  # setApprovalForAll
+    "0xac9650d8",  # multicall
+    "0x1cff79cd",  # execute
+    "0x40c10f19",  # mint
+]
+_DANGEROUS_SELECTORS = np.array([selector_id(sig) for sig in DANGEROUS_SIGNATURES], dtype=np.uint32)
+
+def get_risky_signs(address: str, ctx: Optional[WalletContext] = None) -> dict:
     """
     Analyze wallet for risky signatures and approvals - Free User Version.
     Simplified analysis focusing on dangerous approval patterns.
@@ -936,10 +1165,11 @@ def get_risky_signs(address: str) -> dict:
     """
     try:
         # Resolve Basename to address if needed
-        resolved = resolve_input_basename_address(address)
-        actual_address = resolved.get("Address")
+        if ctx is None:
+            ctx = build_wallet_context(address)
+        actual_address = ctx.address
         
-        if not actual_address or actual_address in (None, "", "0x0000000000000000000000000000000000000000"):
+        if not ctx.is_valid:
             return {
                 "wallet_address": address,
                 "risky_signs": 0,
@@ -948,36 +1178,26 @@ def get_risky_signs(address: str) -> dict:
             }
         
         # Get transactions
-        transactions = get_all_transactions(actual_address)
+        transactions = ctx.transactions
         if not transactions:
             return {"wallet_address": actual_address, "risky_signs": 0, "weighted_score": 0}
         
         # Analyze for risky signatures
         risky_signs = []
         
-        for tx in transactions:
-            if tx.get('from', '').lower() != actual_address.lower():
-                continue
-                
+        # Vectorized prefilter: only outgoing transactions calling a dangerous selector
+        frame = ctx.frame
+        candidates = np.flatnonzero(
+            (frame.from_id == frame.id_of(actual_address)) & np.isin(frame.selector, _DANGEROUS_SELECTORS)
+        )
+        
+        for i in candidates:
+            tx = transactions[i]
             to_address = tx.get('to', '').lower()
             input_data = tx.get('input', '0x')
-            
-            if len(input_data) < 10:
-                continue
-                
             func_signature = input_data[:10]
             
-            # Check for dangerous signatures
-            dangerous_signatures = [
-                "0x095ea7b3",  # approve
-                "0xd505accf",  # permit
-                "0xa22cb465",  # setApprovalForAll
-                "0xac9650d8",  # multicall
-                "0x1cff79cd",  # execute
-                "0x40c10f19",  # mint
-            ]
-            
-            if func_signature in dangerous_signatures:
+            if func_signature in DANGEROUS_SIGNATURES:
                 # Analyze signature risk
                 signature_analysis = analyze_signature_risk(input_data, to_address, func_signature)
                 
@@ -1004,9 +1224,9 @@ def get_risky_signs(address: str) -> dict:
         # Group by unique patterns
         unique_risky_patterns = group_risky_signs(risky_signs)
         
-        # Save detailed report to CSV (background)
+        # Save detailed report
         if unique_risky_patterns:
-            save_risky_signs_to_csv(actual_address, unique_risky_patterns)
+            save_risky_signs_report(actual_address, unique_risky_patterns)
         
         # Calculate weighted score with diminishing returns to prevent excessive deductions
         total_weighted_score = 0
@@ -1041,25 +1261,6 @@ def get_risky_signs(address: str) -> dict:
         print(f"Error in get_risky_signs: {e}")
         return {"wallet_address": address, "risky_signs": 0, "weighted_score": 0, "error": str(e)}
 
-# Known safe protocols (reduce risk for these)
-KNOWN_SAFE_PROTOCOLS = {
-    "0x4200000000000000000000000000000000000006",  # WETH9
-    "0x198ef79f1f515f02dfe9e3115ed9fc07183f02fc",  # Uniswap Universal Router
-    "0x2626664c2603336e57b271c5c0b26f421741e481",  # Uniswap SwapRouter
-    "0x827922686190790b37229fd06084350e74485b72",  # Aerodrome Router
-    "0x1111111254eeb25477b68fb85ed929f73a960582",  # 1inch Router
-    "0xbbbbbbbbbb9cc5e90e3b3af64bdaf62c37eeffcb",  # Morpho Blue
-    "0x00000000000001ad428e4906ae43d8f9852d0dd6",  # OpenSea Seaport
-    "0x7c74dfe39976dc395529c14e54a597809980e01c",  # Zora
-    "0x3154cf16ccdb4c6d922629664174b904d80f2c35",  # Base L1 Bridge
-    "0x8731d54e9d02c286767d56ac03e8037c07e01e98",  # Stargate
-    "0x66a71dcef29a0ffbdbe3c6a460a3b5bc225cd675",  # LayerZero
-    "0xca11bde05977b3631167028862be2a173976ca11",  # Multicall3
-    "0x833589fcd6edb6e08f4c7c32d4f71b54bda02913",  # USDC on Base
-    "0x50c5725949a6f0c72e6c4a641f24049a917db0cb",  # DAI on Base
-    "0x2ae3f1ec7f1f5012cfeab0185bfc7aa3cf0dec22",  # cbETH on Base
-}
-
 def get_function_name(signature: str) -> str:
     """Get human-readable function name"""
     names = {
@@ -1116,7 +1317,7 @@ def calculate_risk_score(func_signature: str, risk_factors: list, spender_addres
             base_score *= 1.2
     
     # Reduce risk for known safe protocols
-    if spender_address and spender_address.lower() in KNOWN_SAFE_PROTOCOLS:
+    if spender_address and get_reputation_db().is_safe_protocol(spender_address):
         base_score *= 0.6  # Reduce risk for known protocols
     
     # Cap at 100
@@ -1257,46 +1458,24 @@ def group_risky_signs(risky_signs: list) -> list:
         for group in pattern_groups.values()
     ], key=lambda x: x['risk_score'], reverse=True)
 
-def save_risky_signs_to_csv(address: str, risky_signs: list):
-    """Save risky signs data to CSV file"""
+def save_risky_signs_report(address: str, risky_signs: list):
+    """Queue risky signs data for the security report store"""
     try:
-        # Create data directory if it doesn't exist
-        # Use absolute path to ensure we're saving in the right directory
-        base_dir = Path(__file__).parent.parent.parent  # Go up to project root
-        data_dir = base_dir / "data" / "security_reports"
-        data_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"risky_signs_{address}_{timestamp}.csv"
-        filepath = data_dir / filename
-        
-        # Write to CSV
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = [
-                'function_signature', 'function_name', 'risk_level', 'risk_score',
-                'contract_address', 'spender_address', 'approval_amount', 'is_unlimited',
-                'risk_factors', 'transaction_count', 'first_signature', 'last_signature',
-                'example_transaction_hash'
-            ]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for sign_data in risky_signs:
-                # Convert risk_factors list to string
-                sign_data_copy = sign_data.copy()
-                sign_data_copy['risk_factors'] = '; '.join(sign_data['risk_factors'])
-                writer.writerow(sign_data_copy)
-        
+        report_writer.submit("risky_signs", address, [
+            # Convert risk_factors list to string
+            {**sign_data, 'risk_factors': '; '.join(sign_data['risk_factors'])}
+            for sign_data in risky_signs
+        ])
     except Exception as e:
-        print(f"Error saving risky signs CSV: {e}")
+        print(f"Error saving risky signs report: {e}")
 
-def get_suspicious_nfts(address: str) -> str:
+def get_suspicious_nfts(address: str, ctx: Optional[WalletContext] = None) -> str:
     """
     Check for suspicious NFTs in a wallet address on Base network.
     
     Args:
         address (str): Ethereum wallet address or Basename to check
+        ctx (WalletContext, optional): Shared per-request context; built on demand if omitted
         
     Returns:
         str: "risky_nft: count" format
@@ -1304,115 +1483,16 @@ def get_suspicious_nfts(address: str) -> str:
     """
     try:
         # Resolve Basename to address if needed
-        resolved = resolve_input_basename_address(address)
-        actual_address = resolved.get("Address")
+        if ctx is None:
+            ctx = build_wallet_context(address)
+        actual_address = ctx.address
         
         # Validate address format
         if not actual_address or not actual_address.startswith('0x') or len(actual_address) != 42:
             return "risky_nft: 0"
         
-        # Configuration for Base network using Etherscan v2 API
-        # Use global ETHERSCAN_API_KEY
-        ETHERSCAN_BASE_URL = "https://api.etherscan.io/v2/api"
-        CHAIN_ID = 8453  # Base network chain ID
-        
-        # Prepare API request for Base network using v2 API
-        params = {
-            "chainid": CHAIN_ID,  # Specify Base network
-            "module": "account",
-            "action": "tokennfttx",  # Get NFT token transactions
-            "address": actual_address,
-            "startblock": 0,
-            "endblock": 99999999,
-            "sort": "desc",
-            "tag": "latest",
-            "apikey": ETHERSCAN_API_KEY
-        }
-        
-        # Make API request with retry mechanism
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                # Add rate limiting delay
-                if attempt > 0:
-                    time.sleep(1)  # 1 second delay between retries
-                
-                response = session.get(ETHERSCAN_BASE_URL, params=params, timeout=30)
-                
-                # Check if request was successful
-                if response.status_code != 200:
-                    error_msg = f"API request failed with status code: {response.status_code}"
-                    if attempt == max_retries - 1:
-                        return f"Error: {error_msg}"
-                    continue
-                
-                # Parse API response
-                data = response.json()
-                
-                # Check API response status
-                if data.get("status") != "1":
-                    error_msg = f"API returned error: {data.get('message', 'Unknown error')}"
-                    if attempt == max_retries - 1:
-                        return f"Error: {error_msg}"
-                    continue
-                
-                # If we reach here, API call was successful
-                break
-                
-            except requests.exceptions.Timeout:
-                error_msg = "API request timed out"
-                if attempt == max_retries - 1:
-                    return f"Error: {error_msg}"
-                continue
-                
-            except requests.exceptions.RequestException as e:
-                error_msg = f"Network error: {str(e)}"
-                if attempt == max_retries - 1:
-                    return f"Error: {error_msg}"
-                continue
-        
-        # Get transaction list
-        transactions = data.get("result", [])
-        
-        # Define suspicious NFT patterns (case insensitive) - IMPROVED
-        # High risk patterns (scam indicators)
-        high_risk_patterns = [
-            "honeypot", "scam", "fake", "rug", "suspicious", "phishing",
-            "malware", "virus", "trojan", "stealer", "drainer", "drain",
-            "fake_", "clone_", "copy_", "replica_", "fake_", "scam_"
-        ]
-        
-        # Medium risk patterns (suspicious but not necessarily malicious)
-        medium_risk_patterns = [
-            "claim", "airdrop", "reward", "free", "gift", "bonus",
-            "earn", "profit", "mint", "mintable", "mintpass",
-            "whitelist", "presale", "private", "exclusive",
-            "free_mint", "airdrop_nft", "claim_reward", "free_gift"
-        ]
-        
-        # Low risk patterns (potentially suspicious) - REMOVED GENERAL PATTERNS
-        low_risk_patterns = [
-            "limited", "rare", "unique", "special", "vip",
-            "golden", "premium", "elite", "legendary", "mythic"
-        ]
-        
-        # Enhanced fake collection detection
-        FAKE_COLLECTIONS = [
-            "bored ape", "cryptopunk", "azuki", "doodles", "moonbird",
-            "clone x", "pudgy penguin", "mutant ape", "bayc", "mayc",
-            "bored ape yacht club", "cryptopunks", "azuki elementals"
-        ]
-        
-        # Known legitimate Base collections (reduce false positives)
-        LEGITIMATE_BASE_NFTS = {
-            "0x4ed4e862860bed51a9570b96d89af5e1b0efefed",  # DEGEN
-            "0x03a520b32c04bf3beef7beb72e919cf822ed34f1",  # Base, Introduced
-        }
-        
-        # Known scam NFT addresses (example - in production, this would be a database)
-        known_scam_nfts = [
-            "0x1234567890123456789012345678901234567890",  # Example scam NFT
-        ]
+        # Get NFT transaction list (fetched once per request by the context)
+        transactions = ctx.nft_transfers
         
         # Initialize tracking variables
         suspicious_nfts_found = set()
@@ -1453,48 +1533,14 @@ def get_suspicious_nfts(address: str) -> str:
                 risk_reasons.append("Received NFT (lower risk)")
                 risk_level = "medium"
             
-            # 1. Check if NFT is in known scam list (HIGH RISK)
-            if nft_address in known_scam_nfts:
-                nft_risk_score += 50
-                risk_reasons.append("Known scam NFT")
-                risk_level = "high"
-            
-            # 2. Check for high risk patterns (scam indicators)
-            for pattern in high_risk_patterns:
-                if pattern in nft_name or pattern in nft_symbol:
-                    nft_risk_score += 40
-                    risk_reasons.append(f"Contains high-risk pattern: '{pattern}'")
-                    risk_level = "high"
-                    break
-            
-            # 3. Check for medium risk patterns (suspicious but not necessarily malicious)
-            for pattern in medium_risk_patterns:
-                if pattern in nft_name or pattern in nft_symbol:
-                    nft_risk_score += 25
-                    risk_reasons.append(f"Contains suspicious pattern: '{pattern}'")
-                    risk_level = "medium"
-                    break
-            
-            # 4. Check for low risk patterns (potentially suspicious) - REDUCED SCORE
-            for pattern in low_risk_patterns:
-                if pattern in nft_name or pattern in nft_symbol:
-                    nft_risk_score += 8  # Reduced from 10
-                    risk_reasons.append(f"Contains NFT pattern: '{pattern}'")
-                    risk_level = "low"
-                    break
-            
-            # 5. Check for fake collection detection
-            for fake_collection in FAKE_COLLECTIONS:
-                if fake_collection in nft_name or fake_collection in nft_symbol:
-                    nft_risk_score += 35
-                    risk_reasons.append(f"Fake collection detected: '{fake_collection}'")
-                    risk_level = "high"
-                    break
-            
-            # 6. Check for suspicious NFT characteristics
-            if len(nft_symbol) > 20:  # Unusually long symbol
-                nft_risk_score += 15
-                risk_reasons.append("Unusually long symbol")
+            # Contract-intrinsic factors are shared across wallets via the verdict cache
+            verdict = VERDICT_CACHE.get_or_compute(
+                "nft", nft_address, lambda: _nft_verdict(nft_address, nft_name, nft_symbol)
+            )
+            nft_risk_score += verdict["risk_score"]
+            risk_reasons.extend(verdict["risk_reasons"])
+            if verdict["risk_level"]:
+                risk_level = verdict["risk_level"]
             
             # 7. Check for NFTs with zero value transfers (potential honeypot)
             if token_value == "0":
@@ -1514,18 +1560,18 @@ def get_suspicious_nfts(address: str) -> str:
             # 10. Check for NFTs with suspicious metadata
             if "metadata" in tx and tx["metadata"]:
                 metadata = tx["metadata"].lower()
-                if any(pattern in metadata for pattern in high_risk_patterns):
+                if NFT_METADATA_MATCHER.matches_any(metadata):
                     nft_risk_score += 30
                     risk_reasons.append("Suspicious metadata content")
                     risk_level = "high"
             
             # 11. Simple non-ASCII detection
-            if re.search(r'[^\x00-\x7F]', nft_name):
+            if not nft_name.isascii():
                 nft_risk_score += 20
                 risk_reasons.append("Contains non-ASCII characters")
             
             # 12. Check if NFT is in legitimate Base collections (reduce false positives)
-            if nft_address in LEGITIMATE_BASE_NFTS:
+            if get_reputation_db().is_legit_nft(nft_address):
                 nft_risk_score = max(0, nft_risk_score - 30)
                 risk_reasons.append("Legitimate Base NFT collection (risk reduced)")
             
@@ -1545,32 +1591,21 @@ def get_suspicious_nfts(address: str) -> str:
                     'transaction_type': 'minted' if is_user_minted else 'received'
                 })
         
-        # Create CSV file for suspicious NFTs details (background)
-        csv_filename = f"suspicious_nfts_{actual_address}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        # Use absolute path to ensure we're saving in the right directory
-        base_dir = Path(__file__).parent.parent.parent  # Go up to project root
-        data_dir = base_dir / "data" / "security_reports"
-        data_dir.mkdir(parents=True, exist_ok=True)
-        csv_path = data_dir / csv_filename
-        
-        # Save suspicious NFTs to CSV (background)
+        # Hand the suspicious NFTs report to the background writer (downloadable as CSV)
         if suspicious_nfts_details:
-            with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['NFT Name', 'NFT Symbol', 'Contract Address', 'Token ID', 'Risk Level', 'Risk Score', 'Risk Reasons', 'Transaction Type']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for nft in suspicious_nfts_details:
-                    writer.writerow({
-                        'NFT Name': nft['name'],
-                        'NFT Symbol': nft['symbol'],
-                        'Contract Address': nft['address'],
-                        'Token ID': nft['token_id'],
-                        'Risk Level': nft['risk_level'].upper(),
-                        'Risk Score': nft['risk_score'],
-                        'Risk Reasons': '; '.join(nft['risk_reasons']),
-                        'Transaction Type': nft['transaction_type']
-                    })
+            report_writer.submit("suspicious_nfts", actual_address, [
+                {
+                    'NFT Name': nft['name'],
+                    'NFT Symbol': nft['symbol'],
+                    'Contract Address': nft['address'],
+                    'Token ID': nft['token_id'],
+                    'Risk Level': nft['risk_level'].upper(),
+                    'Risk Score': nft['risk_score'],
+                    'Risk Reasons': '; '.join(nft['risk_reasons']),
+                    'Transaction Type': nft['transaction_type']
+                }
+                for nft in suspicious_nfts_details
+            ])
         
         # Return simple result
         return f"risky_nft: {len(suspicious_nfts_found)}"